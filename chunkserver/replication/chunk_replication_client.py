@@ -121,7 +121,7 @@ class ChunkReplicationClient:
         request_bytes = request.to_json()
 
         metadata = None
-        data_buffer = bytearray()
+        data_pieces = []
         message_index = 0
 
         async for response_bytes in multi_callable(request_bytes):
@@ -143,7 +143,7 @@ class ChunkReplicationClient:
                     metadata = chunk_response.metadata
 
                 if chunk_response.data:
-                    data_buffer.extend(chunk_response.data.data)
+                    data_pieces.append(chunk_response.data.data)
 
             except Exception as e:
                 logger.error(f"Error parsing chunk response: {e}")
@@ -152,7 +152,7 @@ class ChunkReplicationClient:
         if metadata is None:
             raise Exception(f"No metadata received for chunk {chunk_id}")
 
-        return bytes(data_buffer), metadata
+        return b"".join(data_pieces), metadata
 
     async def push_chunk_data(
         self,
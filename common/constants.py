@@ -20,8 +20,20 @@ DEFAULT_CHUNK_STORAGE_PATH: str = "/app/data/chunks"
 DEFAULT_CHUNK_INDEX_PATH: str = "/app/data/chunk_index.json"
 
 REPLICATION_PORT: int = 8001
+REPLICATION_COMPRESSION_ENABLED: bool = True
+REPLICATION_MAX_MESSAGE_BYTES: int = 64 * 1024 * 1024
+REPLICATION_WRITE_BUFFER_BYTES: int = 1024 * 1024
+REPLICATION_MIN_PING_INTERVAL_MS: int = 10000
 GOSSIP_INTERVAL_SECONDS: int = 2
 ANTI_ENTROPY_INTERVAL_SECONDS: int = 30
+OPERATION_APPLY_BATCH_SIZE: int = 64
+DEFERRED_RETRY_INTERVAL_SECONDS: int = 10
+SKIPPED_FILE_IDS_CACHE_SIZE: int = 10000
+CONFLICT_RESOLUTION_CACHE_SIZE: int = 4096
+VECTOR_CLOCK_BASELINE_MAX_DELTA: int = 8
+VECTOR_CLOCK_BASELINE_CACHE_SIZE: int = 64
+API_KEY_CACHE_SIZE: int = 10000
+API_KEY_CACHE_TTL_SECONDS: int = 60
 
 PEER_CACHE_REFRESH_INTERVAL_SECONDS: int = 30
 PEER_CACHE_STALE_THRESHOLD_SECONDS: int = 600
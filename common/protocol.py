@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Optional, List, Dict
 import json
 import base64
+import sys
 
 
 @dataclass
@@ -303,7 +304,7 @@ class GossipMessage:
             vector_clock=obj['vector_clock'],
             operation_summaries=[
                 OperationSummary(
-                    operation_id=op['operation_id'],
+                    operation_id=sys.intern(op['operation_id']),
                     operation_type=op['operation_type'],
                     user_id=op['user_id'],
                     timestamp_ms=op['timestamp_ms'],
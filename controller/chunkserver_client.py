@@ -1,7 +1,7 @@
 """RPC client abstraction for sending chunk read/write requests to Chunkserver."""
 
 import grpc
-from typing import AsyncIterator
+from typing import AsyncIterator, Dict
 import logging
 import asyncio
 
@@ -25,6 +25,7 @@ from common.constants import (
     GRPC_KEEPALIVE_TIME_MS,
     GRPC_KEEPALIVE_TIMEOUT_MS
 )
+from controller.config import CHUNKSERVER_MAX_CONCURRENT_RPCS
 from controller.exceptions import (
     ChunkserverUnavailableError,
     ChecksumMismatchError,
@@ -34,6 +35,22 @@ from controller.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Shared by every client instance so concurrent requests cannot pile up an
+# unbounded number of in-flight chunk transfers (each holding a full chunk).
+_chunk_rpc_semaphore = asyncio.Semaphore(CHUNKSERVER_MAX_CONCURRENT_RPCS)
+
+# One gRPC channel per target, shared by every client instance. Services are
+# built per request, so per-instance channels would reconnect on every call.
+_channels: Dict[str, grpc.aio.Channel] = {}
+
+
+async def close_channels() -> None:
+    """Close every shared chunkserver gRPC channel."""
+    channels = list(_channels.values())
+    _channels.clear()
+    for channel in channels:
+        await channel.close()
+
 
 class ChunkserverClient:
     """
@@ -47,21 +64,28 @@ class ChunkserverClient:
         self._target = f"{CHUNKSERVER_SERVICE_NAME}:{CHUNKSERVER_PORT}"
     
     def _ensure_channel(self):
-        """Ensure gRPC channel is established."""
+        """Ensure gRPC channel is established, reusing the shared one for the target."""
         if self._channel is None:
-            options = [
-                ('grpc.keepalive_time_ms', GRPC_KEEPALIVE_TIME_MS),
-                ('grpc.keepalive_timeout_ms', GRPC_KEEPALIVE_TIMEOUT_MS),
-                ('grpc.keepalive_permit_without_calls', 1),
-            ]
-            self._channel = grpc.aio.insecure_channel(self._target, options=options)
-            logger.info(f"Established gRPC channel to {self._target}")
+            channel = _channels.get(self._target)
+            if channel is None:
+                options = [
+                    ('grpc.keepalive_time_ms', GRPC_KEEPALIVE_TIME_MS),
+                    ('grpc.keepalive_timeout_ms', GRPC_KEEPALIVE_TIMEOUT_MS),
+                    ('grpc.keepalive_permit_without_calls', 1),
+                ]
+                channel = grpc.aio.insecure_channel(self._target, options=options)
+                _channels[self._target] = channel
+                logger.info(f"Established gRPC channel to {self._target}")
+            self._channel = channel
     
     async def close(self):
-        """Close gRPC channel."""
-        if self._channel:
-            await self._channel.close()
-            self._channel = None
+        """
+        Release this client's gRPC channel.
+
+        The channel is shared with other clients and stays open until
+        close_channels() runs at shutdown.
+        """
+        self._channel = None
     
     async def _retry_with_backoff(self, operation, *args, max_retries=3, **kwargs):
         """
@@ -143,60 +167,64 @@ class ChunkserverClient:
         checksum: str
     ) -> bool:
         """Internal implementation of write_chunk without retry logic."""
-        self._ensure_channel()
-        
-        try:
-            async def request_generator():
-                metadata = ChunkMetadata(
-                    chunk_id=chunk_id,
-                    file_id=file_id,
-                    chunk_index=chunk_index,
-                    total_size=len(data),
-                    checksum=checksum
+        async with _chunk_rpc_semaphore:
+            self._ensure_channel()
+
+            try:
+                async def request_generator():
+                    metadata = ChunkMetadata(
+                        chunk_id=chunk_id,
+                        file_id=file_id,
+                        chunk_index=chunk_index,
+                        total_size=len(data),
+                        checksum=checksum
+                    )
+                    yield WriteChunkRequest(metadata=metadata).to_json()
+
+                    # Slicing a memoryview does not copy; base64 encoding reads
+                    # each piece straight out of the chunk buffer.
+                    view = memoryview(data)
+                    for i in range(0, len(view), STREAM_PIECE_SIZE_BYTES):
+                        piece = view[i:i + STREAM_PIECE_SIZE_BYTES]
+                        data_piece = ChunkDataPiece(data=piece)
+                        yield WriteChunkRequest(data=data_piece).to_json()
+
+                multi_callable = self._channel.stream_unary(
+                    '/chunkserver.ChunkserverService/WriteChunk',
+                    request_serializer=lambda x: x,
+                    response_deserializer=lambda x: x,
                 )
-                yield WriteChunkRequest(metadata=metadata).to_json()
-                
-                for i in range(0, len(data), STREAM_PIECE_SIZE_BYTES):
-                    piece = data[i:i + STREAM_PIECE_SIZE_BYTES]
-                    data_piece = ChunkDataPiece(data=piece)
-                    yield WriteChunkRequest(data=data_piece).to_json()
-            
-            multi_callable = self._channel.stream_unary(
-                '/chunkserver.ChunkserverService/WriteChunk',
-                request_serializer=lambda x: x,
-                response_deserializer=lambda x: x,
-            )
-            
-            response_bytes = await multi_callable(
-                request_generator(),
-                timeout=CHUNKSERVER_TIMEOUT_SECONDS
-            )
-            
-            response = WriteChunkResponse.from_json(response_bytes)
-            
-            if not response.success:
-                if response.error_message:
-                    error_lower = response.error_message.lower()
-                    if 'checksum' in error_lower:
-                        raise ChecksumMismatchError(f"Chunkserver checksum verification failed: {response.error_message}")
-                    if 'disk full' in error_lower or 'no space' in error_lower:
-                        raise StorageFullError(f"Chunkserver storage full: {response.error_message}")
-                raise Exception(f"Write failed: {response.error_message}")
-            
-            logger.info(f"Successfully wrote chunk {chunk_id}")
-            return True
-            
-        except grpc.RpcError as e:
-            if e.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED):
-                raise ChunkserverUnavailableError(f"Chunkserver unavailable: {e.details()}")
-            logger.error(f"gRPC error writing chunk {chunk_id}: {e}")
-            raise
-        except ChecksumMismatchError:
-            raise
-        except Exception as e:
-            logger.error(f"Error writing chunk {chunk_id}: {e}")
-            raise
-    
+
+                response_bytes = await multi_callable(
+                    request_generator(),
+                    timeout=CHUNKSERVER_TIMEOUT_SECONDS
+                )
+
+                response = WriteChunkResponse.from_json(response_bytes)
+
+                if not response.success:
+                    if response.error_message:
+                        error_lower = response.error_message.lower()
+                        if 'checksum' in error_lower:
+                            raise ChecksumMismatchError(f"Chunkserver checksum verification failed: {response.error_message}")
+                        if 'disk full' in error_lower or 'no space' in error_lower:
+                            raise StorageFullError(f"Chunkserver storage full: {response.error_message}")
+                    raise Exception(f"Write failed: {response.error_message}")
+
+                logger.info("Successfully wrote chunk %s", chunk_id)
+                return True
+
+            except grpc.RpcError as e:
+                if e.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED):
+                    raise ChunkserverUnavailableError(f"Chunkserver unavailable: {e.details()}")
+                logger.error(f"gRPC error writing chunk {chunk_id}: {e}")
+                raise
+            except ChecksumMismatchError:
+                raise
+            except Exception as e:
+                logger.error(f"Error writing chunk {chunk_id}: {e}")
+                raise
+
     async def read_chunk(self, chunk_id: str) -> AsyncIterator[bytes]:
         """
         Retrieve chunk data from chunkserver.
@@ -242,14 +270,14 @@ class ChunkserverClient:
                 if first_response:
                     first_response = False
                     if response.metadata:
-                        logger.info(f"Reading chunk {chunk_id}, size={response.metadata.total_size}")
+                        logger.info("Reading chunk %s, size=%d", chunk_id, response.metadata.total_size)
                     if not response.data:
                         continue
 
                 if response.data:
                     yield response.data.data
             
-            logger.info(f"Successfully read chunk {chunk_id}")
+            logger.info("Successfully read chunk %s", chunk_id)
             
         except grpc.RpcError as e:
             if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -275,40 +303,41 @@ class ChunkserverClient:
         Raises:
             ChunkserverUnavailableError: If chunkserver is unreachable
         """
-        self._ensure_channel()
-        
-        try:
-            request = DeleteChunkRequest(chunk_id=chunk_id)
-            
-            multi_callable = self._channel.unary_unary(
-                '/chunkserver.ChunkserverService/DeleteChunk',
-                request_serializer=lambda x: x,
-                response_deserializer=lambda x: x,
-            )
-            
-            response_bytes = await multi_callable(
-                request.to_json(),
-                timeout=CHUNKSERVER_TIMEOUT_SECONDS
-            )
-            
-            response = DeleteChunkResponse.from_json(response_bytes)
-            
-            if response.success:
-                logger.info(f"Successfully deleted chunk {chunk_id}")
-            else:
-                logger.warning(f"Failed to delete chunk {chunk_id}: {response.error_message}")
-            
-            return response.success
-            
-        except grpc.RpcError as e:
-            if e.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED):
-                raise ChunkserverUnavailableError(f"Chunkserver unavailable: {e.details()}")
-            logger.error(f"gRPC error deleting chunk {chunk_id}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting chunk {chunk_id}: {e}")
-            raise
-    
+        async with _chunk_rpc_semaphore:
+            self._ensure_channel()
+
+            try:
+                request = DeleteChunkRequest(chunk_id=chunk_id)
+
+                multi_callable = self._channel.unary_unary(
+                    '/chunkserver.ChunkserverService/DeleteChunk',
+                    request_serializer=lambda x: x,
+                    response_deserializer=lambda x: x,
+                )
+
+                response_bytes = await multi_callable(
+                    request.to_json(),
+                    timeout=CHUNKSERVER_TIMEOUT_SECONDS
+                )
+
+                response = DeleteChunkResponse.from_json(response_bytes)
+
+                if response.success:
+                    logger.info("Successfully deleted chunk %s", chunk_id)
+                else:
+                    logger.warning("Failed to delete chunk %s: %s", chunk_id, response.error_message)
+
+                return response.success
+
+            except grpc.RpcError as e:
+                if e.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED):
+                    raise ChunkserverUnavailableError(f"Chunkserver unavailable: {e.details()}")
+                logger.error(f"gRPC error deleting chunk {chunk_id}: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"Error deleting chunk {chunk_id}: {e}")
+                raise
+
     async def ping(self) -> bool:
         """
         Check if chunkserver is available.
@@ -6,8 +6,18 @@ from common.constants import CHUNK_SIZE_BYTES, CHUNKSERVER_SERVICE_NAME, CHUNKSE
 
 DATABASE_PATH = os.environ.get("DFS_DATABASE_PATH", "/app/data/metadata.db")
 
+DATABASE_CACHED_STATEMENTS = int(os.environ.get("DFS_DATABASE_CACHED_STATEMENTS", "1024"))
+
+DATABASE_CACHE_SIZE_KIB = int(os.environ.get("DFS_DATABASE_CACHE_SIZE_KIB", "20000"))
+
+DATABASE_MMAP_SIZE_BYTES = int(os.environ.get("DFS_DATABASE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+
+DATABASE_POOL_SIZE = int(os.environ.get("DFS_DATABASE_POOL_SIZE", "8"))
+
 CONTROLLER_HOST = os.environ.get("DFS_CONTROLLER_HOST", "0.0.0.0")
 
 CONTROLLER_PORT = int(os.environ.get("DFS_CONTROLLER_PORT", "8000"))
 
 API_KEY_PREFIX = "dfs_"
+
+CHUNKSERVER_MAX_CONCURRENT_RPCS = int(os.environ.get("DFS_CHUNKSERVER_MAX_CONCURRENT_RPCS", "16"))
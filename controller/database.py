@@ -1,11 +1,96 @@
 """Database schema and connection management for SQLite."""
 
+import asyncio
+import json
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
-from typing import Generator
+from concurrent.futures import Executor
+from typing import Any, Callable, Generator, List, Optional
 
-from controller.config import DATABASE_PATH
+from controller.config import (
+    DATABASE_PATH,
+    DATABASE_CACHED_STATEMENTS,
+    DATABASE_CACHE_SIZE_KIB,
+    DATABASE_MMAP_SIZE_BYTES,
+    DATABASE_POOL_SIZE,
+)
+from controller.utils import api_key_hash, operation_id_hash
+
+
+class ReusableCursorConnection(sqlite3.Connection):
+    """
+    SQLite connection exposing a single cursor that hot paths can reuse.
+    """
+
+    @cached_property
+    def reusable_cursor(self) -> sqlite3.Cursor:
+        """
+        Cursor shared by callers on this connection.
+
+        Callers must finish consuming a result set before handing the
+        connection to code that may issue another statement.
+        """
+        return self.cursor()
+
+    def reset_reusable_cursor(self) -> None:
+        """
+        Close the shared cursor, releasing any unfinished statement.
+
+        A fresh cursor is created on the next access.
+        """
+        cursor = self.__dict__.pop("reusable_cursor", None)
+        if cursor is not None:
+            cursor.close()
+
+    @cached_property
+    def _commit_callbacks(self) -> List[Callable[[], None]]:
+        """Callbacks waiting for the open transaction to commit."""
+        return []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run a callback once the open transaction commits.
+
+        The callback is dropped if the transaction rolls back instead, so
+        in-memory state derived from uncommitted rows never outlives them.
+        Without an open transaction it runs immediately.
+        """
+        if self.in_transaction:
+            self._commit_callbacks.append(callback)
+        else:
+            callback()
+
+    def commit_callbacks_mark(self) -> int:
+        """
+        Mark the registered callbacks, e.g. before opening a savepoint.
+
+        Returns:
+            Mark to pass to discard_commit_callbacks
+        """
+        return len(self._commit_callbacks)
+
+    def discard_commit_callbacks(self, mark: int) -> None:
+        """
+        Drop callbacks registered after a mark, e.g. on ROLLBACK TO SAVEPOINT.
+
+        Args:
+            mark: Value returned by commit_callbacks_mark
+        """
+        del self._commit_callbacks[mark:]
+
+    def commit(self) -> None:
+        super().commit()
+        callbacks = self.__dict__.pop("_commit_callbacks", None)
+        for callback in callbacks or ():
+            callback()
+
+    def rollback(self) -> None:
+        super().rollback()
+        self.__dict__.pop("_commit_callbacks", None)
 
 
 def _migrate_user_operations_to_operations(cursor: sqlite3.Cursor) -> None:
@@ -25,6 +110,138 @@ def _migrate_user_operations_to_operations(cursor: sqlite3.Cursor) -> None:
         cursor.execute("DROP INDEX IF EXISTS idx_user_ops_applied")
 
 
+def _migrate_operations_op_id_hash(cursor: sqlite3.Cursor) -> None:
+    """
+    Add and backfill the op_id_hash column on the operations table.
+    """
+    cursor.execute("PRAGMA table_info(operations)")
+    columns = {row[1] for row in cursor.fetchall()}
+
+    if "op_id_hash" in columns:
+        return
+
+    cursor.execute("ALTER TABLE operations ADD COLUMN op_id_hash INTEGER NOT NULL DEFAULT 0")
+
+    cursor.execute("SELECT operation_id FROM operations")
+    cursor.executemany(
+        "UPDATE operations SET op_id_hash = ? WHERE operation_id = ?",
+        [(operation_id_hash(row[0]), row[0]) for row in cursor.fetchall()]
+    )
+
+
+def _migrate_users_api_key_hash(cursor: sqlite3.Cursor) -> None:
+    """
+    Add and backfill the api_key_hash column on the users table.
+    """
+    cursor.execute("PRAGMA table_info(users)")
+    columns = {row[1] for row in cursor.fetchall()}
+
+    if "api_key_hash" in columns:
+        return
+
+    cursor.execute("ALTER TABLE users ADD COLUMN api_key_hash BLOB")
+
+    cursor.execute("SELECT user_id, api_key FROM users WHERE api_key IS NOT NULL")
+    cursor.executemany(
+        "UPDATE users SET api_key_hash = ? WHERE user_id = ?",
+        [(api_key_hash(row[1]), row[0]) for row in cursor.fetchall()]
+    )
+
+
+def _migrate_operations_target_columns(cursor: sqlite3.Cursor) -> None:
+    """
+    Add and backfill the target_owner_id/target_name columns on operations.
+    """
+    cursor.execute("PRAGMA table_info(operations)")
+    columns = {row[1] for row in cursor.fetchall()}
+
+    if "target_name" in columns:
+        return
+
+    cursor.execute("ALTER TABLE operations ADD COLUMN target_owner_id TEXT")
+    cursor.execute("ALTER TABLE operations ADD COLUMN target_name TEXT")
+
+    cursor.execute(
+        "SELECT operation_id, payload FROM operations "
+        "WHERE operation_type IN ('FILE_CREATED', 'FILE_DELETED')"
+    )
+    rows = cursor.fetchall()
+
+    updates = []
+    for operation_id, payload_json in rows:
+        payload = json.loads(payload_json)
+        updates.append((payload.get("owner_id"), payload.get("name"), operation_id))
+
+    cursor.executemany(
+        "UPDATE operations SET target_owner_id = ?, target_name = ? WHERE operation_id = ?",
+        updates
+    )
+
+
+def _migrate_operations_clock_base_id(cursor: sqlite3.Cursor) -> None:
+    """
+    Add the clock_base_id column on the operations table.
+
+    Existing rows keep NULL: their full clock is in operation_vector_clock.
+    """
+    cursor.execute("PRAGMA table_info(operations)")
+    columns = {row[1] for row in cursor.fetchall()}
+
+    if "clock_base_id" in columns:
+        return
+
+    cursor.execute("ALTER TABLE operations ADD COLUMN clock_base_id TEXT")
+
+
+def _detach_rowid_operation_vector_clock(cursor: sqlite3.Cursor) -> None:
+    """
+    Rename an operation_vector_clock table created with a rowid out of the way.
+
+    Its rows are copied into the WITHOUT ROWID table by
+    _copy_rowid_operation_vector_clock.
+    """
+    cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE type='table' AND name='operation_vector_clock'
+    """)
+    row = cursor.fetchone()
+
+    if row and "WITHOUT ROWID" not in row[0].upper():
+        cursor.execute("ALTER TABLE operation_vector_clock RENAME TO operation_vector_clock_rowid")
+
+
+def _copy_rowid_operation_vector_clock(cursor: sqlite3.Cursor) -> None:
+    """
+    Move rows from a detached rowid operation_vector_clock table, then drop it.
+    """
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='operation_vector_clock_rowid'
+    """)
+
+    if cursor.fetchone():
+        cursor.execute("""
+            INSERT OR IGNORE INTO operation_vector_clock (operation_id, controller_id, sequence)
+            SELECT operation_id, controller_id, sequence FROM operation_vector_clock_rowid
+        """)
+        cursor.execute("DROP TABLE operation_vector_clock_rowid")
+
+
+def _migrate_operation_vector_clocks(cursor: sqlite3.Cursor) -> None:
+    """
+    Backfill operation_vector_clock from the JSON vector_clock column.
+    """
+    cursor.execute("SELECT 1 FROM operation_vector_clock LIMIT 1")
+    if cursor.fetchone():
+        return
+
+    cursor.execute("""
+        INSERT OR IGNORE INTO operation_vector_clock (operation_id, controller_id, sequence)
+        SELECT operations.operation_id, clock.key, clock.value
+        FROM operations, json_each(operations.vector_clock) AS clock
+    """)
+
+
 def init_database() -> None:
     """
     Initialize database and create tables if they don't exist.
@@ -35,6 +252,8 @@ def init_database() -> None:
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
+        cursor.execute("PRAGMA journal_mode=WAL")
+
         _migrate_user_operations_to_operations(cursor)
 
         cursor.execute("""
@@ -44,10 +263,13 @@ def init_database() -> None:
                 password_hash TEXT NOT NULL,
                 api_key TEXT UNIQUE,
                 created_at TEXT NOT NULL,
-                key_updated_at TEXT
+                key_updated_at TEXT,
+                api_key_hash BLOB
             )
         """)
 
+        _migrate_users_api_key_hash(cursor)
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS files (
                 file_id TEXT PRIMARY KEY,
@@ -83,13 +305,44 @@ def init_database() -> None:
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS operations (
                 operation_id TEXT PRIMARY KEY,
+                op_id_hash INTEGER NOT NULL,
                 operation_type TEXT NOT NULL,
                 user_id TEXT NOT NULL,
                 timestamp_ms INTEGER NOT NULL,
                 vector_clock TEXT NOT NULL,
                 payload TEXT NOT NULL,
                 applied INTEGER NOT NULL DEFAULT 0,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                target_owner_id TEXT,
+                target_name TEXT,
+                clock_base_id TEXT
+            )
+        """)
+
+        _migrate_operations_op_id_hash(cursor)
+        _migrate_operations_target_columns(cursor)
+        _migrate_operations_clock_base_id(cursor)
+
+        _detach_rowid_operation_vector_clock(cursor)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS operation_vector_clock (
+                operation_id TEXT NOT NULL,
+                controller_id TEXT NOT NULL,
+                sequence INTEGER NOT NULL,
+                PRIMARY KEY(operation_id, controller_id)
+            ) WITHOUT ROWID
+        """)
+
+        _copy_rowid_operation_vector_clock(cursor)
+        _migrate_operation_vector_clocks(cursor)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS vector_clock_baselines (
+                base_id TEXT NOT NULL,
+                controller_id TEXT NOT NULL,
+                sequence INTEGER NOT NULL,
+                PRIMARY KEY(base_id, controller_id)
             )
         """)
 
@@ -133,13 +386,39 @@ def init_database() -> None:
         """)
 
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_files_owner_name ON files(owner_id, name)
+            CREATE TABLE IF NOT EXISTS deferred_operations (
+                operation_id TEXT PRIMARY KEY,
+                dependency_key TEXT NOT NULL,
+                deferred_at TEXT NOT NULL
+            )
         """)
 
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS skipped_files (
+                file_id TEXT PRIMARY KEY,
+                skipped_at TEXT NOT NULL
+            )
+        """)
+
+        cursor.execute("DROP INDEX IF EXISTS idx_files_owner_name")
+
         cursor.execute("""
             CREATE UNIQUE INDEX IF NOT EXISTS idx_files_owner_name_unique ON files(owner_id, name)
         """)
 
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_users_api_key_hash ON users(api_key_hash)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_files_owner_covering
+            ON files(owner_id, file_id, name, size, created_at)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tags_tag_file ON tags(tag, file_id)
+        """)
+
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_tombstones_owner_name ON file_tombstones(owner_id, name)
         """)
@@ -149,7 +428,35 @@ def init_database() -> None:
         """)
 
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_ops_user_id ON operations(user_id)
+            SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_ops_user_ts'
+        """)
+        analyze_operations = cursor.fetchone() is None
+
+        cursor.execute("DROP INDEX IF EXISTS idx_ops_user_id")
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ops_user_ts ON operations(user_id, timestamp_ms)
+        """)
+
+        cursor.execute("DROP INDEX IF EXISTS idx_ops_id_hash")
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ops_id_hash_applied
+            ON operations(op_id_hash, operation_id, applied)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ops_file_target
+            ON operations(operation_type, target_owner_id, target_name)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ops_type_user_applied_ts
+            ON operations(operation_type, user_id, applied, timestamp_ms)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ops_user_type ON operations(user_id, operation_type)
         """)
 
         cursor.execute("""
@@ -168,17 +475,139 @@ def init_database() -> None:
             CREATE INDEX IF NOT EXISTS idx_chunk_liveness_gc ON chunk_liveness(marked_for_gc)
         """)
 
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_deferred_ops_dependency
+            ON deferred_operations(dependency_key)
+        """)
+
+        if analyze_operations:
+            cursor.execute("ANALYZE operations")
+
         conn.commit()
 
 
+_thread_local = threading.local()
+
+# SQLite allows a single writer. Metadata write transactions from the file
+# and tag services and the operation applier run on worker threads through
+# run_metadata_write, which serialises them so they never contend with each
+# other for the write lock. Registration and login are the only writers
+# outside it: their threads spend most of their time hashing passwords, so
+# they wait on SQLite's busy timeout instead.
+_metadata_write_lock = asyncio.Lock()
+
+
+async def run_metadata_write(
+    func: Callable[..., Any],
+    *args: Any,
+    executor: Optional[Executor] = None
+) -> Any:
+    """
+    Run a blocking metadata transaction on a worker thread under the write lock.
+
+    Args:
+        func: Synchronous function running the transaction
+        *args: Arguments to pass to func
+        executor: Executor to run func on (the default executor if None)
+
+    Returns:
+        Result of func
+    """
+    async with _metadata_write_lock:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+
+
+# Idle connections handed out by get_db_connection. They may be checked out
+# from any thread, but each is only ever used by one thread at a time.
+_connection_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DATABASE_POOL_SIZE)
+
+
+def _open_connection(check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open and configure a new database connection.
+
+    Args:
+        check_same_thread: Whether sqlite3 should reject use from other threads
+    """
+    conn = sqlite3.connect(
+        DATABASE_PATH,
+        factory=ReusableCursorConnection,
+        cached_statements=DATABASE_CACHED_STATEMENTS,
+        check_same_thread=check_same_thread
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA cache_size=-{DATABASE_CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={DATABASE_MMAP_SIZE_BYTES}")
+    return conn
+
+
 @contextmanager
 def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
     """
     Context manager for database connections.
+
+    Connections are borrowed from a pool instead of opened per call, so their
+    page and statement caches survive between uses. Nested calls get distinct
+    connections, and a transaction left open by the caller is rolled back
+    before the connection goes back to the pool.
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    try:
+        conn = _connection_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection(check_same_thread=False)
+
+    try:
+        yield conn
+    finally:
+        try:
+            conn.reset_reusable_cursor()
+            if conn.in_transaction:
+                conn.rollback()
+            _connection_pool.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            conn.close()
+
+
+@contextmanager
+def get_persistent_db_connection() -> Generator[sqlite3.Connection, None, None]:
+    """
+    Context manager yielding the calling thread's long-lived connection.
+
+    The connection and its statement cache survive across calls instead of
+    being closed on exit; a transaction left open by the caller is rolled
+    back on exit.
+    """
+    conn = getattr(_thread_local, "connection", None)
+    if conn is None:
+        conn = _open_connection()
+        _thread_local.connection = conn
+
+    try:
+        yield conn
+    finally:
+        conn.reset_reusable_cursor()
+        if conn.in_transaction:
+            conn.rollback()
+
+
+@contextmanager
+def get_read_db_connection() -> Generator[sqlite3.Connection, None, None]:
+    """
+    Context manager yielding the calling thread's long-lived read-only connection.
+
+    The connection is opened with query_only set, so under WAL it reads
+    alongside the writer without ever taking the write lock.
+    """
+    conn = getattr(_thread_local, "read_connection", None)
+    if conn is None:
+        conn = _open_connection()
+        conn.execute("PRAGMA query_only=1")
+        _thread_local.read_connection = conn
+
     try:
         yield conn
     finally:
-        conn.close()
+        conn.reset_reusable_cursor()
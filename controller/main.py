@@ -126,6 +126,10 @@ async def shutdown_event():
     await cleanup_task.stop()
     logger.info("Cleanup task stopped")
 
+    from controller.chunkserver_client import close_channels
+    await close_channels()
+    logger.info("Chunkserver channels closed")
+
 
 @app.exception_handler(UserAlreadyExistsError)
 async def user_already_exists_handler(request: Request, exc: UserAlreadyExistsError):
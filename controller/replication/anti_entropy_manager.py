@@ -15,7 +15,7 @@ from common.protocol import Operation
 from controller.replication.controller_id import get_controller_id
 from controller.replication.operation_log import get_all_operation_ids
 from controller.replication.grpc_client import ReplicationClient
-from controller.replication.operation_applier import apply_operation
+from controller.replication.operation_applier import apply_operations
 from controller.replication.gossip_manager import GossipManager
 
 logger = logging.getLogger(__name__)
@@ -169,16 +169,11 @@ class AntiEntropyManager:
                     f"applying in causal order"
                 )
 
-                for op in sorted_ops:
-                    try:
-                        applied = await apply_operation(op)
-                        if applied:
-                            logger.debug(f"Applied operation {op.operation_id} from anti-entropy")
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to apply operation {op.operation_id}: {e}",
-                            exc_info=True
-                        )
+                results = await apply_operations(sorted_ops)
+
+                logger.debug(
+                    f"Applied {sum(results)} of {len(sorted_ops)} operations from anti-entropy"
+                )
 
             if missing_from_peer:
                 from controller.replication.operation_log import get_operations_by_ids
@@ -17,11 +17,22 @@ from common.protocol import (
     QueryChunkLivenessRequest, QueryChunkLivenessResponse,
     Operation
 )
-from common.constants import CHUNKSERVER_TIMEOUT_SECONDS
+from common.constants import (
+    CHUNKSERVER_TIMEOUT_SECONDS,
+    REPLICATION_COMPRESSION_ENABLED,
+    REPLICATION_MAX_MESSAGE_BYTES,
+    REPLICATION_WRITE_BUFFER_BYTES,
+    REPLICATION_MIN_PING_INTERVAL_MS
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _serialize(message) -> bytes:
+    """Encode a protocol dataclass for the wire."""
+    return message.to_json()
+
+
 class ReplicationClient:
     """
     gRPC client for replication operations with peer controllers.
@@ -50,17 +61,15 @@ class ReplicationClient:
 
             multi_callable = channel.unary_unary(
                 '/replication.ReplicationService/Gossip',
-                request_serializer=lambda x: x,
-                response_deserializer=lambda x: x,
+                request_serializer=_serialize,
+                response_deserializer=GossipResponse.from_json,
             )
 
-            response_bytes = await multi_callable(
-                message.to_json(),
+            response = await multi_callable(
+                message,
                 timeout=CHUNKSERVER_TIMEOUT_SECONDS
             )
 
-            response = GossipResponse.from_json(response_bytes)
-
             logger.debug(f"Gossip sent to {peer_address} successfully")
 
             return response
@@ -90,18 +99,16 @@ class ReplicationClient:
 
             multi_callable = channel.unary_unary(
                 '/replication.ReplicationService/GetStateSummary',
-                request_serializer=lambda x: x,
-                response_deserializer=lambda x: x,
+                request_serializer=_serialize,
+                response_deserializer=StateSummary.from_json,
             )
 
             request = GetStateSummaryRequest()
-            response_bytes = await multi_callable(
-                request.to_json(),
+            response = await multi_callable(
+                request,
                 timeout=CHUNKSERVER_TIMEOUT_SECONDS
             )
 
-            response = StateSummary.from_json(response_bytes)
-
             logger.debug(
                 f"State summary received from {peer_address}: "
                 f"{len(response.operation_ids)} operations"
@@ -139,18 +146,16 @@ class ReplicationClient:
 
             multi_callable = channel.unary_unary(
                 '/replication.ReplicationService/FetchOperations',
-                request_serializer=lambda x: x,
-                response_deserializer=lambda x: x,
+                request_serializer=_serialize,
+                response_deserializer=FetchOperationsResponse.from_json,
             )
 
             request = FetchOperationsRequest(operation_ids=operation_ids)
-            response_bytes = await multi_callable(
-                request.to_json(),
+            response = await multi_callable(
+                request,
                 timeout=CHUNKSERVER_TIMEOUT_SECONDS
             )
 
-            response = FetchOperationsResponse.from_json(response_bytes)
-
             logger.info(
                 f"Fetched {len(response.operations)} operations from {peer_address}"
             )
@@ -187,18 +192,16 @@ class ReplicationClient:
 
             multi_callable = channel.unary_unary(
                 '/replication.ReplicationService/PushOperations',
-                request_serializer=lambda x: x,
-                response_deserializer=lambda x: x,
+                request_serializer=_serialize,
+                response_deserializer=PushOperationsResponse.from_json,
             )
 
             request = PushOperationsRequest(operations=operations)
-            response_bytes = await multi_callable(
-                request.to_json(),
+            response = await multi_callable(
+                request,
                 timeout=CHUNKSERVER_TIMEOUT_SECONDS
             )
 
-            response = PushOperationsResponse.from_json(response_bytes)
-
             if response.success:
                 logger.info(f"Pushed {len(operations)} operations to {peer_address}")
             else:
@@ -238,18 +241,16 @@ class ReplicationClient:
 
             multi_callable = channel.unary_unary(
                 '/replication.ReplicationService/QueryChunkLiveness',
-                request_serializer=lambda x: x,
-                response_deserializer=lambda x: x,
+                request_serializer=_serialize,
+                response_deserializer=QueryChunkLivenessResponse.from_json,
             )
 
             request = QueryChunkLivenessRequest(chunk_id=chunk_id)
-            response_bytes = await multi_callable(
-                request.to_json(),
+            response = await multi_callable(
+                request,
                 timeout=CHUNKSERVER_TIMEOUT_SECONDS
             )
 
-            response = QueryChunkLivenessResponse.from_json(response_bytes)
-
             logger.debug(
                 f"Chunk liveness query for {chunk_id} from {peer_address}: "
                 f"is_live={response.is_live}, files={response.referenced_by_files}"
@@ -275,7 +276,18 @@ class ReplicationClient:
             gRPC channel
         """
         if peer_address not in self._channels:
-            self._channels[peer_address] = grpc.aio.insecure_channel(peer_address)
+            compression = grpc.Compression.Gzip if REPLICATION_COMPRESSION_ENABLED else grpc.Compression.NoCompression
+            options = [
+                ('grpc.max_send_message_length', REPLICATION_MAX_MESSAGE_BYTES),
+                ('grpc.max_receive_message_length', REPLICATION_MAX_MESSAGE_BYTES),
+                ('grpc.http2.write_buffer_size', REPLICATION_WRITE_BUFFER_BYTES),
+                ('grpc.http2.min_time_between_pings_ms', REPLICATION_MIN_PING_INTERVAL_MS),
+            ]
+            self._channels[peer_address] = grpc.aio.insecure_channel(
+                peer_address,
+                options=options,
+                compression=compression
+            )
             logger.debug(f"Created gRPC channel to {peer_address}")
 
         return self._channels[peer_address]
@@ -9,7 +9,20 @@ import logging
 import asyncio
 from typing import Optional
 
-from common.constants import REPLICATION_PORT
+from common.constants import (
+    REPLICATION_PORT,
+    REPLICATION_COMPRESSION_ENABLED,
+    REPLICATION_MAX_MESSAGE_BYTES,
+    REPLICATION_WRITE_BUFFER_BYTES,
+    REPLICATION_MIN_PING_INTERVAL_MS
+)
+from common.protocol import (
+    GossipMessage,
+    GetStateSummaryRequest,
+    FetchOperationsRequest,
+    PushOperationsRequest,
+    QueryChunkLivenessRequest
+)
 from controller.replication.grpc_service import ReplicationServicer
 
 logger = logging.getLogger(__name__)
@@ -33,7 +46,14 @@ class ReplicationServer:
 
         Binds to [::]:REPLICATION_PORT and starts serving.
         """
-        self.server = grpc.aio.server()
+        compression = grpc.Compression.Gzip if REPLICATION_COMPRESSION_ENABLED else grpc.Compression.NoCompression
+        options = [
+            ('grpc.max_send_message_length', REPLICATION_MAX_MESSAGE_BYTES),
+            ('grpc.max_receive_message_length', REPLICATION_MAX_MESSAGE_BYTES),
+            ('grpc.http2.write_buffer_size', REPLICATION_WRITE_BUFFER_BYTES),
+            ('grpc.http2.min_ping_interval_without_data_ms', REPLICATION_MIN_PING_INTERVAL_MS),
+        ]
+        self.server = grpc.aio.server(compression=compression, options=options)
 
         self._register_handlers()
 
@@ -59,8 +79,13 @@ class ReplicationServer:
         """
         Register gRPC method handlers.
 
-        Maps RPC methods to servicer methods.
+        Maps RPC methods to servicer methods. Messages are decoded and
+        encoded at the gRPC layer so servicer methods work on protocol
+        dataclasses.
         """
+        def _serialize(message) -> bytes:
+            return message.to_json()
+
         async def gossip_handler(request, context):
             return await self.servicer.Gossip(request)
 
@@ -82,28 +107,28 @@ class ReplicationServer:
                 {
                     'Gossip': grpc.unary_unary_rpc_method_handler(
                         gossip_handler,
-                        request_deserializer=lambda x: x,
-                        response_serializer=lambda x: x,
+                        request_deserializer=GossipMessage.from_json,
+                        response_serializer=_serialize,
                     ),
                     'GetStateSummary': grpc.unary_unary_rpc_method_handler(
                         get_state_summary_handler,
-                        request_deserializer=lambda x: x,
-                        response_serializer=lambda x: x,
+                        request_deserializer=GetStateSummaryRequest.from_json,
+                        response_serializer=_serialize,
                     ),
                     'FetchOperations': grpc.unary_unary_rpc_method_handler(
                         fetch_operations_handler,
-                        request_deserializer=lambda x: x,
-                        response_serializer=lambda x: x,
+                        request_deserializer=FetchOperationsRequest.from_json,
+                        response_serializer=_serialize,
                     ),
                     'PushOperations': grpc.unary_unary_rpc_method_handler(
                         push_operations_handler,
-                        request_deserializer=lambda x: x,
-                        response_serializer=lambda x: x,
+                        request_deserializer=PushOperationsRequest.from_json,
+                        response_serializer=_serialize,
                     ),
                     'QueryChunkLiveness': grpc.unary_unary_rpc_method_handler(
                         query_chunk_liveness_handler,
-                        request_deserializer=lambda x: x,
-                        response_serializer=lambda x: x,
+                        request_deserializer=QueryChunkLivenessRequest.from_json,
+                        response_serializer=_serialize,
                     ),
                 }
             ),
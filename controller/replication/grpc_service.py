@@ -5,7 +5,7 @@ Implements server-side handlers for gossip, anti-entropy, and operation exchange
 """
 
 import logging
-from typing import List
+from typing import List, Dict, Set
 
 from common.protocol import (
     GossipMessage, GossipResponse,
@@ -17,10 +17,10 @@ from common.protocol import (
 from controller.replication.controller_id import get_controller_id
 from controller.replication.operation_log import (
     get_all_operation_ids,
+    get_existing_operation_ids,
     get_operations_by_ids,
     get_recent_operation_summaries
 )
-from controller.replication.vector_clock import VectorClock
 from controller.database import get_db_connection
 
 logger = logging.getLogger(__name__)
@@ -36,21 +36,20 @@ class ReplicationServicer:
     def __init__(self):
         """Initialize the replication servicer."""
         self.controller_id = get_controller_id()
+        self._peer_known_summaries: Dict[str, Set[str]] = {}
         logger.info(f"Initialized ReplicationServicer [controller_id={self.controller_id}]")
 
-    async def Gossip(self, request_bytes: bytes) -> bytes:
+    async def Gossip(self, request: GossipMessage) -> GossipResponse:
         """
         Handle incoming gossip message.
 
         Args:
-            request_bytes: Serialized GossipMessage
+            request: Incoming GossipMessage
 
         Returns:
-            Serialized GossipResponse
+            GossipResponse
         """
         try:
-            request = GossipMessage.from_json(request_bytes)
-
             logger.debug(
                 f"Received gossip from {request.sender_id} "
                 f"({len(request.operation_summaries)} operations)"
@@ -58,15 +57,23 @@ class ReplicationServicer:
 
             my_vector_clock = self._get_current_vector_clock()
 
-            sender_clock = VectorClock(clocks=request.vector_clock)
-            my_clock = VectorClock(clocks=my_vector_clock)
-            my_clock.merge(sender_clock)
-            self._update_vector_clock(my_clock)
+            advanced = {}
+            for controller_id, sequence in request.vector_clock.items():
+                if sequence > my_vector_clock.get(controller_id, 0):
+                    my_vector_clock[controller_id] = sequence
+                    advanced[controller_id] = sequence
+
+            if advanced:
+                self._update_vector_clock(advanced)
 
-            my_operation_ids = set(get_all_operation_ids())
             received_operation_ids = {op.operation_id for op in request.operation_summaries}
 
-            missing_operation_ids = list(received_operation_ids - my_operation_ids)
+            already_known = self._peer_known_summaries.get(request.sender_id, set())
+            new_operation_ids = received_operation_ids - already_known
+            missing = new_operation_ids - get_existing_operation_ids(new_operation_ids)
+            missing_operation_ids = list(missing)
+
+            self._peer_known_summaries[request.sender_id] = received_operation_ids - missing
 
             response = GossipResponse(
                 peer_id=self.controller_id,
@@ -80,25 +87,23 @@ class ReplicationServicer:
                 f"missing {len(missing_operation_ids)} ops"
             )
 
-            return response.to_json()
+            return response
 
         except Exception as e:
             logger.error(f"Error processing gossip: {e}", exc_info=True)
             raise
 
-    async def GetStateSummary(self, request_bytes: bytes) -> bytes:
+    async def GetStateSummary(self, request: GetStateSummaryRequest) -> StateSummary:
         """
         Handle state summary request for anti-entropy.
 
         Args:
-            request_bytes: Serialized GetStateSummaryRequest
+            request: Incoming GetStateSummaryRequest
 
         Returns:
-            Serialized StateSummary
+            StateSummary
         """
         try:
-            GetStateSummaryRequest.from_json(request_bytes)
-
             my_vector_clock = self._get_current_vector_clock()
             operation_ids = get_all_operation_ids()
 
@@ -112,25 +117,23 @@ class ReplicationServicer:
                 f"State summary requested: returning {len(operation_ids)} operation IDs"
             )
 
-            return response.to_json()
+            return response
 
         except Exception as e:
             logger.error(f"Error getting state summary: {e}", exc_info=True)
             raise
 
-    async def FetchOperations(self, request_bytes: bytes) -> bytes:
+    async def FetchOperations(self, request: FetchOperationsRequest) -> FetchOperationsResponse:
         """
         Handle request to fetch specific operations.
 
         Args:
-            request_bytes: Serialized FetchOperationsRequest
+            request: Incoming FetchOperationsRequest
 
         Returns:
-            Serialized FetchOperationsResponse
+            FetchOperationsResponse
         """
         try:
-            request = FetchOperationsRequest.from_json(request_bytes)
-
             operations = get_operations_by_ids(request.operation_ids)
 
             response = FetchOperationsResponse(operations=operations)
@@ -140,25 +143,23 @@ class ReplicationServicer:
                 f"(requested {len(request.operation_ids)})"
             )
 
-            return response.to_json()
+            return response
 
         except Exception as e:
             logger.error(f"Error fetching operations: {e}", exc_info=True)
             raise
 
-    async def PushOperations(self, request_bytes: bytes) -> bytes:
+    async def PushOperations(self, request: PushOperationsRequest) -> PushOperationsResponse:
         """
         Handle incoming operations pushed from peer.
 
         Args:
-            request_bytes: Serialized PushOperationsRequest
+            request: Incoming PushOperationsRequest
 
         Returns:
-            Serialized PushOperationsResponse
+            PushOperationsResponse
         """
         try:
-            request = PushOperationsRequest.from_json(request_bytes)
-
             from controller.replication.anti_entropy_manager import _sort_operations_by_causality
 
             sorted_operations = _sort_operations_by_causality(request.operations)
@@ -167,15 +168,14 @@ class ReplicationServicer:
                 f"Received {len(request.operations)} operations, applying in causal order"
             )
 
-            for operation in sorted_operations:
-                from controller.replication.operation_applier import apply_operation
-                await apply_operation(operation)
+            from controller.replication.operation_applier import apply_operations
+            await apply_operations(sorted_operations)
 
             response = PushOperationsResponse(success=True)
 
             logger.info(f"Successfully processed {len(request.operations)} pushed operations")
 
-            return response.to_json()
+            return response
 
         except Exception as e:
             logger.error(f"Error pushing operations: {e}", exc_info=True)
@@ -183,21 +183,19 @@ class ReplicationServicer:
                 success=False,
                 error_message=str(e)
             )
-            return response.to_json()
+            return response
 
-    async def QueryChunkLiveness(self, request_bytes: bytes) -> bytes:
+    async def QueryChunkLiveness(self, request: QueryChunkLivenessRequest) -> QueryChunkLivenessResponse:
         """
         Handle chunk liveness query for distributed GC.
 
         Args:
-            request_bytes: Serialized QueryChunkLivenessRequest
+            request: Incoming QueryChunkLivenessRequest
 
         Returns:
-            Serialized QueryChunkLivenessResponse
+            QueryChunkLivenessResponse
         """
         try:
-            request = QueryChunkLivenessRequest.from_json(request_bytes)
-
             chunk_id = request.chunk_id
 
             with get_db_connection() as conn:
@@ -223,7 +221,7 @@ class ReplicationServicer:
                 f"is_live={is_live}, files={len(referenced_by_files)}"
             )
 
-            return response.to_json()
+            return response
 
         except Exception as e:
             logger.error(f"Error querying chunk liveness: {e}", exc_info=True)
@@ -242,26 +240,30 @@ class ReplicationServicer:
             rows = cursor.fetchall()
             return {row[0]: row[1] for row in rows}
 
-    def _update_vector_clock(self, vector_clock: VectorClock) -> None:
+    def _update_vector_clock(self, advanced: dict) -> None:
         """
-        Update vector clock state in database.
+        Persist vector clock entries that advanced during a merge.
 
         Args:
-            vector_clock: Updated vector clock
+            advanced: Mapping of controller_id to its new sequence
         """
         from datetime import datetime
 
+        now = datetime.utcnow().isoformat()
+
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            for controller_id, sequence in vector_clock.clocks.items():
-                cursor.execute(
-                    """
-                    INSERT INTO vector_clock_state (controller_id, sequence, last_seen_at)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(controller_id) DO UPDATE SET
-                        sequence = excluded.sequence,
-                        last_seen_at = excluded.last_seen_at
-                    """,
-                    (controller_id, sequence, datetime.utcnow().isoformat())
-                )
+            cursor = conn.reusable_cursor
+            cursor.executemany(
+                """
+                INSERT INTO vector_clock_state (controller_id, sequence, last_seen_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(controller_id) DO UPDATE SET
+                    sequence = MAX(vector_clock_state.sequence, excluded.sequence),
+                    last_seen_at = excluded.last_seen_at
+                """,
+                [
+                    (controller_id, sequence, now)
+                    for controller_id, sequence in advanced.items()
+                ]
+            )
             conn.commit()
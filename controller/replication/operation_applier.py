@@ -7,26 +7,89 @@ conflict resolution strategies.
 """
 
 import logging
-from typing import List, Optional, Set, Dict
+import sqlite3
+from typing import Callable, List, Optional, Set, Dict, Tuple
 from datetime import datetime
-from collections import defaultdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 
 from common.protocol import Operation
-from controller.database import get_db_connection
+from common.constants import (
+    OPERATION_APPLY_BATCH_SIZE,
+    DEFERRED_RETRY_INTERVAL_SECONDS,
+    SKIPPED_FILE_IDS_CACHE_SIZE,
+    CONFLICT_RESOLUTION_CACHE_SIZE
+)
+from controller.database import get_persistent_db_connection, run_metadata_write
+from controller.repositories.user_repository import invalidate_api_key_cache
+from controller.utils import api_key_hash
 from controller.replication.operation_log import (
     mark_operation_applied,
-    get_operation_by_id,
-    get_operations_for_user
+    mark_operations_applied,
+    get_operation_applied_flag,
+    get_applied_flags,
+    get_operations_by_ids,
+    get_latest_applied_api_key_op,
+    get_user_created_ops_for_users
 )
-from controller.replication.vector_clock import VectorClock
+from controller.replication.vector_clock import VectorClock, BEFORE, AFTER
 
 logger = logging.getLogger(__name__)
 
+# Operation types whose appliers query the applied flag of earlier operations,
+# so pending applied marks must be flushed before they run in a batch.
+_READS_APPLIED_STATE = frozenset({"API_KEY_UPDATED"})
+
+# Operation types that can change a user's API key.
+_CHANGES_API_KEYS = frozenset({"USER_CREATED", "API_KEY_UPDATED"})
+
+_INSERT_TAG_SQL = "INSERT OR IGNORE INTO tags (file_id, tag) VALUES (?, ?)"
+_DELETE_DEFERRED_OPERATION_SQL = "DELETE FROM deferred_operations WHERE operation_id = ?"
+
+# In-memory index over the deferred_operations table, reloaded on startup by
+# load_deferred_operations().
 _deferred_operations: Dict[str, Operation] = {}
-_operation_dependencies: Dict[str, Set[str]] = defaultdict(set)
-_skipped_file_ids: Set[str] = set()
-_lock = asyncio.Lock()
+_operation_dependencies: Dict[str, Set[str]] = {}
+# Reverse of _operation_dependencies: the one key each deferred operation waits on.
+_operation_dependency_keys: Dict[str, str] = {}
+
+# Bounded LRU in front of the skipped_files table. Only committed rows
+# may enter it: IDs seen inside an apply transaction wait in
+# _pending_skipped_file_ids until that transaction commits.
+_skipped_file_ids: "OrderedDict[str, None]" = OrderedDict()
+_pending_skipped_file_ids: List[str] = []
+
+# Winning operation_id per set of competing FILE_CREATED operation IDs. The
+# resolution depends only on immutable operation fields, so a retry over the
+# same candidates can skip loading them.
+_file_creation_winners: "OrderedDict[frozenset, str]" = OrderedDict()
+
+_DEP_KEY_BUILDERS: Dict[str, Callable[[dict], str]] = {
+    "FILE_CREATED": lambda payload: f"file:{payload['file_id']}",
+    "USER_CREATED": lambda payload: f"user:{payload['user_id']}",
+}
+
+# Guards the three deferred-operation indexes above only. Blocks holding
+# it must contain in-memory mutations alone: never call apply_operation or
+# touch SQLite while holding a module lock. _skipped_file_ids,
+# _pending_skipped_file_ids and _file_creation_winners are only used by the
+# synchronous appliers, which all run on the writer thread below, so they
+# need no lock.
+_deferred_lock = asyncio.Lock()
+
+# Set while any operation is deferred so the periodic sweep can sleep
+# instead of polling an empty index. Set and cleared under _deferred_lock.
+_deferred_pending = asyncio.Event()
+
+# SQLite allows a single writer, so all apply transactions run on one thread
+# that owns its persistent connection, keeping blocking I/O off the event loop.
+_writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="operation-applier")
+
+# Deferred operations whose dependency has been satisfied, drained in batches
+# by a single worker task started on first use.
+_retry_queue: "asyncio.Queue[Operation]" = asyncio.Queue()
+_retry_worker_task: Optional[asyncio.Task] = None
 
 
 class DependencyNotMetError(Exception):
@@ -43,6 +106,62 @@ class DependencyNotMetError(Exception):
         super().__init__(dependency_description)
 
 
+def _index_deferred_operation(operation: Operation, required_dependency: str) -> None:
+    """
+    Add a deferred operation to the in-memory indexes.
+
+    Re-deferring an operation moves it to its new dependency key. Callers
+    must hold _deferred_lock.
+
+    Args:
+        operation: Operation to index
+        required_dependency: Key identifying the required dependency
+    """
+    op_id = operation.operation_id
+    previous_dependency = _operation_dependency_keys.get(op_id)
+    if previous_dependency is not None and previous_dependency != required_dependency:
+        _discard_dependency_waiter(previous_dependency, op_id)
+
+    _deferred_operations[op_id] = operation
+    _operation_dependencies.setdefault(required_dependency, set()).add(op_id)
+    _operation_dependency_keys[op_id] = required_dependency
+    _deferred_pending.set()
+
+
+def _unindex_deferred_operation(op_id: str) -> Optional[Operation]:
+    """
+    Remove a deferred operation from the in-memory indexes.
+
+    Callers must hold _deferred_lock.
+
+    Args:
+        op_id: UUID of the deferred operation
+
+    Returns:
+        The removed operation, or None if it was not deferred
+    """
+    dependency_key = _operation_dependency_keys.pop(op_id, None)
+    if dependency_key is not None:
+        _discard_dependency_waiter(dependency_key, op_id)
+    return _deferred_operations.pop(op_id, None)
+
+
+def _discard_dependency_waiter(dependency_key: str, op_id: str) -> None:
+    """
+    Drop one operation from a dependency's waiting set, removing empty sets.
+
+    Args:
+        dependency_key: Key identifying the dependency
+        op_id: UUID of the waiting operation
+    """
+    waiting_ids = _operation_dependencies.get(dependency_key)
+    if waiting_ids is None:
+        return
+    waiting_ids.discard(op_id)
+    if not waiting_ids:
+        del _operation_dependencies[dependency_key]
+
+
 async def _defer_operation(operation: Operation, required_dependency: str):
     """
     Defer an operation until its dependency is satisfied.
@@ -51,9 +170,8 @@ async def _defer_operation(operation: Operation, required_dependency: str):
         operation: Operation to defer
         required_dependency: Key identifying the required dependency
     """
-    async with _lock:
-        _deferred_operations[operation.operation_id] = operation
-        _operation_dependencies[required_dependency].add(operation.operation_id)
+    async with _deferred_lock:
+        _index_deferred_operation(operation, required_dependency)
 
         logger.info(
             f"Deferred operation {operation.operation_id} "
@@ -61,14 +179,155 @@ async def _defer_operation(operation: Operation, required_dependency: str):
         )
 
 
+def _persist_deferred_operation(
+    operation: Operation,
+    required_dependency: str,
+    conn: sqlite3.Connection
+) -> None:
+    """
+    Record a deferred operation inside the caller's open transaction.
+
+    Args:
+        operation: Operation being deferred
+        required_dependency: Key identifying the required dependency
+        conn: Database connection holding the apply transaction
+    """
+    conn.reusable_cursor.execute(
+        """
+        INSERT INTO deferred_operations (operation_id, dependency_key, deferred_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(operation_id) DO UPDATE SET
+            dependency_key = excluded.dependency_key,
+            deferred_at = excluded.deferred_at
+        """,
+        (operation.operation_id, required_dependency, datetime.utcnow().isoformat())
+    )
+
+
+async def load_deferred_operations() -> int:
+    """
+    Rebuild the in-memory deferred-operation index from the database.
+
+    Returns:
+        Number of deferred operations loaded
+    """
+    dependency_keys, operations = await _run_on_writer(_load_deferred_operations_sync)
+
+    async with _deferred_lock:
+        for operation in operations:
+            _index_deferred_operation(operation, dependency_keys[operation.operation_id])
+
+    return len(operations)
+
+
+def _load_deferred_operations_sync() -> Tuple[Dict[str, str], List[Operation]]:
+    """
+    Read deferred operations and their dependency keys from the database.
+
+    Returns:
+        Tuple of (operation_id -> dependency_key, deferred operations)
+    """
+    with get_persistent_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT operation_id, dependency_key FROM deferred_operations")
+        dependency_keys = {row[0]: row[1] for row in cursor.fetchall()}
+
+        return dependency_keys, get_operations_by_ids(list(dependency_keys), conn=conn)
+
+
+def _get_applied_flags_sync(operation_ids: List[str]) -> Dict[str, int]:
+    """
+    Look up applied flags on the writer thread's connection.
+
+    Args:
+        operation_ids: Operation IDs to look up
+
+    Returns:
+        Dict mapping stored operation IDs to their applied flag
+    """
+    with get_persistent_db_connection() as conn:
+        return get_applied_flags(operation_ids, conn=conn)
+
+
+async def _run_on_writer(func, *args):
+    """
+    Run a blocking database function on the applier's writer thread.
+
+    Runs under the shared metadata write lock, so replicated writes never
+    contend with local metadata transactions for SQLite's write lock.
+
+    Args:
+        func: Synchronous function to run
+        *args: Arguments to pass to func
+
+    Returns:
+        Result of func
+    """
+    return await run_metadata_write(func, *args, executor=_writer_executor)
+
+
+def _mark_file_skipped(file_id: str, conn: sqlite3.Connection) -> None:
+    """
+    Record that a file lost conflict resolution and will never be created.
+
+    Args:
+        file_id: UUID of the skipped file
+        conn: Database connection holding the apply transaction
+    """
+    conn.reusable_cursor.execute(
+        "INSERT OR IGNORE INTO skipped_files (file_id, skipped_at) VALUES (?, ?)",
+        (file_id, datetime.utcnow().isoformat())
+    )
+    _pending_skipped_file_ids.append(file_id)
+
+
+def _is_file_skipped(file_id: str, conn: sqlite3.Connection) -> bool:
+    """
+    Check whether a file was skipped due to conflict resolution.
+
+    Args:
+        file_id: UUID of the file
+        conn: Database connection holding the apply transaction
+
+    Returns:
+        True if the file was skipped
+    """
+    if file_id in _skipped_file_ids:
+        _skipped_file_ids.move_to_end(file_id)
+        return True
+
+    cursor = conn.reusable_cursor
+    cursor.execute("SELECT 1 FROM skipped_files WHERE file_id = ?", (file_id,))
+    if cursor.fetchone():
+        _pending_skipped_file_ids.append(file_id)
+        return True
+
+    return False
+
+
+def _commit_skipped_files() -> None:
+    """
+    Move skipped file IDs seen in the committed transaction into the LRU.
+
+    Evicts the oldest entries when the LRU is full.
+    """
+    for file_id in _pending_skipped_file_ids:
+        _skipped_file_ids[file_id] = None
+        _skipped_file_ids.move_to_end(file_id)
+    _pending_skipped_file_ids.clear()
+
+    while len(_skipped_file_ids) > SKIPPED_FILE_IDS_CACHE_SIZE:
+        _skipped_file_ids.popitem(last=False)
+
+
 async def _check_and_apply_deferred_operations(applied_operation: Operation):
     """
-    Check if any deferred operations can now be applied based on the just-applied operation.
+    Queue deferred operations that can now be applied based on the just-applied operation.
 
     Args:
         applied_operation: Operation that was just successfully applied
     """
-    async with _lock:
+    async with _deferred_lock:
         dependency_key = _get_dependency_key(applied_operation)
 
         if dependency_key not in _operation_dependencies:
@@ -78,24 +337,182 @@ async def _check_and_apply_deferred_operations(applied_operation: Operation):
 
         operations_to_retry = []
         for op_id in waiting_operation_ids:
+            _operation_dependency_keys.pop(op_id, None)
             deferred_op = _deferred_operations.pop(op_id, None)
             if deferred_op:
                 operations_to_retry.append(deferred_op)
 
+    if not operations_to_retry:
+        return
+
+    _ensure_retry_worker()
+
     for operation in operations_to_retry:
         logger.info(
-            f"Retrying deferred operation {operation.operation_id} "
+            f"Queueing deferred operation {operation.operation_id} for retry "
             f"(dependency {dependency_key} now satisfied)"
         )
+        _retry_queue.put_nowait(operation)
+
+
+def _ensure_retry_worker() -> None:
+    """Start the deferred-operation retry worker if it is not running."""
+    global _retry_worker_task
+
+    if _retry_worker_task is None or _retry_worker_task.done():
+        _retry_worker_task = asyncio.create_task(_deferred_retry_worker())
+
+
+async def _deferred_retry_worker():
+    """
+    Drain the retry queue, applying up to OPERATION_APPLY_BATCH_SIZE
+    operations per transaction.
+    """
+    while True:
+        batch = [await _retry_queue.get()]
+        while len(batch) < OPERATION_APPLY_BATCH_SIZE and not _retry_queue.empty():
+            batch.append(_retry_queue.get_nowait())
+
+        logger.info(f"Retrying {len(batch)} deferred operations")
 
         try:
-            await apply_operation(operation)
+            await apply_operations(batch)
         except Exception as e:
-            logger.error(
-                f"Failed to apply deferred operation {operation.operation_id}: {e}",
-                exc_info=True
+            logger.error(f"Failed to apply deferred operation batch: {e}", exc_info=True)
+        finally:
+            for _ in batch:
+                _retry_queue.task_done()
+
+
+async def apply_operations(operations: List[Operation]) -> List[bool]:
+    """
+    Apply a batch of remote operations.
+
+    Operations are applied in the given order, so callers should pass them
+    in causal order. Each run of up to OPERATION_APPLY_BATCH_SIZE operations
+    shares one IMMEDIATE transaction.
+
+    Args:
+        operations: Operations to apply
+
+    Returns:
+        Per-operation results, True if applied and False if skipped
+    """
+    results = []
+
+    for start in range(0, len(operations), OPERATION_APPLY_BATCH_SIZE):
+        batch = operations[start:start + OPERATION_APPLY_BATCH_SIZE]
+
+        batch_results, dependency_errors = await _run_on_writer(
+            _apply_operations_sync, batch
+        )
+
+        for operation, dependency_error in dependency_errors:
+            logger.info(
+                f"Operation {operation.operation_id} deferred: "
+                f"{dependency_error.dependency_description}"
+            )
+            await _defer_operation(operation, dependency_error.required_dependency)
+
+        if any(
+            applied and operation.operation_type in _CHANGES_API_KEYS
+            for operation, applied in zip(batch, batch_results)
+        ):
+            invalidate_api_key_cache()
+
+        for operation, applied in zip(batch, batch_results):
+            if applied:
+                await _check_and_apply_deferred_operations(operation)
+
+        results.extend(batch_results)
+
+    return results
+
+
+def _apply_operations_sync(
+    operations: List[Operation]
+) -> Tuple[List[bool], List[Tuple[Operation, DependencyNotMetError]]]:
+    """
+    Apply several operations in a single IMMEDIATE transaction.
+
+    The applied flags of all operations are loaded with one query, and each
+    operation runs inside its own savepoint so that a failing operation is
+    rolled back without discarding the rest of the batch.
+
+    Args:
+        operations: Operations to apply
+
+    Returns:
+        Tuple of (per-operation results, (operation, error) pairs that must be deferred)
+    """
+    results = []
+    dependency_errors = []
+    handled_ids = set()
+    to_mark_applied = []
+
+    with get_persistent_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+
+        try:
+            applied_flags = get_applied_flags(
+                (operation.operation_id for operation in operations),
+                conn=conn
             )
 
+            for operation in operations:
+                applied_flag = applied_flags.get(operation.operation_id)
+
+                if operation.operation_id in handled_ids or applied_flag == 1:
+                    logger.debug(
+                        f"Operation {operation.operation_id} already applied, skipping"
+                    )
+                    results.append(False)
+                    continue
+
+                handled_ids.add(operation.operation_id)
+
+                if operation.operation_type in _READS_APPLIED_STATE and to_mark_applied:
+                    mark_operations_applied(to_mark_applied, conn=conn)
+                    to_mark_applied = []
+
+                pending_skipped = len(_pending_skipped_file_ids)
+                commit_callbacks = conn.commit_callbacks_mark()
+                conn.execute("SAVEPOINT apply_operation")
+                try:
+                    success, mark_applied = _apply_in_transaction(
+                        operation, applied_flag is not None, conn
+                    )
+                    conn.execute("RELEASE SAVEPOINT apply_operation")
+                    results.append(success)
+                    if mark_applied:
+                        to_mark_applied.append(operation.operation_id)
+                except DependencyNotMetError as e:
+                    _persist_deferred_operation(operation, e.required_dependency, conn)
+                    conn.execute("RELEASE SAVEPOINT apply_operation")
+                    dependency_errors.append((operation, e))
+                    results.append(False)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO SAVEPOINT apply_operation")
+                    conn.execute("RELEASE SAVEPOINT apply_operation")
+                    del _pending_skipped_file_ids[pending_skipped:]
+                    conn.discard_commit_callbacks(commit_callbacks)
+                    logger.error(
+                        f"Failed to apply operation {operation.operation_id}: {e}",
+                        exc_info=True
+                    )
+                    results.append(False)
+
+            mark_operations_applied(to_mark_applied, conn=conn)
+            conn.commit()
+            _commit_skipped_files()
+
+        except Exception:
+            conn.rollback()
+            _pending_skipped_file_ids.clear()
+            raise
+
+    return results, dependency_errors
+
 
 def _get_dependency_key(operation: Operation) -> str:
     """
@@ -107,73 +524,138 @@ def _get_dependency_key(operation: Operation) -> str:
     Returns:
         Dependency key string (e.g., "file:uuid" or "user:uuid"), or empty string
     """
-    if operation.operation_type == "FILE_CREATED":
-        return f"file:{operation.payload['file_id']}"
-    elif operation.operation_type == "USER_CREATED":
-        return f"user:{operation.payload['user_id']}"
+    build_key = _DEP_KEY_BUILDERS.get(operation.operation_type)
+    if build_key is None:
+        return ""
 
-    return ""
+    return build_key(operation.payload)
 
 
 async def apply_operation(operation: Operation) -> bool:
     """
     Apply a remote operation to the local database.
 
+    Storing the operation, applying it, merging its vector clock and
+    marking it applied all happen in one IMMEDIATE transaction that is
+    committed once here.
+
     Args:
         operation: Operation to apply
 
     Returns:
         True if applied, False if skipped (already applied or stale)
     """
-    existing = get_operation_by_id(operation.operation_id)
+    success, dependency_error = await _run_on_writer(_apply_operation_sync, operation)
 
-    if existing and existing.applied == 1:
-        logger.debug(
-            f"Operation {operation.operation_id} already applied, skipping"
+    if dependency_error:
+        logger.info(
+            f"Operation {operation.operation_id} deferred: {dependency_error.dependency_description}"
         )
+        await _defer_operation(operation, dependency_error.required_dependency)
         return False
 
-    if not existing:
-        _store_operation(operation)
-
-    try:
-        if operation.operation_type == "USER_CREATED":
-            success = await _apply_user_created(operation)
-        elif operation.operation_type == "API_KEY_UPDATED":
-            success = await _apply_api_key_updated(operation)
-        elif operation.operation_type == "FILE_CREATED":
-            success = await _apply_file_created(operation)
-        elif operation.operation_type == "FILE_DELETED":
-            success = await _apply_file_deleted(operation)
-        elif operation.operation_type == "TAGS_ADDED":
-            success = await _apply_tags_added(operation)
-        elif operation.operation_type == "TAGS_REMOVED":
-            success = await _apply_tags_removed(operation)
-        elif operation.operation_type == "CHUNKS_CREATED":
-            success = await _apply_chunks_created(operation)
-        else:
-            logger.warning(f"Unknown operation type: {operation.operation_type}")
-            return False
+    if success:
+        if operation.operation_type in _CHANGES_API_KEYS:
+            invalidate_api_key_cache()
+        await _check_and_apply_deferred_operations(operation)
 
-        if success:
-            await _check_and_apply_deferred_operations(operation)
+    return success
 
-        return success
 
-    except DependencyNotMetError as e:
-        logger.info(
-            f"Operation {operation.operation_id} deferred: {e.dependency_description}"
+def _apply_operation_sync(
+    operation: Operation
+) -> Tuple[bool, Optional[DependencyNotMetError]]:
+    """
+    Apply an operation in its own IMMEDIATE transaction on the writer thread.
+
+    Args:
+        operation: Operation to apply
+
+    Returns:
+        Tuple of (applied, dependency error if the operation must be deferred)
+    """
+    with get_persistent_db_connection() as conn:
+        applied_flag = get_operation_applied_flag(operation.operation_id, conn=conn)
+
+        if applied_flag == 1:
+            logger.debug(
+                f"Operation {operation.operation_id} already applied, skipping"
+            )
+            return False, None
+
+        conn.execute("BEGIN IMMEDIATE")
+
+        try:
+            success, mark_applied = _apply_in_transaction(
+                operation, applied_flag is not None, conn
+            )
+            if mark_applied:
+                mark_operation_applied(operation.operation_id, conn=conn)
+            conn.commit()
+            _commit_skipped_files()
+
+        except DependencyNotMetError as e:
+            _persist_deferred_operation(operation, e.required_dependency, conn)
+            conn.commit()
+            _commit_skipped_files()
+            return False, e
+
+        except Exception:
+            conn.rollback()
+            _pending_skipped_file_ids.clear()
+            raise
+
+    return success, None
+
+
+def _apply_in_transaction(
+    operation: Operation,
+    stored: bool,
+    conn: sqlite3.Connection
+) -> Tuple[bool, bool]:
+    """
+    Store and apply an operation inside the caller's open transaction.
+
+    The operation is not marked applied here; the caller does that, batched
+    where possible, within the same transaction.
+
+    Args:
+        operation: Operation to apply
+        stored: Whether the operation is already in the local log
+        conn: Database connection holding the apply transaction
+
+    Returns:
+        Tuple of (applied, whether the operation must be marked applied)
+
+    Raises:
+        DependencyNotMetError: If the operation must be deferred
+    """
+    if not stored:
+        _store_operation(operation, conn=conn)
+
+    handler = _APPLIERS.get(operation.operation_type)
+    if handler is None:
+        logger.warning(f"Unknown operation type: {operation.operation_type}")
+        return False, False
+
+    success = handler(operation, conn)
+
+    if stored:
+        conn.reusable_cursor.execute(
+            _DELETE_DEFERRED_OPERATION_SQL,
+            (operation.operation_id,)
         )
-        await _defer_operation(operation, e.required_dependency)
-        return False
+
+    return success, True
 
 
-def _store_operation(operation: Operation) -> None:
+def _store_operation(operation: Operation, conn: Optional[sqlite3.Connection] = None) -> None:
     """
     Store operation in local operation log.
 
     Args:
         operation: Operation to store
+        conn: Optional database connection
     """
     from controller.replication.operation_log import insert_operation
 
@@ -184,18 +666,20 @@ def _store_operation(operation: Operation) -> None:
         timestamp_ms=operation.timestamp_ms,
         vector_clock=operation.vector_clock,
         payload=operation.payload,
-        applied=0
+        applied=0,
+        conn=conn
     )
 
     logger.debug(f"Stored operation {operation.operation_id} in local log")
 
 
-async def _apply_user_created(operation: Operation) -> bool:
+def _apply_user_created(operation: Operation, conn: sqlite3.Connection) -> bool:
     """
     Apply USER_CREATED operation with conflict resolution.
 
     Args:
         operation: USER_CREATED operation
+        conn: Database connection holding the apply transaction
 
     Returns:
         True if applied, False if skipped
@@ -203,103 +687,90 @@ async def _apply_user_created(operation: Operation) -> bool:
     payload = operation.payload
     username = payload["username"]
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT user_id FROM users WHERE username = ?",
-            (username,)
-        )
-        existing_user = cursor.fetchone()
+    cursor = conn.reusable_cursor
 
-        if existing_user:
-            existing_user_id = existing_user[0]
-
-            user_operations = get_operations_for_user(existing_user_id)
-            user_created_ops = [
-                op for op in user_operations
-                if op.operation_type == "USER_CREATED"
-            ]
-
-            all_operations = get_operations_for_user(operation.user_id)
-            current_created_ops = [
-                op for op in all_operations
-                if op.operation_type == "USER_CREATED"
-            ]
+    cursor.execute(
+        "SELECT user_id FROM users WHERE username = ?",
+        (username,)
+    )
+    existing_user = cursor.fetchone()
 
-            all_user_created_ops = user_created_ops + current_created_ops
+    if existing_user:
+        existing_user_id = existing_user[0]
 
-            if len(all_user_created_ops) > 1:
-                winner = _resolve_concurrent_user_creation(all_user_created_ops)
+        all_user_created_ops = get_user_created_ops_for_users(
+            (existing_user_id, operation.user_id),
+            conn=conn
+        )
 
-                if winner.operation_id != operation.operation_id:
-                    logger.info(
-                        f"Concurrent user creation conflict for username '{username}': "
-                        f"operation {operation.operation_id} lost to {winner.operation_id}, skipping"
-                    )
-                    mark_operation_applied(operation.operation_id, conn=conn)
-                    conn.commit()
-                    return False
+        if len(all_user_created_ops) > 1:
+            winner = _resolve_concurrent_user_creation(all_user_created_ops)
 
-                logger.warning(
+            if winner.operation_id != operation.operation_id:
+                logger.info(
                     f"Concurrent user creation conflict for username '{username}': "
-                    f"operation {operation.operation_id} won, updating user"
+                    f"operation {operation.operation_id} lost to {winner.operation_id}, skipping"
                 )
-
-                cursor.execute(
-                    """
-                    UPDATE users
-                    SET user_id = ?, password_hash = ?, api_key = ?, created_at = ?, key_updated_at = ?
-                    WHERE username = ?
-                    """,
-                    (
-                        payload["user_id"],
-                        payload["password_hash"],
-                        payload["api_key"],
-                        payload["created_at"],
-                        payload["created_at"],
-                        username
-                    )
-                )
-            else:
-                logger.debug(f"User '{username}' already exists, skipping USER_CREATED")
-                mark_operation_applied(operation.operation_id, conn=conn)
-                conn.commit()
                 return False
-        else:
+
+            logger.warning(
+                f"Concurrent user creation conflict for username '{username}': "
+                f"operation {operation.operation_id} won, updating user"
+            )
+
             cursor.execute(
                 """
-                INSERT INTO users (user_id, username, password_hash, api_key, created_at, key_updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
+                UPDATE users
+                SET user_id = ?, password_hash = ?, api_key = ?, api_key_hash = ?, created_at = ?, key_updated_at = ?
+                WHERE username = ?
                 """,
                 (
                     payload["user_id"],
-                    payload["username"],
                     payload["password_hash"],
                     payload["api_key"],
+                    api_key_hash(payload["api_key"]),
+                    payload["created_at"],
                     payload["created_at"],
-                    payload["created_at"]
+                    username
                 )
             )
-
-            logger.info(
-                f"Applied USER_CREATED operation [operation_id={operation.operation_id}, "
-                f"user_id={payload['user_id']}, username={username}]"
+        else:
+            logger.debug(f"User '{username}' already exists, skipping USER_CREATED")
+            return False
+    else:
+        cursor.execute(
+            """
+            INSERT INTO users (user_id, username, password_hash, api_key, api_key_hash, created_at, key_updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                payload["user_id"],
+                payload["username"],
+                payload["password_hash"],
+                payload["api_key"],
+                api_key_hash(payload["api_key"]),
+                payload["created_at"],
+                payload["created_at"]
             )
+        )
 
-        _merge_vector_clock(operation.vector_clock, conn=conn)
-        mark_operation_applied(operation.operation_id, conn=conn)
-        conn.commit()
+        logger.info(
+            f"Applied USER_CREATED operation [operation_id={operation.operation_id}, "
+            f"user_id={payload['user_id']}, username={username}]"
+        )
+
+    _merge_vector_clock(operation.vector_clock, conn=conn)
 
     return True
 
 
-async def _apply_api_key_updated(operation: Operation) -> bool:
+def _apply_api_key_updated(operation: Operation, conn: sqlite3.Connection) -> bool:
     """
     Apply API_KEY_UPDATED operation with LWW + causality.
 
     Args:
         operation: API_KEY_UPDATED operation
+        conn: Database connection holding the apply transaction
 
     Returns:
         True if applied, False if skipped
@@ -307,128 +778,117 @@ async def _apply_api_key_updated(operation: Operation) -> bool:
     payload = operation.payload
     user_id = payload["user_id"]
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    cursor = conn.reusable_cursor
 
-        cursor.execute(
-            "SELECT api_key, key_updated_at FROM users WHERE user_id = ?",
-            (user_id,)
+    cursor.execute(
+        "SELECT api_key, key_updated_at FROM users WHERE user_id = ?",
+        (user_id,)
+    )
+    user_row = cursor.fetchone()
+
+    if not user_row:
+        logger.info(
+            f"User {user_id} not found for API_KEY_UPDATED operation, deferring"
         )
-        user_row = cursor.fetchone()
 
-        if not user_row:
-            logger.info(
-                f"User {user_id} not found for API_KEY_UPDATED operation, deferring"
-            )
+        raise DependencyNotMetError(
+            dependency_description=f"User {user_id} must exist before API key can be updated",
+            required_dependency=f"user:{user_id}"
+        )
 
-            raise DependencyNotMetError(
-                dependency_description=f"User {user_id} must exist before API key can be updated",
-                required_dependency=f"user:{user_id}"
-            )
+    current_api_key = user_row[0]
+    current_key_updated_at = user_row[1]
 
-        current_api_key = user_row[0]
-        current_key_updated_at = user_row[1]
+    latest_applied_op = get_latest_applied_api_key_op(user_id, conn=conn)
 
-        user_operations = get_operations_for_user(user_id)
-        api_key_ops = [
-            op for op in user_operations
-            if op.operation_type == "API_KEY_UPDATED" and op.applied == 1
-        ]
+    if latest_applied_op:
+        incoming_clock = VectorClock(clocks=operation.vector_clock)
+        current_clock = VectorClock(clocks=latest_applied_op.vector_clock)
 
-        if api_key_ops:
-            latest_applied_op = max(api_key_ops, key=lambda op: op.timestamp_ms)
+        relation = incoming_clock.compare(current_clock)
 
-            incoming_clock = VectorClock(clocks=operation.vector_clock)
-            current_clock = VectorClock(clocks=latest_applied_op.vector_clock)
+        if relation == BEFORE:
+            logger.debug(
+                f"API_KEY_UPDATED operation {operation.operation_id} is stale "
+                f"(causally earlier), skipping"
+            )
+            return False
 
-            if incoming_clock.happens_before(current_clock):
-                logger.debug(
-                    f"API_KEY_UPDATED operation {operation.operation_id} is stale "
-                    f"(causally earlier), skipping"
-                )
-                mark_operation_applied(operation.operation_id, conn=conn)
-                conn.commit()
-                return False
+        if relation == AFTER:
+            logger.debug(
+                f"API_KEY_UPDATED operation {operation.operation_id} is causal successor, applying"
+            )
+            should_apply = True
+        else:
+            incoming_timestamp_ms = operation.timestamp_ms
+            current_timestamp_ms = latest_applied_op.timestamp_ms
 
-            if current_clock.happens_before(incoming_clock):
-                logger.debug(
-                    f"API_KEY_UPDATED operation {operation.operation_id} is causal successor, applying"
+            if incoming_timestamp_ms > current_timestamp_ms:
+                logger.info(
+                    f"Concurrent API_KEY_UPDATED: operation {operation.operation_id} "
+                    f"wins (LWW: {incoming_timestamp_ms} > {current_timestamp_ms})"
                 )
                 should_apply = True
+            elif incoming_timestamp_ms < current_timestamp_ms:
+                logger.debug(
+                    f"Concurrent API_KEY_UPDATED: operation {operation.operation_id} "
+                    f"loses (LWW: {incoming_timestamp_ms} < {current_timestamp_ms}), skipping"
+                )
+                return False
             else:
-                incoming_timestamp_ms = operation.timestamp_ms
-                current_timestamp_ms = latest_applied_op.timestamp_ms
-
-                if incoming_timestamp_ms > current_timestamp_ms:
+                if operation.operation_id < latest_applied_op.operation_id:
                     logger.info(
-                        f"Concurrent API_KEY_UPDATED: operation {operation.operation_id} "
-                        f"wins (LWW: {incoming_timestamp_ms} > {current_timestamp_ms})"
+                        f"Concurrent API_KEY_UPDATED with same timestamp: "
+                        f"operation {operation.operation_id} wins (UUID tiebreaker)"
                     )
                     should_apply = True
-                elif incoming_timestamp_ms < current_timestamp_ms:
+                else:
                     logger.debug(
-                        f"Concurrent API_KEY_UPDATED: operation {operation.operation_id} "
-                        f"loses (LWW: {incoming_timestamp_ms} < {current_timestamp_ms}), skipping"
+                        f"Concurrent API_KEY_UPDATED with same timestamp: "
+                        f"operation {operation.operation_id} loses (UUID tiebreaker), skipping"
                     )
-                    mark_operation_applied(operation.operation_id, conn=conn)
-                    conn.commit()
                     return False
-                else:
-                    if operation.operation_id < latest_applied_op.operation_id:
-                        logger.info(
-                            f"Concurrent API_KEY_UPDATED with same timestamp: "
-                            f"operation {operation.operation_id} wins (UUID tiebreaker)"
-                        )
-                        should_apply = True
-                    else:
-                        logger.debug(
-                            f"Concurrent API_KEY_UPDATED with same timestamp: "
-                            f"operation {operation.operation_id} loses (UUID tiebreaker), skipping"
-                        )
-                        mark_operation_applied(operation.operation_id, conn=conn)
-                        conn.commit()
-                        return False
-
-            if should_apply:
-                cursor.execute(
-                    """
-                    UPDATE users
-                    SET api_key = ?, key_updated_at = ?
-                    WHERE user_id = ?
-                    """,
-                    (
-                        payload["new_api_key"],
-                        payload["key_updated_at"],
-                        user_id
-                    )
-                )
 
-                logger.info(
-                    f"Applied API_KEY_UPDATED operation [operation_id={operation.operation_id}, "
-                    f"user_id={user_id}]"
-                )
-        else:
+        if should_apply:
             cursor.execute(
                 """
                 UPDATE users
-                SET api_key = ?, key_updated_at = ?
+                SET api_key = ?, api_key_hash = ?, key_updated_at = ?
                 WHERE user_id = ?
                 """,
                 (
                     payload["new_api_key"],
+                    api_key_hash(payload["new_api_key"]),
                     payload["key_updated_at"],
                     user_id
                 )
             )
 
             logger.info(
-                f"Applied API_KEY_UPDATED operation (first for user) "
-                f"[operation_id={operation.operation_id}, user_id={user_id}]"
+                f"Applied API_KEY_UPDATED operation [operation_id={operation.operation_id}, "
+                f"user_id={user_id}]"
             )
+    else:
+        cursor.execute(
+            """
+            UPDATE users
+            SET api_key = ?, api_key_hash = ?, key_updated_at = ?
+            WHERE user_id = ?
+            """,
+            (
+                payload["new_api_key"],
+                api_key_hash(payload["new_api_key"]),
+                payload["key_updated_at"],
+                user_id
+            )
+        )
 
-        _merge_vector_clock(operation.vector_clock, conn=conn)
-        mark_operation_applied(operation.operation_id, conn=conn)
-        conn.commit()
+        logger.info(
+            f"Applied API_KEY_UPDATED operation (first for user) "
+            f"[operation_id={operation.operation_id}, user_id={user_id}]"
+        )
+
+    _merge_vector_clock(operation.vector_clock, conn=conn)
 
     return True
 
@@ -443,24 +903,25 @@ def _resolve_concurrent_user_creation(operations: List[Operation]) -> Operation:
     Returns:
         Winning operation
     """
-    sorted_ops = sorted(operations, key=lambda op: (op.timestamp_ms, op.user_id))
-    winner = sorted_ops[0]
+    candidates = {op.operation_id: op for op in operations}.values()
+    winner = min(candidates, key=lambda op: (op.timestamp_ms, op.user_id))
 
     logger.warning(
         f"Concurrent user creation conflict: "
-        f"selected operation {winner.operation_id} from {len(operations)} candidates "
+        f"selected operation {winner.operation_id} from {len(candidates)} candidates "
         f"(timestamp={winner.timestamp_ms}, user_id={winner.user_id})"
     )
 
     return winner
 
 
-async def _apply_file_created(operation: Operation) -> bool:
+def _apply_file_created(operation: Operation, conn: sqlite3.Connection) -> bool:
     """
     Apply FILE_CREATED operation with conflict resolution.
 
     Args:
         operation: FILE_CREATED operation
+        conn: Database connection holding the apply transaction
 
     Returns:
         True if applied, False if skipped
@@ -470,145 +931,152 @@ async def _apply_file_created(operation: Operation) -> bool:
     name = payload["name"]
     owner_id = payload["owner_id"]
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    cursor = conn.reusable_cursor
 
-        cursor.execute(
-            "SELECT file_id, name FROM files WHERE owner_id = ? AND name = ?",
-            (owner_id, name)
+    cursor.execute(
+        """
+        DELETE FROM file_tombstones
+        WHERE owner_id = ? AND name = ? AND deleted_at <= ?
+        RETURNING file_id
+        """,
+        (owner_id, name, payload["created_at"])
+    )
+    if cursor.fetchall():
+        logger.info(f"Removed tombstone for ({owner_id}, {name}), creating file")
+
+    cursor.execute(
+        """
+        INSERT INTO files (file_id, name, size, owner_id, created_at)
+        SELECT ?, ?, ?, ?, ?
+        WHERE NOT EXISTS (
+            SELECT 1 FROM file_tombstones WHERE owner_id = ? AND name = ?
         )
-        existing_file = cursor.fetchone()
+        ON CONFLICT(owner_id, name) DO NOTHING
+        RETURNING file_id
+        """,
+        (
+            payload["file_id"],
+            payload["name"],
+            payload["size"],
+            payload["owner_id"],
+            payload["created_at"],
+            owner_id,
+            name
+        )
+    )
+    inserted = cursor.fetchone()
 
-        cursor.execute(
-            "SELECT file_id, deleted_at FROM file_tombstones WHERE owner_id = ? AND name = ?",
-            (owner_id, name)
+    if inserted:
+        cursor.executemany(
+            _INSERT_TAG_SQL,
+            [(payload["file_id"], tag) for tag in payload["tags"]]
         )
-        tombstone = cursor.fetchone()
 
-        if tombstone:
-            tombstone_deleted_at = tombstone[1]
-            if tombstone_deleted_at > payload["created_at"]:
-                logger.info(
-                    f"FILE_CREATED operation {operation.operation_id} loses to tombstone "
-                    f"(deleted_at={tombstone_deleted_at} > created_at={payload['created_at']}), skipping"
-                )
-                mark_operation_applied(operation.operation_id, conn=conn)
-                conn.commit()
-                return False
+        logger.info(
+            f"Applied FILE_CREATED operation [operation_id={operation.operation_id}, "
+            f"file_id={payload['file_id']}, name={name}]"
+        )
 
-            cursor.execute(
-                "DELETE FROM file_tombstones WHERE owner_id = ? AND name = ?",
-                (owner_id, name)
-            )
-            logger.info(f"Removed tombstone for ({owner_id}, {name}), creating file")
+        _merge_vector_clock(operation.vector_clock, conn=conn)
 
-        if existing_file:
-            existing_file_id = existing_file[0]
+        return True
 
-            from controller.replication.operation_log import get_operations_by_ids
+    cursor.execute(
+        "SELECT deleted_at FROM file_tombstones WHERE owner_id = ? AND name = ?",
+        (owner_id, name)
+    )
+    tombstone = cursor.fetchone()
 
-            cursor.execute(
-                "SELECT operation_id FROM operations WHERE operation_type = 'FILE_CREATED' "
-                "AND user_id = ? AND payload LIKE ?",
-                (owner_id, f'%"name": "{name}"%')
-            )
-            file_created_ops_rows = cursor.fetchall()
+    if tombstone:
+        tombstone_deleted_at = tombstone[0]
+        logger.info(
+            f"FILE_CREATED operation {operation.operation_id} loses to tombstone "
+            f"(deleted_at={tombstone_deleted_at} > created_at={payload['created_at']}), skipping"
+        )
+        return False
 
-            if file_created_ops_rows:
-                file_created_op_ids = [row[0] for row in file_created_ops_rows]
-                file_created_ops = get_operations_by_ids(file_created_op_ids)
+    cursor.execute(
+        "SELECT file_id FROM files WHERE owner_id = ? AND name = ?",
+        (owner_id, name)
+    )
+    existing_file_id = cursor.fetchone()[0]
 
-                all_file_created_ops = [op for op in file_created_ops if op.payload.get("name") == name]
-                all_file_created_ops.append(operation)
+    cursor.execute(
+        "SELECT operation_id FROM operations WHERE operation_type = 'FILE_CREATED' "
+        "AND target_owner_id = ? AND target_name = ?",
+        (owner_id, name)
+    )
+    file_created_ops_rows = cursor.fetchall()
 
-                winner = _resolve_concurrent_file_creation(all_file_created_ops)
+    if not file_created_ops_rows:
+        logger.debug(f"File '{name}' already exists for owner {owner_id}, skipping FILE_CREATED")
+        return False
 
-                if winner.operation_id != operation.operation_id:
-                    logger.info(
-                        f"Concurrent file creation conflict for ({owner_id}, {name}): "
-                        f"operation {operation.operation_id} lost to {winner.operation_id}, skipping"
-                    )
-                    mark_operation_applied(operation.operation_id, conn=conn)
-                    conn.commit()
+    candidate_ids = frozenset(row[0] for row in file_created_ops_rows) | {operation.operation_id}
+    winner_id = _file_creation_winners.get(candidate_ids)
 
-                    async with _lock:
-                        _skipped_file_ids.add(payload["file_id"])
-                        logger.info(
-                            f"Registered file_id {payload['file_id']} as skipped due to conflict resolution"
-                        )
+    if winner_id is None:
+        all_file_created_ops = get_operations_by_ids(list(candidate_ids), conn=conn)
+        all_file_created_ops.append(operation)
 
-                    return False
+        winner_id = _resolve_concurrent_file_creation(all_file_created_ops).operation_id
+        _file_creation_winners[candidate_ids] = winner_id
+        if len(_file_creation_winners) > CONFLICT_RESOLUTION_CACHE_SIZE:
+            _file_creation_winners.popitem(last=False)
+    else:
+        _file_creation_winners.move_to_end(candidate_ids)
 
-                logger.warning(
-                    f"Concurrent file creation conflict for ({owner_id}, {name}): "
-                    f"operation {operation.operation_id} won, updating file"
-                )
+    if winner_id != operation.operation_id:
+        logger.info(
+            f"Concurrent file creation conflict for ({owner_id}, {name}): "
+            f"operation {operation.operation_id} lost to {winner_id}, skipping"
+        )
 
-                cursor.execute(
-                    """
-                    UPDATE files
-                    SET file_id = ?, size = ?, created_at = ?
-                    WHERE owner_id = ? AND name = ?
-                    """,
-                    (
-                        payload["file_id"],
-                        payload["size"],
-                        payload["created_at"],
-                        owner_id,
-                        name
-                    )
-                )
+        _mark_file_skipped(payload["file_id"], conn)
+        logger.info(
+            f"Registered file_id {payload['file_id']} as skipped due to conflict resolution"
+        )
 
-                cursor.execute("DELETE FROM tags WHERE file_id = ?", (existing_file_id,))
-                for tag in payload["tags"]:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO tags (file_id, tag) VALUES (?, ?)",
-                        (payload["file_id"], tag)
-                    )
-            else:
-                logger.debug(f"File '{name}' already exists for owner {owner_id}, skipping FILE_CREATED")
-                mark_operation_applied(operation.operation_id, conn=conn)
-                conn.commit()
-                return False
-        else:
-            cursor.execute(
-                """
-                INSERT INTO files (file_id, name, size, owner_id, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    payload["file_id"],
-                    payload["name"],
-                    payload["size"],
-                    payload["owner_id"],
-                    payload["created_at"]
-                )
-            )
+        return False
 
-            for tag in payload["tags"]:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO tags (file_id, tag) VALUES (?, ?)",
-                    (payload["file_id"], tag)
-                )
+    logger.warning(
+        f"Concurrent file creation conflict for ({owner_id}, {name}): "
+        f"operation {operation.operation_id} won, updating file"
+    )
 
-            logger.info(
-                f"Applied FILE_CREATED operation [operation_id={operation.operation_id}, "
-                f"file_id={payload['file_id']}, name={name}]"
-            )
+    cursor.execute(
+        """
+        UPDATE files
+        SET file_id = ?, size = ?, created_at = ?
+        WHERE owner_id = ? AND name = ?
+        """,
+        (
+            payload["file_id"],
+            payload["size"],
+            payload["created_at"],
+            owner_id,
+            name
+        )
+    )
 
-        _merge_vector_clock(operation.vector_clock, conn=conn)
-        mark_operation_applied(operation.operation_id, conn=conn)
-        conn.commit()
+    cursor.execute("DELETE FROM tags WHERE file_id = ?", (existing_file_id,))
+    cursor.executemany(
+        _INSERT_TAG_SQL,
+        [(payload["file_id"], tag) for tag in payload["tags"]]
+    )
+
+    _merge_vector_clock(operation.vector_clock, conn=conn)
 
     return True
 
 
-async def _apply_file_deleted(operation: Operation) -> bool:
+def _apply_file_deleted(operation: Operation, conn: sqlite3.Connection) -> bool:
     """
     Apply FILE_DELETED operation with tombstone creation.
 
     Args:
         operation: FILE_DELETED operation
+        conn: Database connection holding the apply transaction
 
     Returns:
         True if applied, False if skipped
@@ -619,67 +1087,77 @@ async def _apply_file_deleted(operation: Operation) -> bool:
     name = payload["name"]
     deleted_at = payload["deleted_at"]
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    cursor = conn.reusable_cursor
 
-        cursor.execute(
-            "SELECT file_id, created_at FROM files WHERE owner_id = ? AND name = ?",
-            (owner_id, name)
+    cursor.execute(
+        """
+        DELETE FROM files
+        WHERE file_id = ? AND NOT EXISTS (
+            SELECT 1 FROM files WHERE owner_id = ? AND name = ? AND created_at > ?
         )
-        existing_file = cursor.fetchone()
-
-        if existing_file:
-            existing_created_at = existing_file[1]
-
-            if deleted_at < existing_created_at:
-                logger.info(
-                    f"FILE_DELETED operation {operation.operation_id} loses to newer file "
-                    f"(deleted_at={deleted_at} < created_at={existing_created_at}), skipping"
-                )
-                mark_operation_applied(operation.operation_id, conn=conn)
-                conn.commit()
-                return False
+        RETURNING file_id
+        """,
+        (file_id, owner_id, name, deleted_at)
+    )
+    deleted_file = cursor.fetchone()
 
-            cursor.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+    if deleted_file:
+        logger.info(
+            f"Applied FILE_DELETED operation [operation_id={operation.operation_id}, "
+            f"file_id={file_id}, name={name}]"
+        )
+    else:
+        cursor.execute(
+            "SELECT created_at FROM files WHERE owner_id = ? AND name = ? AND created_at > ?",
+            (owner_id, name, deleted_at)
+        )
+        newer_file = cursor.fetchone()
 
+        if newer_file:
             logger.info(
-                f"Applied FILE_DELETED operation [operation_id={operation.operation_id}, "
-                f"file_id={file_id}, name={name}]"
-            )
-        else:
-            logger.debug(
-                f"File {file_id} not found for FILE_DELETED, may have been already deleted"
+                f"FILE_DELETED operation {operation.operation_id} loses to newer file "
+                f"(deleted_at={deleted_at} < created_at={newer_file[0]}), skipping"
             )
+            return False
 
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO file_tombstones
-            (file_id, owner_id, name, deleted_at, deleted_by_controller_id, operation_id)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                file_id,
-                owner_id,
-                name,
-                deleted_at,
-                payload["deleted_by_controller_id"],
-                operation.operation_id
-            )
+        logger.debug(
+            f"File {file_id} not found for FILE_DELETED, may have been already deleted"
         )
 
-        _merge_vector_clock(operation.vector_clock, conn=conn)
-        mark_operation_applied(operation.operation_id, conn=conn)
-        conn.commit()
+    cursor.execute(
+        """
+        INSERT INTO file_tombstones
+        (file_id, owner_id, name, deleted_at, deleted_by_controller_id, operation_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(file_id) DO UPDATE SET
+            owner_id = excluded.owner_id,
+            name = excluded.name,
+            deleted_at = excluded.deleted_at,
+            deleted_by_controller_id = excluded.deleted_by_controller_id,
+            operation_id = excluded.operation_id
+        """,
+        (
+            file_id,
+            owner_id,
+            name,
+            deleted_at,
+            payload["deleted_by_controller_id"],
+            operation.operation_id
+        )
+    )
+
+    _merge_vector_clock(operation.vector_clock, conn=conn)
 
     return True
 
 
-async def _apply_tags_added(operation: Operation) -> bool:
+def _apply_tags_added(operation: Operation, conn: sqlite3.Connection) -> bool:
     """
     Apply TAGS_ADDED operation with set-convergent semantics.
 
     Args:
         operation: TAGS_ADDED operation
+        conn: Database connection holding the apply transaction
 
     Returns:
         True if applied, False if skipped
@@ -688,44 +1166,41 @@ async def _apply_tags_added(operation: Operation) -> bool:
     file_id = payload["file_id"]
     tags = payload["tags"]
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    cursor = conn.reusable_cursor
 
-        cursor.execute("SELECT file_id FROM files WHERE file_id = ?", (file_id,))
-        if not cursor.fetchone():
-            logger.info(
-                f"File {file_id} not found for TAGS_ADDED operation, deferring"
-            )
+    cursor.execute("SELECT file_id FROM files WHERE file_id = ?", (file_id,))
+    if not cursor.fetchone():
+        logger.info(
+            f"File {file_id} not found for TAGS_ADDED operation, deferring"
+        )
 
-            raise DependencyNotMetError(
-                dependency_description=f"File {file_id} must exist before tags can be added",
-                required_dependency=f"file:{file_id}"
-            )
+        raise DependencyNotMetError(
+            dependency_description=f"File {file_id} must exist before tags can be added",
+            required_dependency=f"file:{file_id}"
+        )
 
-        for tag in tags:
-            cursor.execute(
-                "INSERT OR IGNORE INTO tags (file_id, tag) VALUES (?, ?)",
-                (file_id, tag)
-            )
+    cursor.executemany(
+        _INSERT_TAG_SQL,
+        [(file_id, tag) for tag in tags]
+    )
 
-        logger.info(
-            f"Applied TAGS_ADDED operation [operation_id={operation.operation_id}, "
-            f"file_id={file_id}, tags={tags}]"
-        )
+    logger.info(
+        f"Applied TAGS_ADDED operation [operation_id={operation.operation_id}, "
+        f"file_id={file_id}, tags={tags}]"
+    )
 
-        _merge_vector_clock(operation.vector_clock, conn=conn)
-        mark_operation_applied(operation.operation_id, conn=conn)
-        conn.commit()
+    _merge_vector_clock(operation.vector_clock, conn=conn)
 
     return True
 
 
-async def _apply_tags_removed(operation: Operation) -> bool:
+def _apply_tags_removed(operation: Operation, conn: sqlite3.Connection) -> bool:
     """
     Apply TAGS_REMOVED operation with would_become_tagless validation.
 
     Args:
         operation: TAGS_REMOVED operation
+        conn: Database connection holding the apply transaction
 
     Returns:
         True if applied, False if skipped
@@ -734,60 +1209,54 @@ async def _apply_tags_removed(operation: Operation) -> bool:
     file_id = payload["file_id"]
     tags = payload["tags"]
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    cursor = conn.reusable_cursor
 
-        cursor.execute("SELECT file_id FROM files WHERE file_id = ?", (file_id,))
-        if not cursor.fetchone():
-            logger.info(
-                f"File {file_id} not found for TAGS_REMOVED operation, deferring"
-            )
-
-            raise DependencyNotMetError(
-                dependency_description=f"File {file_id} must exist before tags can be removed",
-                required_dependency=f"file:{file_id}"
-            )
+    cursor.execute("SELECT file_id FROM files WHERE file_id = ?", (file_id,))
+    if not cursor.fetchone():
+        logger.info(
+            f"File {file_id} not found for TAGS_REMOVED operation, deferring"
+        )
 
-        cursor.execute(
-            "SELECT tag FROM tags WHERE file_id = ?",
-            (file_id,)
+        raise DependencyNotMetError(
+            dependency_description=f"File {file_id} must exist before tags can be removed",
+            required_dependency=f"file:{file_id}"
         )
-        current_tags = set(row[0] for row in cursor.fetchall())
 
-        remaining_tags = current_tags - set(tags)
+    placeholders = ','.join('?' * len(tags))
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM tags WHERE file_id = ? AND tag NOT IN ({placeholders}))",
+        (file_id, *tags)
+    )
+    has_remaining_tags = cursor.fetchone()[0]
 
-        if not remaining_tags:
-            logger.warning(
-                f"TAGS_REMOVED operation {operation.operation_id} would leave file {file_id} tagless, skipping"
-            )
-            mark_operation_applied(operation.operation_id, conn=conn)
-            conn.commit()
-            return False
+    if not has_remaining_tags:
+        logger.warning(
+            f"TAGS_REMOVED operation {operation.operation_id} would leave file {file_id} tagless, skipping"
+        )
+        return False
 
-        for tag in tags:
-            cursor.execute(
-                "DELETE FROM tags WHERE file_id = ? AND tag = ?",
-                (file_id, tag)
-            )
+    cursor.executemany(
+        "DELETE FROM tags WHERE file_id = ? AND tag = ?",
+        [(file_id, tag) for tag in tags]
+    )
 
-        logger.info(
-            f"Applied TAGS_REMOVED operation [operation_id={operation.operation_id}, "
-            f"file_id={file_id}, tags={tags}]"
-        )
+    logger.info(
+        f"Applied TAGS_REMOVED operation [operation_id={operation.operation_id}, "
+        f"file_id={file_id}, tags={tags}]"
+    )
 
-        _merge_vector_clock(operation.vector_clock, conn=conn)
-        mark_operation_applied(operation.operation_id, conn=conn)
-        conn.commit()
+    _merge_vector_clock(operation.vector_clock, conn=conn)
 
     return True
 
 
-async def _apply_chunks_created(operation: Operation) -> bool:
+def _apply_chunks_created(operation: Operation, conn: sqlite3.Connection) -> bool:
     """
     Apply CHUNKS_CREATED operation with checksum verification.
 
     Args:
         operation: CHUNKS_CREATED operation
+        conn: Database connection holding the apply transaction
 
     Returns:
         True if applied, False if skipped
@@ -796,77 +1265,81 @@ async def _apply_chunks_created(operation: Operation) -> bool:
     file_id = payload["file_id"]
     chunks = payload["chunks"]
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT file_id FROM files WHERE file_id = ?", (file_id,))
-        if not cursor.fetchone():
-            async with _lock:
-                is_skipped = file_id in _skipped_file_ids
-
-            if is_skipped:
-                logger.info(
-                    f"File {file_id} was skipped due to conflict resolution, "
-                    f"skipping dependent CHUNKS_CREATED operation {operation.operation_id}"
-                )
-                mark_operation_applied(operation.operation_id, conn=conn)
-                conn.commit()
-                return False
+    cursor = conn.reusable_cursor
 
+    cursor.execute("SELECT file_id FROM files WHERE file_id = ?", (file_id,))
+    if not cursor.fetchone():
+        if _is_file_skipped(file_id, conn):
             logger.info(
-                f"File {file_id} not found for CHUNKS_CREATED operation, deferring"
+                f"File {file_id} was skipped due to conflict resolution, "
+                f"skipping dependent CHUNKS_CREATED operation {operation.operation_id}"
             )
+            return False
 
-            raise DependencyNotMetError(
-                dependency_description=f"File {file_id} must exist before chunks can be created",
-                required_dependency=f"file:{file_id}"
-            )
+        logger.info(
+            f"File {file_id} not found for CHUNKS_CREATED operation, deferring"
+        )
 
-        for chunk in chunks:
-            chunk_id = chunk["chunk_id"]
-            chunk_index = chunk["chunk_index"]
-            size = chunk["size"]
-            checksum = chunk["checksum"]
+        raise DependencyNotMetError(
+            dependency_description=f"File {file_id} must exist before chunks can be created",
+            required_dependency=f"file:{file_id}"
+        )
 
-            cursor.execute(
-                "SELECT checksum FROM chunks WHERE file_id = ? AND chunk_index = ?",
-                (file_id, chunk_index)
-            )
-            existing = cursor.fetchone()
+    cursor.execute(
+        "SELECT chunk_index, checksum FROM chunks WHERE file_id = ?",
+        (file_id,)
+    )
+    existing_checksums = {row[0]: row[1] for row in cursor.fetchall()}
 
-            if existing:
-                existing_checksum = existing[0]
-                if existing_checksum != checksum:
-                    logger.error(
-                        f"Chunk checksum mismatch for file {file_id} chunk {chunk_index}: "
-                        f"existing={existing_checksum}, incoming={checksum}"
-                    )
-                    mark_operation_applied(operation.operation_id, conn=conn)
-                    conn.commit()
-                    return False
+    new_chunk_rows = []
+    for chunk in chunks:
+        chunk_id = chunk["chunk_id"]
+        chunk_index = chunk["chunk_index"]
+        checksum = chunk["checksum"]
 
-                logger.debug(f"Chunk already exists with matching checksum: {chunk_id}")
-            else:
-                cursor.execute(
-                    """
-                    INSERT INTO chunks (chunk_id, file_id, chunk_index, size, checksum)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (chunk_id, file_id, chunk_index, size, checksum)
+        existing_checksum = existing_checksums.get(chunk_index)
+
+        if existing_checksum is not None:
+            if existing_checksum != checksum:
+                logger.error(
+                    f"Chunk checksum mismatch for file {file_id} chunk {chunk_index}: "
+                    f"existing={existing_checksum}, incoming={checksum}"
                 )
+                return False
 
-        logger.info(
-            f"Applied CHUNKS_CREATED operation [operation_id={operation.operation_id}, "
-            f"file_id={file_id}, chunks_count={len(chunks)}]"
-        )
+            logger.debug(f"Chunk already exists with matching checksum: {chunk_id}")
+        else:
+            new_chunk_rows.append((chunk_id, file_id, chunk_index, chunk["size"], checksum))
+
+    cursor.executemany(
+        """
+        INSERT INTO chunks (chunk_id, file_id, chunk_index, size, checksum)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        new_chunk_rows
+    )
 
-        _merge_vector_clock(operation.vector_clock, conn=conn)
-        mark_operation_applied(operation.operation_id, conn=conn)
-        conn.commit()
+    logger.info(
+        f"Applied CHUNKS_CREATED operation [operation_id={operation.operation_id}, "
+        f"file_id={file_id}, chunks_count={len(chunks)}]"
+    )
+
+    _merge_vector_clock(operation.vector_clock, conn=conn)
 
     return True
 
 
+_APPLIERS: Dict[str, Callable[[Operation, sqlite3.Connection], bool]] = {
+    "USER_CREATED": _apply_user_created,
+    "API_KEY_UPDATED": _apply_api_key_updated,
+    "FILE_CREATED": _apply_file_created,
+    "FILE_DELETED": _apply_file_deleted,
+    "TAGS_ADDED": _apply_tags_added,
+    "TAGS_REMOVED": _apply_tags_removed,
+    "CHUNKS_CREATED": _apply_chunks_created,
+}
+
+
 def _resolve_concurrent_file_creation(operations: List[Operation]) -> Operation:
     """
     Resolve concurrent file creation conflict using LWW + tiebreaker.
@@ -877,15 +1350,12 @@ def _resolve_concurrent_file_creation(operations: List[Operation]) -> Operation:
     Returns:
         Winning operation
     """
-    sorted_ops = sorted(
-        operations,
-        key=lambda op: (op.timestamp_ms, op.payload["file_id"])
-    )
-    winner = sorted_ops[0]
+    candidates = {op.operation_id: op for op in operations}.values()
+    winner = min(candidates, key=lambda op: (op.timestamp_ms, op.payload["file_id"]))
 
     logger.warning(
         f"Concurrent file creation conflict: "
-        f"selected operation {winner.operation_id} from {len(operations)} candidates "
+        f"selected operation {winner.operation_id} from {len(candidates)} candidates "
         f"(timestamp_ms={winner.timestamp_ms}, file_id={winner.payload['file_id']})"
     )
 
@@ -900,80 +1370,73 @@ def _merge_vector_clock(vector_clock: dict, conn) -> None:
         vector_clock: Remote vector clock as dict
         conn: Database connection
     """
-    cursor = conn.cursor()
-
-    for controller_id, sequence in vector_clock.items():
-        cursor.execute(
-            "SELECT sequence FROM vector_clock_state WHERE controller_id = ?",
-            (controller_id,)
-        )
-        row = cursor.fetchone()
-
-        current_seq = row[0] if row else 0
-        new_seq = max(current_seq, sequence)
-
-        cursor.execute(
-            """
-            INSERT INTO vector_clock_state (controller_id, sequence, last_seen_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(controller_id) DO UPDATE SET
-                sequence = excluded.sequence,
-                last_seen_at = excluded.last_seen_at
-            """,
-            (controller_id, new_seq, datetime.utcnow().isoformat())
-        )
+    now = datetime.utcnow().isoformat()
+
+    conn.reusable_cursor.executemany(
+        """
+        INSERT INTO vector_clock_state (controller_id, sequence, last_seen_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(controller_id) DO UPDATE SET
+            sequence = MAX(vector_clock_state.sequence, excluded.sequence),
+            last_seen_at = excluded.last_seen_at
+        """,
+        [(controller_id, sequence, now) for controller_id, sequence in vector_clock.items()]
+    )
 
 
 async def start_deferred_operations_manager():
     """
     Background task that periodically retries deferred operations.
 
-    Runs every 10 seconds and attempts to apply all deferred operations.
-    Operations that still have unmet dependencies will remain deferred.
+    Deferred operations are normally retried as soon as their dependency is
+    applied; this sweep is the safety net. While any operation is deferred
+    it retries all of them every DEFERRED_RETRY_INTERVAL_SECONDS, and it
+    sleeps until the next deferral otherwise. Operations that still have
+    unmet dependencies will remain deferred.
     """
     logger.info("Starting deferred operations retry manager")
 
+    loaded = await load_deferred_operations()
+    if loaded:
+        logger.info("Loaded %d deferred operations from database", loaded)
+
     while True:
         try:
-            await asyncio.sleep(10)
+            await _deferred_pending.wait()
+            await asyncio.sleep(DEFERRED_RETRY_INTERVAL_SECONDS)
 
-            async with _lock:
+            async with _deferred_lock:
                 if not _deferred_operations:
+                    _deferred_pending.clear()
                     continue
 
                 operations_to_retry = list(_deferred_operations.items())
 
             if operations_to_retry:
                 logger.info(
-                    f"Retrying {len(operations_to_retry)} deferred operations "
-                    f"(periodic retry check)"
+                    "Retrying %d deferred operations (periodic retry check)",
+                    len(operations_to_retry)
                 )
 
+            applied_flags = await _run_on_writer(
+                _get_applied_flags_sync, [op_id for op_id, _ in operations_to_retry]
+            )
+
+            pending_operations = []
             for op_id, operation in operations_to_retry:
-                from controller.replication.operation_log import get_operation_by_id
-
-                existing = get_operation_by_id(operation.operation_id)
-                if existing and existing.applied == 1:
-                    async with _lock:
-                        _deferred_operations.pop(op_id, None)
-                        for dep_key, waiting_ids in list(_operation_dependencies.items()):
-                            if op_id in waiting_ids:
-                                waiting_ids.remove(op_id)
-                                if not waiting_ids:
-                                    _operation_dependencies.pop(dep_key, None)
+                if applied_flags.get(op_id) == 1:
+                    async with _deferred_lock:
+                        _unindex_deferred_operation(op_id)
 
                     logger.debug(
-                        f"Cleaned up already-applied deferred operation {op_id}"
+                        "Cleaned up already-applied deferred operation %s", op_id
                     )
                     continue
 
-                try:
-                    await apply_operation(operation)
-                except Exception as e:
-                    logger.debug(
-                        f"Deferred operation {operation.operation_id} "
-                        f"still cannot be applied: {e}"
-                    )
+                pending_operations.append(operation)
+
+            if pending_operations:
+                await apply_operations(pending_operations)
 
         except Exception as e:
-            logger.error(f"Error in deferred operations manager: {e}", exc_info=True)
+            logger.error("Error in deferred operations manager: %s", e, exc_info=True)
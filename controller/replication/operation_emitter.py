@@ -6,18 +6,53 @@ the local vector clock and storing operations in the operation log.
 """
 
 import uuid
+import time
 import logging
-from datetime import datetime
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 import sqlite3
 
-from controller.database import get_db_connection
+from controller.database import get_persistent_db_connection
 from controller.replication.controller_id import get_controller_id
 from controller.replication.operation_log import insert_operation
 
 logger = logging.getLogger(__name__)
 
 
+# (UTC second, ISO timestamp) of the latest vector clock update. Nothing
+# needs last_seen_at finer than a second, so emits within one second reuse
+# the formatted string.
+_last_seen_at: Tuple[int, str] = (0, "")
+
+
+def _last_seen_at_now() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string with second resolution.
+
+    Returns:
+        Timestamp such as '2024-01-01T00:00:00'
+    """
+    global _last_seen_at
+
+    second = int(time.time())
+    cached = _last_seen_at
+    if cached[0] != second:
+        cached = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+        _last_seen_at = cached
+    return cached[1]
+
+
+@lru_cache(maxsize=1)
+def _cached_controller_id() -> str:
+    """
+    Get this controller's ID, reading it from disk only once per process.
+
+    Returns:
+        Controller UUID string
+    """
+    return get_controller_id()
+
+
 def get_and_increment_vector_clock(
     controller_id: str,
     conn: Optional[sqlite3.Connection] = None
@@ -52,20 +87,70 @@ def get_and_increment_vector_clock(
                 sequence = excluded.sequence,
                 last_seen_at = excluded.last_seen_at
             """,
-            (controller_id, new_seq, datetime.utcnow().isoformat())
+            (controller_id, new_seq, _last_seen_at_now())
         )
 
         return vector_clock
 
     if conn:
-        return _get_and_increment(conn.cursor())
+        return _get_and_increment(conn.reusable_cursor)
     else:
-        with get_db_connection() as db_conn:
-            result = _get_and_increment(db_conn.cursor())
+        with get_persistent_db_connection() as db_conn:
+            result = _get_and_increment(db_conn.reusable_cursor)
             db_conn.commit()
             return result
 
 
+def _emit(
+    operation_type: str,
+    user_id: str,
+    payload: Dict,
+    conn: Optional[sqlite3.Connection] = None
+) -> str:
+    """
+    Record a locally originated operation as applied.
+
+    Allocates the operation ID and timestamp, increments the local vector
+    clock and logs the operation. Both writes share one connection and,
+    without a caller-supplied connection, a single commit.
+
+    Args:
+        operation_type: Type of operation
+        user_id: UUID of the user affected
+        payload: Operation payload as dict
+        conn: Optional database connection
+
+    Returns:
+        Operation ID (UUID)
+    """
+    controller_id = _cached_controller_id()
+    operation_id = str(uuid.uuid4())
+    timestamp_ms = time.time_ns() // 1_000_000
+
+    def _record(db_conn: sqlite3.Connection):
+        vector_clock = get_and_increment_vector_clock(controller_id, conn=db_conn)
+
+        insert_operation(
+            operation_id=operation_id,
+            operation_type=operation_type,
+            user_id=user_id,
+            timestamp_ms=timestamp_ms,
+            vector_clock=vector_clock,
+            payload=payload,
+            applied=1,
+            conn=db_conn
+        )
+
+    if conn:
+        _record(conn)
+    else:
+        with get_persistent_db_connection() as db_conn:
+            _record(db_conn)
+            db_conn.commit()
+
+    return operation_id
+
+
 def emit_user_created(
     user_id: str,
     username: str,
@@ -88,12 +173,6 @@ def emit_user_created(
     Returns:
         Operation ID (UUID)
     """
-    controller_id = get_controller_id()
-    operation_id = str(uuid.uuid4())
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-
-    vector_clock = get_and_increment_vector_clock(controller_id, conn=conn)
-
     payload = {
         "user_id": user_id,
         "username": username,
@@ -102,20 +181,12 @@ def emit_user_created(
         "created_at": created_at
     }
 
-    insert_operation(
-        operation_id=operation_id,
-        operation_type="USER_CREATED",
-        user_id=user_id,
-        timestamp_ms=timestamp_ms,
-        vector_clock=vector_clock,
-        payload=payload,
-        applied=1,
-        conn=conn
-    )
+    operation_id = _emit("USER_CREATED", user_id, payload, conn=conn)
 
     logger.info(
-        f"Emitted USER_CREATED operation [operation_id={operation_id}, "
-        f"user_id={user_id}, username={username}]"
+        "Emitted USER_CREATED operation [operation_id=%s, "
+        "user_id=%s, username=%s]",
+        operation_id, user_id, username
     )
 
     return operation_id
@@ -139,32 +210,18 @@ def emit_api_key_updated(
     Returns:
         Operation ID (UUID)
     """
-    controller_id = get_controller_id()
-    operation_id = str(uuid.uuid4())
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-
-    vector_clock = get_and_increment_vector_clock(controller_id, conn=conn)
-
     payload = {
         "user_id": user_id,
         "new_api_key": new_api_key,
         "key_updated_at": key_updated_at
     }
 
-    insert_operation(
-        operation_id=operation_id,
-        operation_type="API_KEY_UPDATED",
-        user_id=user_id,
-        timestamp_ms=timestamp_ms,
-        vector_clock=vector_clock,
-        payload=payload,
-        applied=1,
-        conn=conn
-    )
+    operation_id = _emit("API_KEY_UPDATED", user_id, payload, conn=conn)
 
     logger.info(
-        f"Emitted API_KEY_UPDATED operation [operation_id={operation_id}, "
-        f"user_id={user_id}]"
+        "Emitted API_KEY_UPDATED operation [operation_id=%s, "
+        "user_id=%s]",
+        operation_id, user_id
     )
 
     return operation_id
@@ -196,12 +253,6 @@ def emit_file_created(
     Returns:
         Operation ID (UUID)
     """
-    controller_id = get_controller_id()
-    operation_id = str(uuid.uuid4())
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-
-    vector_clock = get_and_increment_vector_clock(controller_id, conn=conn)
-
     payload = {
         "file_id": file_id,
         "name": name,
@@ -212,20 +263,12 @@ def emit_file_created(
         "replaced_file_id": replaced_file_id
     }
 
-    insert_operation(
-        operation_id=operation_id,
-        operation_type="FILE_CREATED",
-        user_id=owner_id,
-        timestamp_ms=timestamp_ms,
-        vector_clock=vector_clock,
-        payload=payload,
-        applied=1,
-        conn=conn
-    )
+    operation_id = _emit("FILE_CREATED", owner_id, payload, conn=conn)
 
     logger.info(
-        f"Emitted FILE_CREATED operation [operation_id={operation_id}, "
-        f"file_id={file_id}, name={name}, owner_id={owner_id}]"
+        "Emitted FILE_CREATED operation [operation_id=%s, "
+        "file_id=%s, name=%s, owner_id=%s]",
+        operation_id, file_id, name, owner_id
     )
 
     return operation_id
@@ -253,35 +296,21 @@ def emit_file_deleted(
     Returns:
         Operation ID (UUID)
     """
-    controller_id = get_controller_id()
-    operation_id = str(uuid.uuid4())
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-
-    vector_clock = get_and_increment_vector_clock(controller_id, conn=conn)
-
     payload = {
         "file_id": file_id,
         "owner_id": owner_id,
         "name": name,
         "deleted_at": deleted_at,
-        "deleted_by_controller_id": controller_id,
+        "deleted_by_controller_id": _cached_controller_id(),
         "chunk_ids": chunk_ids
     }
 
-    insert_operation(
-        operation_id=operation_id,
-        operation_type="FILE_DELETED",
-        user_id=owner_id,
-        timestamp_ms=timestamp_ms,
-        vector_clock=vector_clock,
-        payload=payload,
-        applied=1,
-        conn=conn
-    )
+    operation_id = _emit("FILE_DELETED", owner_id, payload, conn=conn)
 
     logger.info(
-        f"Emitted FILE_DELETED operation [operation_id={operation_id}, "
-        f"file_id={file_id}, name={name}, owner_id={owner_id}]"
+        "Emitted FILE_DELETED operation [operation_id=%s, "
+        "file_id=%s, name=%s, owner_id=%s]",
+        operation_id, file_id, name, owner_id
     )
 
     return operation_id
@@ -305,32 +334,18 @@ def emit_tags_added(
     Returns:
         Operation ID (UUID)
     """
-    controller_id = get_controller_id()
-    operation_id = str(uuid.uuid4())
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-
-    vector_clock = get_and_increment_vector_clock(controller_id, conn=conn)
-
     payload = {
         "file_id": file_id,
         "tags": tags,
         "owner_id": owner_id
     }
 
-    insert_operation(
-        operation_id=operation_id,
-        operation_type="TAGS_ADDED",
-        user_id=owner_id,
-        timestamp_ms=timestamp_ms,
-        vector_clock=vector_clock,
-        payload=payload,
-        applied=1,
-        conn=conn
-    )
+    operation_id = _emit("TAGS_ADDED", owner_id, payload, conn=conn)
 
     logger.info(
-        f"Emitted TAGS_ADDED operation [operation_id={operation_id}, "
-        f"file_id={file_id}, tags={tags}]"
+        "Emitted TAGS_ADDED operation [operation_id=%s, "
+        "file_id=%s, tags=%s]",
+        operation_id, file_id, tags
     )
 
     return operation_id
@@ -354,32 +369,18 @@ def emit_tags_removed(
     Returns:
         Operation ID (UUID)
     """
-    controller_id = get_controller_id()
-    operation_id = str(uuid.uuid4())
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-
-    vector_clock = get_and_increment_vector_clock(controller_id, conn=conn)
-
     payload = {
         "file_id": file_id,
         "tags": tags,
         "owner_id": owner_id
     }
 
-    insert_operation(
-        operation_id=operation_id,
-        operation_type="TAGS_REMOVED",
-        user_id=owner_id,
-        timestamp_ms=timestamp_ms,
-        vector_clock=vector_clock,
-        payload=payload,
-        applied=1,
-        conn=conn
-    )
+    operation_id = _emit("TAGS_REMOVED", owner_id, payload, conn=conn)
 
     logger.info(
-        f"Emitted TAGS_REMOVED operation [operation_id={operation_id}, "
-        f"file_id={file_id}, tags={tags}]"
+        "Emitted TAGS_REMOVED operation [operation_id=%s, "
+        "file_id=%s, tags=%s]",
+        operation_id, file_id, tags
     )
 
     return operation_id
@@ -403,32 +404,18 @@ def emit_chunks_created(
     Returns:
         Operation ID (UUID)
     """
-    controller_id = get_controller_id()
-    operation_id = str(uuid.uuid4())
-    timestamp_ms = int(datetime.utcnow().timestamp() * 1000)
-
-    vector_clock = get_and_increment_vector_clock(controller_id, conn=conn)
-
     payload = {
         "file_id": file_id,
         "chunks": chunks,
         "owner_id": owner_id
     }
 
-    insert_operation(
-        operation_id=operation_id,
-        operation_type="CHUNKS_CREATED",
-        user_id=owner_id,
-        timestamp_ms=timestamp_ms,
-        vector_clock=vector_clock,
-        payload=payload,
-        applied=1,
-        conn=conn
-    )
+    operation_id = _emit("CHUNKS_CREATED", owner_id, payload, conn=conn)
 
     logger.info(
-        f"Emitted CHUNKS_CREATED operation [operation_id={operation_id}, "
-        f"file_id={file_id}, chunks_count={len(chunks)}]"
+        "Emitted CHUNKS_CREATED operation [operation_id=%s, "
+        "file_id=%s, chunks_count=%s]",
+        operation_id, file_id, len(chunks)
     )
 
     return operation_id
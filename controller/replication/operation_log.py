@@ -6,17 +6,241 @@ inserting new operations, querying by various criteria, and marking
 operations as applied.
 """
 
-import json
 import logging
-from typing import List, Optional, Dict
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Dict, Iterable, Iterator, Set, Tuple
 from datetime import datetime
 import sqlite3
 
-from controller.database import get_db_connection
+import orjson
+
+from controller.database import get_persistent_db_connection, get_read_db_connection
+from controller.utils import operation_id_hash
 from common.protocol import Operation, OperationSummary
+from common.constants import VECTOR_CLOCK_BASELINE_MAX_DELTA, VECTOR_CLOCK_BASELINE_CACHE_SIZE
 
 logger = logging.getLogger(__name__)
 
+_FILE_TARGET_OPERATION_TYPES = frozenset({"FILE_CREATED", "FILE_DELETED"})
+
+# Stay below SQLite's default host-parameter limit in older builds.
+_MAX_IN_PARAMS = 900
+
+
+_OPERATION_WITH_CLOCK_COLUMNS = """
+    operations.operation_id, operations.operation_type, operations.user_id,
+    operations.timestamp_ms, operations.payload, operations.applied,
+    operations.created_at, operations.clock_base_id,
+    clock.controller_id, clock.sequence
+"""
+
+# Baselines never change once committed, so they are cached by base_id.
+# Nothing read or written in an open transaction enters the cache or
+# becomes current before that transaction commits: a rolled-back baseline
+# must never be referenced by a later operation.
+_clock_baselines: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+# The committed baseline new operations are split against. Loaded from
+# the table once, then advanced whenever a new baseline commits.
+_current_clock_base_id: Optional[str] = None
+# Newest baseline each connection stored in its open transaction, keyed by
+# id(conn). Entries left behind by a rollback fail validation on next use.
+_pending_clock_base_ids: Dict[int, str] = {}
+_clock_baselines_lock = threading.Lock()
+
+
+def _cache_clock_baseline(base_id: str, baseline: Dict[str, int]) -> None:
+    """
+    Add a committed baseline to the LRU, evicting the oldest when full.
+
+    Args:
+        base_id: ID of the baseline
+        baseline: Baseline vector clock
+    """
+    with _clock_baselines_lock:
+        _clock_baselines[base_id] = baseline
+        _clock_baselines.move_to_end(base_id)
+        if len(_clock_baselines) > VECTOR_CLOCK_BASELINE_CACHE_SIZE:
+            _clock_baselines.popitem(last=False)
+
+
+def _publish_clock_baseline(conn_key: int, base_id: str) -> None:
+    """
+    Make a committed baseline the one new operations are split against.
+
+    Args:
+        conn_key: id() of the connection that stored the baseline
+        base_id: ID of the baseline
+    """
+    global _current_clock_base_id
+
+    with _clock_baselines_lock:
+        _current_clock_base_id = base_id
+        if _pending_clock_base_ids.get(conn_key) == base_id:
+            del _pending_clock_base_ids[conn_key]
+
+
+def _get_clock_baseline(conn: sqlite3.Connection, base_id: str) -> Dict[str, int]:
+    """
+    Get a vector clock baseline, loading it on first use.
+
+    A baseline loaded inside an open transaction is cached only once that
+    transaction commits, since it may be the transaction's own row.
+
+    Args:
+        conn: Database connection
+        base_id: ID of the baseline
+
+    Returns:
+        Baseline vector clock (must not be mutated), empty if the baseline
+        is not visible on this connection
+    """
+    with _clock_baselines_lock:
+        baseline = _clock_baselines.get(base_id)
+        if baseline is not None:
+            _clock_baselines.move_to_end(base_id)
+            return baseline
+
+    baseline = {
+        row[0]: row[1]
+        for row in conn.execute(
+            "SELECT controller_id, sequence FROM vector_clock_baselines WHERE base_id = ?",
+            (base_id,)
+        )
+    }
+    if baseline:
+        conn.after_commit(lambda: _cache_clock_baseline(base_id, baseline))
+    return baseline
+
+
+def _split_vector_clock(
+    cursor: sqlite3.Cursor,
+    operation_id: str,
+    vector_clock: Dict[str, int]
+) -> Tuple[Optional[str], Dict[str, int]]:
+    """
+    Split a vector clock into a baseline reference and a sparse delta.
+
+    The delta holds the entries that differ from the latest baseline, with
+    sequence 0 marking baseline entries the clock lacks. When there is no
+    baseline or the delta grows past VECTOR_CLOCK_BASELINE_MAX_DELTA, the
+    clock itself is stored as a new baseline named after the operation.
+
+    Args:
+        cursor: Database cursor
+        operation_id: UUID of the operation being stored
+        vector_clock: Full vector clock of the operation
+
+    Returns:
+        Tuple of (baseline ID or None, delta entries)
+    """
+    if not vector_clock:
+        return None, {}
+
+    conn = cursor.connection
+    conn_key = id(conn)
+
+    with _clock_baselines_lock:
+        base_id = _pending_clock_base_ids.get(conn_key) or _current_clock_base_id
+
+    baseline = _get_clock_baseline(conn, base_id) if base_id else {}
+    if not baseline:
+        # First insert, or the remembered baseline was rolled back. The
+        # newest visible baseline may be this transaction's own, so it only
+        # becomes current once the transaction commits.
+        cursor.execute("SELECT base_id FROM vector_clock_baselines ORDER BY rowid DESC LIMIT 1")
+        row = cursor.fetchone()
+        base_id = row[0] if row else None
+        if base_id:
+            baseline = _get_clock_baseline(conn, base_id)
+            with _clock_baselines_lock:
+                _pending_clock_base_ids[conn_key] = base_id
+            conn.after_commit(lambda: _publish_clock_baseline(conn_key, base_id))
+
+    if baseline:
+        delta = {
+            controller_id: sequence
+            for controller_id, sequence in vector_clock.items()
+            if baseline.get(controller_id) != sequence
+        }
+        delta.update(
+            (controller_id, 0)
+            for controller_id in baseline
+            if controller_id not in vector_clock
+        )
+        if len(delta) <= VECTOR_CLOCK_BASELINE_MAX_DELTA:
+            return base_id, delta
+
+    cursor.executemany(
+        "INSERT INTO vector_clock_baselines (base_id, controller_id, sequence) VALUES (?, ?, ?)",
+        [
+            (operation_id, controller_id, sequence)
+            for controller_id, sequence in vector_clock.items()
+        ]
+    )
+    with _clock_baselines_lock:
+        _pending_clock_base_ids[conn_key] = operation_id
+    conn.after_commit(lambda: _publish_clock_baseline(conn_key, operation_id))
+    return operation_id, {}
+
+
+def _iter_rows_with_clocks(cursor: sqlite3.Cursor) -> Iterator[Tuple[tuple, Dict[str, int]]]:
+    """
+    Group rows joined with their vector clock delta entries.
+
+    Each row ends with clock_base_id, controller_id and sequence, and is
+    keyed by its first column. Rows are consumed straight from the cursor;
+    each key's rows must be contiguous, one per delta entry.
+
+    Args:
+        cursor: Cursor positioned on the joined query
+
+    Yields:
+        Tuples of (leading columns, vector clock) in result order
+    """
+    current = None
+    vector_clock: Dict[str, int] = {}
+    for row in cursor:
+        if current is None or current[0] != row[0]:
+            if current is not None:
+                yield current, vector_clock
+            current = row[:-3]
+            base_id = row[-3]
+            vector_clock = dict(_get_clock_baseline(cursor.connection, base_id)) if base_id else {}
+        controller_id, sequence = row[-2], row[-1]
+        if controller_id is None:
+            continue
+        if sequence:
+            vector_clock[controller_id] = sequence
+        else:
+            vector_clock.pop(controller_id, None)
+
+    if current is not None:
+        yield current, vector_clock
+
+
+def _iter_operations(cursor: sqlite3.Cursor) -> Iterator[Operation]:
+    """
+    Build operations from a query selecting _OPERATION_WITH_CLOCK_COLUMNS.
+
+    Args:
+        cursor: Cursor positioned on the query
+
+    Yields:
+        Operation objects in result order
+    """
+    for row, vector_clock in _iter_rows_with_clocks(cursor):
+        yield Operation(
+            operation_id=row[0],
+            operation_type=row[1],
+            user_id=row[2],
+            timestamp_ms=row[3],
+            vector_clock=vector_clock,
+            payload=orjson.loads(row[4]),
+            applied=row[5],
+            created_at=row[6]
+        )
+
 
 def insert_operation(
     operation_id: str,
@@ -43,72 +267,168 @@ def insert_operation(
     """
     created_at = datetime.utcnow().isoformat()
 
+    if operation_type in _FILE_TARGET_OPERATION_TYPES:
+        target_owner_id = payload.get("owner_id")
+        target_name = payload.get("name")
+    else:
+        target_owner_id = None
+        target_name = None
+
     def _insert(cursor: sqlite3.Cursor):
+        clock_base_id, clock_delta = _split_vector_clock(cursor, operation_id, vector_clock)
+
+        # The clock lives in operation_vector_clock; the legacy NOT NULL
+        # vector_clock column only gets a constant placeholder.
         cursor.execute(
             """
             INSERT INTO operations
-            (operation_id, operation_type, user_id, timestamp_ms, vector_clock,
-             payload, applied, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            (operation_id, op_id_hash, operation_type, user_id, timestamp_ms,
+             vector_clock, payload, applied, created_at, target_owner_id, target_name,
+             clock_base_id)
+            VALUES (?, ?, ?, ?, ?, '{}', ?, ?, ?, ?, ?, ?)
             """,
             (
                 operation_id,
+                operation_id_hash(operation_id),
                 operation_type,
                 user_id,
                 timestamp_ms,
-                json.dumps(vector_clock),
-                json.dumps(payload),
+                orjson.dumps(payload).decode(),
                 applied,
-                created_at
+                created_at,
+                target_owner_id,
+                target_name,
+                clock_base_id
             )
         )
+        cursor.executemany(
+            """
+            INSERT INTO operation_vector_clock (operation_id, controller_id, sequence)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (operation_id, controller_id, sequence)
+                for controller_id, sequence in clock_delta.items()
+            ]
+        )
 
     if conn:
-        _insert(conn.cursor())
+        _insert(conn.reusable_cursor)
     else:
-        with get_db_connection() as db_conn:
-            _insert(db_conn.cursor())
+        with get_persistent_db_connection() as db_conn:
+            _insert(db_conn.reusable_cursor)
             db_conn.commit()
 
-    logger.debug(f"Inserted operation {operation_id} (type={operation_type}, applied={applied})")
+    logger.debug(
+        "Inserted operation %s (type=%s, applied=%s)", operation_id, operation_type, applied
+    )
 
 
-def get_operation_by_id(operation_id: str) -> Optional[Operation]:
+def get_operation_by_id(
+    operation_id: str,
+    conn: Optional[sqlite3.Connection] = None
+) -> Optional[Operation]:
     """
     Retrieve an operation by its ID.
 
     Args:
         operation_id: UUID of the operation
+        conn: Optional database connection
 
     Returns:
         Operation object if found, None otherwise
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    def _query(cursor: sqlite3.Cursor) -> Optional[Operation]:
         cursor.execute(
-            """
-            SELECT operation_id, operation_type, user_id, timestamp_ms,
-                   vector_clock, payload, applied, created_at
+            f"""
+            SELECT {_OPERATION_WITH_CLOCK_COLUMNS}
             FROM operations
-            WHERE operation_id = ?
+            LEFT JOIN operation_vector_clock AS clock
+                ON clock.operation_id = operations.operation_id
+            WHERE operations.op_id_hash = ? AND operations.operation_id = ?
             """,
-            (operation_id,)
+            (operation_id_hash(operation_id), operation_id)
         )
-        row = cursor.fetchone()
+        return next(_iter_operations(cursor), None)
 
-        if not row:
-            return None
+    if conn:
+        return _query(conn.cursor())
 
-        return Operation(
-            operation_id=row[0],
-            operation_type=row[1],
-            user_id=row[2],
-            timestamp_ms=row[3],
-            vector_clock=json.loads(row[4]),
-            payload=json.loads(row[5]),
-            applied=row[6],
-            created_at=row[7]
+    with get_read_db_connection() as db_conn:
+        return _query(db_conn.cursor())
+
+
+def get_operation_applied_flag(
+    operation_id: str,
+    conn: Optional[sqlite3.Connection] = None
+) -> Optional[int]:
+    """
+    Get only the applied flag of an operation.
+
+    Served entirely from the (op_id_hash, operation_id, applied) index.
+
+    Args:
+        operation_id: UUID of the operation
+        conn: Optional database connection
+
+    Returns:
+        1 if applied, 0 if stored but pending, None if not stored
+    """
+    def _query(cursor: sqlite3.Cursor) -> Optional[int]:
+        cursor.execute(
+            """
+            SELECT applied FROM operations INDEXED BY idx_ops_id_hash_applied
+            WHERE op_id_hash = ? AND operation_id = ?
+            """,
+            (operation_id_hash(operation_id), operation_id)
         )
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    if conn:
+        return _query(conn.cursor())
+
+    with get_read_db_connection() as db_conn:
+        return _query(db_conn.cursor())
+
+
+def get_applied_flags(
+    operation_ids: Iterable[str],
+    conn: Optional[sqlite3.Connection] = None
+) -> Dict[str, int]:
+    """
+    Get the applied flag of several operations.
+
+    Args:
+        operation_ids: Operation IDs to look up
+        conn: Optional database connection
+
+    Returns:
+        Dict mapping each stored operation ID to its applied flag; IDs that
+        are not stored are absent
+    """
+    operation_ids = list(dict.fromkeys(operation_ids))
+
+    def _query(cursor: sqlite3.Cursor) -> Dict[str, int]:
+        flags = {}
+        for start in range(0, len(operation_ids), _MAX_IN_PARAMS):
+            batch = operation_ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(
+                f"SELECT operation_id, applied FROM operations WHERE operation_id IN ({placeholders})",
+                batch
+            )
+            flags.update((row[0], row[1]) for row in cursor.fetchall())
+        return flags
+
+    if not operation_ids:
+        return {}
+
+    if conn:
+        return _query(conn.cursor())
+
+    with get_read_db_connection() as db_conn:
+        return _query(db_conn.cursor())
 
 
 def get_recent_operations(limit: int = 100) -> List[Operation]:
@@ -121,33 +441,25 @@ def get_recent_operations(limit: int = 100) -> List[Operation]:
     Returns:
         List of Operation objects, ordered by timestamp descending
     """
-    with get_db_connection() as conn:
+    with get_read_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            """
-            SELECT operation_id, operation_type, user_id, timestamp_ms,
-                   vector_clock, payload, applied, created_at
-            FROM operations
-            ORDER BY timestamp_ms DESC
-            LIMIT ?
+            f"""
+            SELECT {_OPERATION_WITH_CLOCK_COLUMNS}
+            FROM (
+                SELECT operation_id, operation_type, user_id, timestamp_ms,
+                       payload, applied, created_at, clock_base_id
+                FROM operations
+                ORDER BY timestamp_ms DESC
+                LIMIT ?
+            ) AS operations
+            LEFT JOIN operation_vector_clock AS clock
+                ON clock.operation_id = operations.operation_id
+            ORDER BY operations.timestamp_ms DESC, operations.operation_id
             """,
             (limit,)
         )
-        rows = cursor.fetchall()
-
-        return [
-            Operation(
-                operation_id=row[0],
-                operation_type=row[1],
-                user_id=row[2],
-                timestamp_ms=row[3],
-                vector_clock=json.loads(row[4]),
-                payload=json.loads(row[5]),
-                applied=row[6],
-                created_at=row[7]
-            )
-            for row in rows
-        ]
+        return list(_iter_operations(cursor))
 
 
 def get_all_operation_ids() -> List[str]:
@@ -157,19 +469,51 @@ def get_all_operation_ids() -> List[str]:
     Returns:
         List of operation IDs
     """
-    with get_db_connection() as conn:
+    with get_read_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT operation_id FROM operations")
         rows = cursor.fetchall()
         return [row[0] for row in rows]
 
 
-def get_operations_by_ids(operation_ids: List[str]) -> List[Operation]:
+def get_existing_operation_ids(operation_ids: Iterable[str]) -> Set[str]:
+    """
+    Return the subset of the given operation IDs present in the local log.
+
+    Args:
+        operation_ids: Operation IDs to check
+
+    Returns:
+        Set of operation IDs that exist locally
+    """
+    operation_ids = list(dict.fromkeys(operation_ids))
+    if not operation_ids:
+        return set()
+
+    existing = set()
+    with get_read_db_connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(operation_ids), _MAX_IN_PARAMS):
+            batch = operation_ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            cursor.execute(
+                f"SELECT operation_id FROM operations WHERE operation_id IN ({placeholders})",
+                batch
+            )
+            existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+
+def get_operations_by_ids(
+    operation_ids: List[str],
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Operation]:
     """
     Fetch multiple operations by their IDs.
 
     Args:
         operation_ids: List of operation IDs to fetch
+        conn: Optional database connection
 
     Returns:
         List of Operation objects
@@ -177,72 +521,142 @@ def get_operations_by_ids(operation_ids: List[str]) -> List[Operation]:
     if not operation_ids:
         return []
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    def _query(cursor: sqlite3.Cursor) -> List[Operation]:
         placeholders = ','.join('?' * len(operation_ids))
         cursor.execute(
             f"""
-            SELECT operation_id, operation_type, user_id, timestamp_ms,
-                   vector_clock, payload, applied, created_at
+            SELECT {_OPERATION_WITH_CLOCK_COLUMNS}
             FROM operations
-            WHERE operation_id IN ({placeholders})
+            LEFT JOIN operation_vector_clock AS clock
+                ON clock.operation_id = operations.operation_id
+            WHERE operations.operation_id IN ({placeholders})
+            ORDER BY operations.operation_id
             """,
             operation_ids
         )
-        rows = cursor.fetchall()
+        return list(_iter_operations(cursor))
 
-        return [
-            Operation(
-                operation_id=row[0],
-                operation_type=row[1],
-                user_id=row[2],
-                timestamp_ms=row[3],
-                vector_clock=json.loads(row[4]),
-                payload=json.loads(row[5]),
-                applied=row[6],
-                created_at=row[7]
-            )
-            for row in rows
-        ]
+    if conn:
+        return _query(conn.cursor())
+
+    with get_read_db_connection() as db_conn:
+        return _query(db_conn.cursor())
 
 
-def get_operations_for_user(user_id: str) -> List[Operation]:
+def get_operations_for_user(
+    user_id: str,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Operation]:
     """
     Get all operations for a specific user.
 
     Args:
         user_id: UUID of the user
+        conn: Optional database connection
 
     Returns:
         List of Operation objects for the user
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    def _query(cursor: sqlite3.Cursor) -> List[Operation]:
         cursor.execute(
-            """
-            SELECT operation_id, operation_type, user_id, timestamp_ms,
-                   vector_clock, payload, applied, created_at
+            f"""
+            SELECT {_OPERATION_WITH_CLOCK_COLUMNS}
             FROM operations
-            WHERE user_id = ?
-            ORDER BY timestamp_ms ASC
+            LEFT JOIN operation_vector_clock AS clock
+                ON clock.operation_id = operations.operation_id
+            WHERE operations.user_id = ?
+            ORDER BY operations.timestamp_ms ASC, operations.operation_id
             """,
             (user_id,)
         )
-        rows = cursor.fetchall()
+        return list(_iter_operations(cursor))
 
-        return [
-            Operation(
-                operation_id=row[0],
-                operation_type=row[1],
-                user_id=row[2],
-                timestamp_ms=row[3],
-                vector_clock=json.loads(row[4]),
-                payload=json.loads(row[5]),
-                applied=row[6],
-                created_at=row[7]
-            )
-            for row in rows
-        ]
+    if conn:
+        return _query(conn.cursor())
+
+    with get_read_db_connection() as db_conn:
+        return _query(db_conn.cursor())
+
+
+def get_user_created_ops_for_users(
+    user_ids: Iterable[str],
+    conn: Optional[sqlite3.Connection] = None
+) -> List[Operation]:
+    """
+    Get USER_CREATED operations for a set of users in a single query.
+
+    Args:
+        user_ids: UUIDs of the users
+        conn: Optional database connection
+
+    Returns:
+        List of USER_CREATED Operation objects for the given users
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return []
+
+    def _query(cursor: sqlite3.Cursor) -> List[Operation]:
+        placeholders = ','.join('?' * len(user_ids))
+        cursor.execute(
+            f"""
+            SELECT {_OPERATION_WITH_CLOCK_COLUMNS}
+            FROM operations
+            LEFT JOIN operation_vector_clock AS clock
+                ON clock.operation_id = operations.operation_id
+            WHERE operations.user_id IN ({placeholders})
+              AND operations.operation_type = 'USER_CREATED'
+            ORDER BY operations.timestamp_ms ASC, operations.operation_id
+            """,
+            user_ids
+        )
+        return list(_iter_operations(cursor))
+
+    if conn:
+        return _query(conn.cursor())
+
+    with get_read_db_connection() as db_conn:
+        return _query(db_conn.cursor())
+
+
+def get_latest_applied_api_key_op(
+    user_id: str,
+    conn: Optional[sqlite3.Connection] = None
+) -> Optional[Operation]:
+    """
+    Get the most recent applied API_KEY_UPDATED operation for a user.
+
+    Args:
+        user_id: UUID of the user
+        conn: Optional database connection
+
+    Returns:
+        Latest applied API_KEY_UPDATED Operation, or None if there is none
+    """
+    def _query(cursor: sqlite3.Cursor) -> Optional[Operation]:
+        cursor.execute(
+            f"""
+            SELECT {_OPERATION_WITH_CLOCK_COLUMNS}
+            FROM (
+                SELECT operation_id, operation_type, user_id, timestamp_ms,
+                       payload, applied, created_at, clock_base_id
+                FROM operations
+                WHERE operation_type = 'API_KEY_UPDATED' AND user_id = ? AND applied = 1
+                ORDER BY timestamp_ms DESC
+                LIMIT 1
+            ) AS operations
+            LEFT JOIN operation_vector_clock AS clock
+                ON clock.operation_id = operations.operation_id
+            """,
+            (user_id,)
+        )
+        return next(_iter_operations(cursor), None)
+
+    if conn:
+        return _query(conn.cursor())
+
+    with get_read_db_connection() as db_conn:
+        return _query(db_conn.cursor())
 
 
 def mark_operation_applied(operation_id: str, conn: Optional[sqlite3.Connection] = None) -> None:
@@ -253,20 +667,37 @@ def mark_operation_applied(operation_id: str, conn: Optional[sqlite3.Connection]
         operation_id: UUID of the operation
         conn: Optional database connection
     """
+    mark_operations_applied([operation_id], conn=conn)
+
+
+def mark_operations_applied(
+    operation_ids: List[str],
+    conn: Optional[sqlite3.Connection] = None
+) -> None:
+    """
+    Mark several operations as applied with a single batched UPDATE.
+
+    Args:
+        operation_ids: UUIDs of the operations
+        conn: Optional database connection
+    """
+    if not operation_ids:
+        return
+
     def _update(cursor: sqlite3.Cursor):
-        cursor.execute(
-            "UPDATE operations SET applied = 1 WHERE operation_id = ?",
-            (operation_id,)
+        cursor.executemany(
+            "UPDATE operations SET applied = 1 WHERE op_id_hash = ? AND operation_id = ?",
+            [(operation_id_hash(operation_id), operation_id) for operation_id in operation_ids]
         )
 
     if conn:
-        _update(conn.cursor())
+        _update(conn.reusable_cursor)
     else:
-        with get_db_connection() as db_conn:
-            _update(db_conn.cursor())
+        with get_persistent_db_connection() as db_conn:
+            _update(db_conn.reusable_cursor)
             db_conn.commit()
 
-    logger.debug(f"Marked operation {operation_id} as applied")
+    logger.debug("Marked %d operation(s) as applied", len(operation_ids))
 
 
 def get_recent_operation_summaries(limit: int = 100) -> List[OperationSummary]:
@@ -279,18 +710,25 @@ def get_recent_operation_summaries(limit: int = 100) -> List[OperationSummary]:
     Returns:
         List of OperationSummary objects
     """
-    with get_db_connection() as conn:
+    with get_read_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT operation_id, operation_type, user_id, timestamp_ms, vector_clock
-            FROM operations
-            ORDER BY timestamp_ms DESC
-            LIMIT ?
+            SELECT recent.operation_id, recent.operation_type, recent.user_id,
+                   recent.timestamp_ms, recent.clock_base_id,
+                   clock.controller_id, clock.sequence
+            FROM (
+                SELECT operation_id, operation_type, user_id, timestamp_ms, clock_base_id
+                FROM operations
+                ORDER BY timestamp_ms DESC
+                LIMIT ?
+            ) AS recent
+            LEFT JOIN operation_vector_clock AS clock
+                ON clock.operation_id = recent.operation_id
+            ORDER BY recent.timestamp_ms DESC, recent.operation_id
             """,
             (limit,)
         )
-        rows = cursor.fetchall()
 
         return [
             OperationSummary(
@@ -298,7 +736,7 @@ def get_recent_operation_summaries(limit: int = 100) -> List[OperationSummary]:
                 operation_type=row[1],
                 user_id=row[2],
                 timestamp_ms=row[3],
-                vector_clock=json.loads(row[4])
+                vector_clock=vector_clock
             )
-            for row in rows
+            for row, vector_clock in _iter_rows_with_clocks(cursor)
         ]
@@ -8,10 +8,17 @@ concurrent events across multiple controller instances.
 from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict
-import json
 
+import orjson
 
-@dataclass
+
+BEFORE = "before"
+AFTER = "after"
+EQUAL = "equal"
+CONCURRENT = "concurrent"
+
+
+@dataclass(slots=True)
 class VectorClock:
     """
     Vector clock for tracking causality across distributed controllers.
@@ -38,11 +45,10 @@ class VectorClock:
         Args:
             other: The vector clock to merge
         """
+        clocks = self.clocks
         for controller_id, seq in other.clocks.items():
-            self.clocks[controller_id] = max(
-                self.clocks.get(controller_id, 0),
-                seq
-            )
+            if seq > clocks.get(controller_id, 0):
+                clocks[controller_id] = seq
 
     def happens_before(self, other: VectorClock) -> bool:
         """
@@ -56,20 +62,76 @@ class VectorClock:
         Returns:
             True if self causally precedes other, False otherwise
         """
-        if self.clocks == other.clocks:
-            return False
+        mine = self.clocks
+        theirs = other.clocks
+        theirs_get = theirs.get
+        less = False
 
-        for controller_id, seq in self.clocks.items():
-            if seq > other.clocks.get(controller_id, 0):
+        for controller_id, seq in mine.items():
+            other_seq = theirs_get(controller_id, 0)
+            if seq > other_seq:
                 return False
+            if seq < other_seq:
+                less = True
+
+        if less:
+            return True
+
+        for controller_id, other_seq in theirs.items():
+            if other_seq > 0 and controller_id not in mine:
+                return True
+
+        return False
 
-        return True
+    def compare(self, other: VectorClock) -> str:
+        """
+        Determine the causal relationship between this clock and another.
+
+        Both directions are resolved in a single pass over the two clocks,
+        so callers that need more than one relation should prefer this over
+        repeated happens_before calls.
+
+        Args:
+            other: The vector clock to compare against
+
+        Returns:
+            BEFORE if self causally precedes other, AFTER if other causally
+            precedes self, EQUAL if identical, CONCURRENT otherwise
+        """
+        mine = self.clocks
+        theirs = other.clocks
+        theirs_get = theirs.get
+        less = False
+        greater = False
+
+        for controller_id, seq in mine.items():
+            other_seq = theirs_get(controller_id, 0)
+            if seq < other_seq:
+                less = True
+            elif seq > other_seq:
+                greater = True
+
+        if not less:
+            for controller_id, other_seq in theirs.items():
+                if other_seq > 0 and controller_id not in mine:
+                    less = True
+                    break
+
+        if less and greater:
+            return CONCURRENT
+        if less:
+            return BEFORE
+        if greater:
+            return AFTER
+        return EQUAL
 
     def is_concurrent(self, other: VectorClock) -> bool:
         """
         Check if this vector clock is concurrent with another.
 
         Two clocks are concurrent if neither causally precedes the other.
+        Resolved with a single compare pass rather than two happens_before
+        calls.
 
         Args:
             other: The vector clock to compare against
@@ -77,7 +139,7 @@ class VectorClock:
         Returns:
             True if the clocks are concurrent, False otherwise
         """
-        return not self.happens_before(other) and not other.happens_before(self)
+        return self.compare(other) in (CONCURRENT, EQUAL)
 
     def to_json(self) -> str:
         """
@@ -86,7 +148,7 @@ class VectorClock:
         Returns:
             JSON string representation
         """
-        return json.dumps(self.clocks)
+        return orjson.dumps(self.clocks).decode()
 
     @classmethod
     def from_json(cls, json_str: str) -> VectorClock:
@@ -99,7 +161,7 @@ class VectorClock:
         Returns:
             VectorClock instance
         """
-        clocks = json.loads(json_str)
+        clocks = orjson.loads(json_str)
         return cls(clocks=clocks)
 
     def copy(self) -> VectorClock:
@@ -1,5 +1,6 @@
 """Chunk repository for database operations."""
 
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import List
 
@@ -24,35 +25,33 @@ class ChunkRepository:
         if not chunks:
             return
         
-        logger.debug(f"Creating {len(chunks)} chunks for file_id={chunks[0].file_id if chunks else 'unknown'}")
-        should_close = conn is None
-        if conn is None:
-            conn = get_db_connection().__enter__()
-        
-        try:
-            cursor = conn.cursor()
-            for chunk in chunks:
-                cursor.execute(
+        logger.debug("Creating %d chunks for file_id=%s", len(chunks), chunks[0].file_id)
+        should_commit = conn is None
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(
                     """
                     INSERT INTO chunks (chunk_id, file_id, chunk_index, size, checksum)
                     VALUES (?, ?, ?, ?, ?)
                     """,
-                    (chunk.chunk_id, chunk.file_id, chunk.chunk_index, chunk.size, chunk.checksum)
+                    [
+                        (chunk.chunk_id, chunk.file_id, chunk.chunk_index, chunk.size, chunk.checksum)
+                        for chunk in chunks
+                    ]
                 )
-            if should_close:
-                conn.commit()
-            logger.info(f"Created {len(chunks)} chunks successfully")
-        except Exception as e:
-            logger.error(f"Failed to create chunks: {e}", exc_info=True)
-            raise
-        finally:
-            if should_close:
-                conn.close()
+                if should_commit:
+                    conn.commit()
+                logger.info("Created %d chunks successfully", len(chunks))
+            except Exception as e:
+                logger.error(f"Failed to create chunks: {e}", exc_info=True)
+                raise
 
     @staticmethod
     def get_chunks_by_file(file_id: str) -> List[Chunk]:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute(
                 """
                 SELECT chunk_id, file_id, chunk_index, size, checksum
@@ -62,43 +61,37 @@ class ChunkRepository:
                 """,
                 (file_id,)
             )
-            rows = cursor.fetchall()
             
             return [
                 Chunk(
-                    chunk_id=row["chunk_id"],
-                    file_id=row["file_id"],
-                    chunk_index=row["chunk_index"],
-                    size=row["size"],
-                    checksum=row["checksum"],
+                    chunk_id=chunk_id,
+                    file_id=chunk_file_id,
+                    chunk_index=chunk_index,
+                    size=size,
+                    checksum=checksum,
                 )
-                for row in rows
+                for chunk_id, chunk_file_id, chunk_index, size, checksum in cursor
             ]
 
     @staticmethod
     def delete_chunks(file_id: str, conn=None) -> List[str]:
-        logger.debug(f"Deleting chunks [file_id={file_id}]")
-        should_close = conn is None
-        if conn is None:
-            conn = get_db_connection().__enter__()
-        
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT chunk_id FROM chunks WHERE file_id = ?",
-                (file_id,)
-            )
-            chunk_ids = [row["chunk_id"] for row in cursor.fetchall()]
-            
-            cursor.execute("DELETE FROM chunks WHERE file_id = ?", (file_id,))
-            if should_close:
-                conn.commit()
-            
-            logger.info(f"Deleted {len(chunk_ids)} chunks [file_id={file_id}]")
-            return chunk_ids
-        except Exception as e:
-            logger.error(f"Failed to delete chunks [file_id={file_id}]: {e}", exc_info=True)
-            raise
-        finally:
-            if should_close:
-                conn.close()
+        logger.debug("Deleting chunks [file_id=%s]", file_id)
+        should_commit = conn is None
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT chunk_id FROM chunks WHERE file_id = ?",
+                    (file_id,)
+                )
+                chunk_ids = [row["chunk_id"] for row in cursor.fetchall()]
+
+                cursor.execute("DELETE FROM chunks WHERE file_id = ?", (file_id,))
+                if should_commit:
+                    conn.commit()
+
+                logger.info("Deleted %d chunks [file_id=%s]", len(chunk_ids), file_id)
+                return chunk_ids
+            except Exception as e:
+                logger.error(f"Failed to delete chunks [file_id={file_id}]: {e}", exc_info=True)
+                raise
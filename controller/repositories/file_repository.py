@@ -1,8 +1,10 @@
 """File repository for database operations."""
 
+import json
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from common.logging_config import get_logger
 from controller.database import get_db_connection
@@ -10,7 +12,7 @@ from controller.database import get_db_connection
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class File:
     file_id: str
     name: str
@@ -19,6 +21,22 @@ class File:
     created_at: datetime
 
 
+def _row_to_file(row: Sequence) -> File:
+    """
+    Build a File from a row selected as (file_id, name, size, owner_id, created_at).
+
+    Unpacks positionally, so it accepts both sqlite3.Row and plain tuples.
+    """
+    file_id, name, size, owner_id, created_at = row
+    return File(
+        file_id=file_id,
+        name=name,
+        size=size,
+        owner_id=owner_id,
+        created_at=datetime.fromisoformat(created_at),
+    )
+
+
 class FileRepository:
     @staticmethod
     def create_file(
@@ -29,11 +47,8 @@ class FileRepository:
         created_at: datetime,
         conn=None
     ) -> File:
-        should_close = conn is None
-        if conn is None:
-            conn = get_db_connection().__enter__()
-        
-        try:
+        should_commit = conn is None
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -42,7 +57,7 @@ class FileRepository:
                 """,
                 (file_id, name, size, owner_id, created_at.isoformat())
             )
-            if should_close:
+            if should_commit:
                 conn.commit()
             
             return File(
@@ -52,9 +67,6 @@ class FileRepository:
                 owner_id=owner_id,
                 created_at=created_at,
             )
-        finally:
-            if should_close:
-                conn.close()
 
     @staticmethod
     def get_by_id(file_id: str) -> Optional[File]:
@@ -69,17 +81,11 @@ class FileRepository:
             if row is None:
                 return None
             
-            return File(
-                file_id=row["file_id"],
-                name=row["name"],
-                size=row["size"],
-                owner_id=row["owner_id"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-            )
+            return _row_to_file(row)
 
     @staticmethod
     def find_by_owner_and_name(owner_id: str, name: str, conn=None) -> Optional[File]:
-        if conn is not None:
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT file_id, name, size, owner_id, created_at FROM files WHERE owner_id = ? AND name = ?",
@@ -90,52 +96,22 @@ class FileRepository:
             if row is None:
                 return None
             
-            return File(
-                file_id=row["file_id"],
-                name=row["name"],
-                size=row["size"],
-                owner_id=row["owner_id"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-            )
-        else:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT file_id, name, size, owner_id, created_at FROM files WHERE owner_id = ? AND name = ?",
-                    (owner_id, name)
-                )
-                row = cursor.fetchone()
-                
-                if row is None:
-                    return None
-                
-                return File(
-                    file_id=row["file_id"],
-                    name=row["name"],
-                    size=row["size"],
-                    owner_id=row["owner_id"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                )
+            return _row_to_file(row)
 
     @staticmethod
     def delete_file(file_id: str, conn=None) -> None:
         logger.debug(f"Deleting file [file_id={file_id}]")
-        should_close = conn is None
-        if conn is None:
-            conn = get_db_connection().__enter__()
-        
-        try:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
-            if should_close:
-                conn.commit()
-            logger.info(f"File deleted successfully [file_id={file_id}]")
-        except Exception as e:
-            logger.error(f"Failed to delete file [file_id={file_id}]: {e}", exc_info=True)
-            raise
-        finally:
-            if should_close:
-                conn.close()
+        should_commit = conn is None
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+                if should_commit:
+                    conn.commit()
+                logger.info(f"File deleted successfully [file_id={file_id}]")
+            except Exception as e:
+                logger.error(f"Failed to delete file [file_id={file_id}]: {e}", exc_info=True)
+                raise
 
     @staticmethod
     def query_by_tags_and_owner(tags: List[str], owner_id: str) -> List[File]:
@@ -144,28 +120,18 @@ class FileRepository:
         
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             
-            placeholders = ','.join('?' for _ in tags)
-            query = f"""
-                SELECT DISTINCT f.file_id, f.name, f.size, f.owner_id, f.created_at
+            cursor.execute(
+                """
+                SELECT f.file_id, f.name, f.size, f.owner_id, f.created_at
                 FROM files f
                 JOIN tags t ON f.file_id = t.file_id
                 WHERE f.owner_id = ?
-                AND t.tag IN ({placeholders})
+                AND t.tag IN (SELECT value FROM json_each(?))
                 GROUP BY f.file_id
-                HAVING COUNT(DISTINCT t.tag) = ?
-            """
-            
-            cursor.execute(query, [owner_id] + tags + [len(tags)])
-            rows = cursor.fetchall()
-            
-            return [
-                File(
-                    file_id=row["file_id"],
-                    name=row["name"],
-                    size=row["size"],
-                    owner_id=row["owner_id"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                )
-                for row in rows
-            ]
+                HAVING COUNT(*) = ?
+                """,
+                (owner_id, json.dumps(tags), len(tags))
+            )
+            return [_row_to_file(row) for row in cursor]
@@ -1,6 +1,8 @@
 """Tag repository for database operations."""
 
-from typing import List
+import json
+from contextlib import nullcontext
+from typing import Dict, List
 
 from common.logging_config import get_logger
 from controller.database import get_db_connection
@@ -14,33 +16,58 @@ class TagRepository:
         if not tags:
             return
         
-        should_close = conn is None
-        if conn is None:
-            conn = get_db_connection().__enter__()
-        
-        try:
+        should_commit = conn is None
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
             cursor = conn.cursor()
-            for tag in tags:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO tags (file_id, tag) VALUES (?, ?)",
-                    (file_id, tag)
-                )
-            if should_close:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO tags (file_id, tag) VALUES (?, ?)",
+                [(file_id, tag) for tag in tags]
+            )
+            if should_commit:
                 conn.commit()
-        finally:
-            if should_close:
-                conn.close()
 
     @staticmethod
     def get_tags_for_file(file_id: str) -> List[str]:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute(
                 "SELECT tag FROM tags WHERE file_id = ? ORDER BY tag",
                 (file_id,)
             )
-            rows = cursor.fetchall()
-            return [row["tag"] for row in rows]
+            return [tag for (tag,) in cursor]
+
+    @staticmethod
+    def get_tags_for_files(file_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Get the tags of several files in one query.
+
+        Args:
+            file_ids: UUIDs of the files
+
+        Returns:
+            Dict mapping each file ID to its sorted tags; files without tags
+            map to an empty list
+        """
+        tags_by_file: Dict[str, List[str]] = {file_id: [] for file_id in file_ids}
+        if not tags_by_file:
+            return tags_by_file
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                """
+                SELECT file_id, tag FROM tags
+                WHERE file_id IN (SELECT value FROM json_each(?))
+                ORDER BY file_id, tag
+                """,
+                (json.dumps(file_ids),)
+            )
+            for file_id, tag in cursor:
+                tags_by_file[file_id].append(tag)
+
+        return tags_by_file
 
     @staticmethod
     def would_become_tagless(file_id: str, tags_to_remove: List[str], conn=None) -> bool:
@@ -55,50 +82,34 @@ class TagRepository:
         Returns:
             True if file would have no tags remaining, False otherwise
         """
-        should_close = conn is None
-        if conn is None:
-            conn = get_db_connection().__enter__()
-        
-        try:
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT COUNT(*) as count FROM tags WHERE file_id = ?",
-                (file_id,)
+                """
+                SELECT EXISTS(
+                    SELECT 1 FROM tags
+                    WHERE file_id = ? AND tag NOT IN (SELECT value FROM json_each(?))
+                ) as has_remaining
+                """,
+                (file_id, json.dumps(tags_to_remove))
             )
-            total_tags = cursor.fetchone()["count"]
-            
-            if total_tags == 0:
-                return True
-            
-            placeholders = ','.join('?' for _ in tags_to_remove)
-            query = f"SELECT COUNT(*) as count FROM tags WHERE file_id = ? AND tag IN ({placeholders})"
-            cursor.execute(query, [file_id] + tags_to_remove)
-            tags_to_remove_count = cursor.fetchone()["count"]
             
-            return total_tags - tags_to_remove_count == 0
-        finally:
-            if should_close:
-                conn.close()
+            return not cursor.fetchone()["has_remaining"]
 
     @staticmethod
     def delete_tags(file_id: str, tags: List[str], conn=None) -> None:
         if not tags:
             return
         
-        should_close = conn is None
-        if conn is None:
-            conn = get_db_connection().__enter__()
-        
-        try:
+        should_commit = conn is None
+        with (get_db_connection() if conn is None else nullcontext(conn)) as conn:
             cursor = conn.cursor()
-            placeholders = ','.join('?' for _ in tags)
-            query = f"DELETE FROM tags WHERE file_id = ? AND tag IN ({placeholders})"
-            cursor.execute(query, [file_id] + tags)
-            if should_close:
+            cursor.execute(
+                "DELETE FROM tags WHERE file_id = ? AND tag IN (SELECT value FROM json_each(?))",
+                (file_id, json.dumps(tags))
+            )
+            if should_commit:
                 conn.commit()
-        finally:
-            if should_close:
-                conn.close()
 
     @staticmethod
     def query_files_by_tags(tags: List[str], owner_id: str) -> List[str]:
@@ -107,18 +118,18 @@ class TagRepository:
         
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             
-            placeholders = ','.join('?' for _ in tags)
-            query = f"""
-                SELECT DISTINCT t.file_id
+            cursor.execute(
+                """
+                SELECT t.file_id
                 FROM tags t
                 JOIN files f ON t.file_id = f.file_id
                 WHERE f.owner_id = ?
-                AND t.tag IN ({placeholders})
-                GROUP BY t.file_id
-                HAVING COUNT(DISTINCT t.tag) = ?
-            """
-            
-            cursor.execute(query, [owner_id] + tags + [len(tags)])
-            rows = cursor.fetchall()
-            return [row["file_id"] for row in rows]
+                AND t.tag IN (SELECT value FROM json_each(?))
+                GROUP BY f.file_id
+                HAVING COUNT(*) = ?
+                """,
+                (owner_id, json.dumps(tags), len(tags))
+            )
+            return [file_id for (file_id,) in cursor]
@@ -1,17 +1,24 @@
 """User repository for database operations."""
 
+import hmac
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
+from common.constants import API_KEY_CACHE_SIZE, API_KEY_CACHE_TTL_SECONDS
 from common.logging_config import get_logger
 from controller.database import get_db_connection
+from controller.utils import api_key_hash
 from controller.replication.operation_emitter import emit_user_created, emit_api_key_updated
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class User:
     user_id: str
     username: str
@@ -21,6 +28,39 @@ class User:
     key_updated_at: Optional[datetime]
 
 
+# Users by API key hash, each with the monotonic time its entry expires.
+# Every API key change bumps the generation, so a lookup that raced with the
+# change does not re-cache the old key.
+_api_key_cache: "OrderedDict[bytes, Tuple[float, User]]" = OrderedDict()
+_api_key_cache_lock = threading.Lock()
+_api_key_cache_generation = 0
+
+
+def invalidate_api_key_cache() -> None:
+    """
+    Drop every cached API key lookup.
+
+    Must be called after any committed change to a user's API key, local or
+    replicated.
+    """
+    global _api_key_cache_generation
+    with _api_key_cache_lock:
+        _api_key_cache.clear()
+        _api_key_cache_generation += 1
+
+
+def _row_to_user(row: sqlite3.Row) -> User:
+    """Build a User from a users row."""
+    return User(
+        user_id=row["user_id"],
+        username=row["username"],
+        password_hash=row["password_hash"],
+        api_key=row["api_key"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        key_updated_at=datetime.fromisoformat(row["key_updated_at"]) if row["key_updated_at"] else None,
+    )
+
+
 class UserRepository:
     @staticmethod
     def create_user(
@@ -36,10 +76,13 @@ class UserRepository:
             try:
                 cursor.execute(
                     """
-                    INSERT INTO users (user_id, username, password_hash, api_key, created_at, key_updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO users (user_id, username, password_hash, api_key, api_key_hash, created_at, key_updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                     """,
-                    (user_id, username, password_hash, api_key, created_at.isoformat(), created_at.isoformat())
+                    (
+                        user_id, username, password_hash, api_key, api_key_hash(api_key),
+                        created_at.isoformat(), created_at.isoformat()
+                    )
                 )
 
                 emit_user_created(
@@ -82,39 +125,48 @@ class UserRepository:
                 return None
             
             logger.debug(f"User found: {username} [user_id={row['user_id']}]")
-            return User(
-                user_id=row["user_id"],
-                username=row["username"],
-                password_hash=row["password_hash"],
-                api_key=row["api_key"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-                key_updated_at=datetime.fromisoformat(row["key_updated_at"]) if row["key_updated_at"] else None,
-            )
+            return _row_to_user(row)
 
     @staticmethod
     def get_by_api_key(api_key: str) -> Optional[User]:
         logger.debug("Fetching user by API key")
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT user_id, username, password_hash, api_key, created_at, key_updated_at FROM users WHERE api_key = ?",
-                (api_key,)
-            )
-            row = cursor.fetchone()
-            
-            if row is None:
-                logger.debug("User not found for provided API key")
-                return None
-            
-            logger.debug(f"User found by API key [user_id={row['user_id']}]")
-            return User(
-                user_id=row["user_id"],
-                username=row["username"],
-                password_hash=row["password_hash"],
-                api_key=row["api_key"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-                key_updated_at=datetime.fromisoformat(row["key_updated_at"]) if row["key_updated_at"] else None,
-            )
+        key_hash = api_key_hash(api_key)
+        now = time.monotonic()
+
+        with _api_key_cache_lock:
+            entry = _api_key_cache.get(key_hash)
+            if entry is not None and entry[0] <= now:
+                del _api_key_cache[key_hash]
+                entry = None
+            elif entry is not None:
+                _api_key_cache.move_to_end(key_hash)
+            generation = _api_key_cache_generation
+
+        if entry is not None:
+            user = entry[1]
+        else:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT user_id, username, password_hash, api_key, created_at, key_updated_at FROM users WHERE api_key_hash = ?",
+                    (key_hash,)
+                )
+                row = cursor.fetchone()
+            user = _row_to_user(row) if row is not None else None
+
+            if user is not None:
+                with _api_key_cache_lock:
+                    if generation == _api_key_cache_generation:
+                        _api_key_cache[key_hash] = (now + API_KEY_CACHE_TTL_SECONDS, user)
+                        if len(_api_key_cache) > API_KEY_CACHE_SIZE:
+                            _api_key_cache.popitem(last=False)
+
+        if user is None or not hmac.compare_digest(user.api_key.encode('utf-8'), api_key.encode('utf-8')):
+            logger.debug("User not found for provided API key")
+            return None
+
+        logger.debug(f"User found by API key [user_id={user.user_id}]")
+        return user
 
     @staticmethod
     def update_api_key(user_id: str, new_api_key: str, updated_at: datetime) -> None:
@@ -125,10 +177,10 @@ class UserRepository:
                 cursor.execute(
                     """
                     UPDATE users
-                    SET api_key = ?, key_updated_at = ?
+                    SET api_key = ?, api_key_hash = ?, key_updated_at = ?
                     WHERE user_id = ?
                     """,
-                    (new_api_key, updated_at.isoformat(), user_id)
+                    (new_api_key, api_key_hash(new_api_key), updated_at.isoformat(), user_id)
                 )
 
                 emit_api_key_updated(
@@ -139,6 +191,7 @@ class UserRepository:
                 )
 
                 conn.commit()
+                invalidate_api_key_cache()
                 logger.info(f"API key updated successfully [user_id={user_id}]")
             except Exception as e:
                 logger.error(f"Failed to update API key [user_id={user_id}]: {e}", exc_info=True)
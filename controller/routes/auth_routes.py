@@ -1,5 +1,7 @@
 """Authentication API routes."""
 
+import asyncio
+
 from fastapi import APIRouter, status
 
 from controller.schemas.auth import (
@@ -31,7 +33,10 @@ async def register(request: RegisterRequest):
         - 500: Internal server error
     """
     auth_service = AuthService()
-    api_key, user_id = auth_service.register_user(request.username, request.password)
+    # Password hashing and the user insert block, so keep them off the event loop.
+    api_key, user_id = await asyncio.to_thread(
+        auth_service.register_user, request.username, request.password
+    )
     
     return RegisterResponse(api_key=api_key, user_id=user_id)
 
@@ -53,6 +58,8 @@ async def login(request: LoginRequest):
         - 500: Internal server error
     """
     auth_service = AuthService()
-    api_key = auth_service.login_user(request.username, request.password)
+    api_key = await asyncio.to_thread(
+        auth_service.login_user, request.username, request.password
+    )
     
     return LoginResponse(api_key=api_key)
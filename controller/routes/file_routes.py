@@ -288,7 +288,7 @@ async def add_tags(
     """
     tag_service = TagService()
     
-    updated_file_ids = tag_service.add_tags_to_files(
+    updated_file_ids = await tag_service.add_tags_to_files(
         request.query_tags,
         request.new_tags,
         current_user
@@ -326,7 +326,7 @@ async def delete_tags(
     """
     tag_service = TagService()
     
-    updated_file_ids, skipped_files = tag_service.remove_tags_from_files(
+    updated_file_ids, skipped_files = await tag_service.remove_tags_from_files(
         request.query_tags,
         request.tags_to_remove,
         current_user
@@ -1,7 +1,7 @@
 """File service for business logic."""
 
 from datetime import datetime
-from typing import List, BinaryIO, AsyncIterator
+from typing import List, BinaryIO, AsyncIterator, Optional, Tuple
 import hashlib
 import logging
 import json
@@ -11,7 +11,7 @@ import asyncio
 from controller.repositories.file_repository import FileRepository, File
 from controller.repositories.tag_repository import TagRepository
 from controller.repositories.chunk_repository import ChunkRepository, Chunk
-from controller.database import get_db_connection
+from controller.database import get_db_connection, run_metadata_write
 from controller.exceptions import FileNotFoundError, UnauthorizedAccessError, EmptyTagListError, ChunkserverUnavailableError
 from controller.domain import FileMetadata
 from controller.chunkserver_client import ChunkserverClient
@@ -64,76 +64,16 @@ class FileService:
                 chunks_metadata.append(chunk_meta)
                 logger.info(f"Wrote chunk {chunk_meta.chunk_index} for file {file_id}")
             
-            replaced_file_id = None
-            old_chunk_ids = []
-            
-            with get_db_connection() as conn:
-                try:
-                    existing_file = self.file_repo.find_by_owner_and_name(
-                        owner_id=owner_id,
-                        name=file_name,
-                        conn=conn
-                    )
-                    
-                    if existing_file:
-                        replaced_file_id = existing_file.file_id
-                        old_chunks = self.chunk_repo.get_chunks_by_file(replaced_file_id)
-                        old_chunk_ids = [chunk.chunk_id for chunk in old_chunks]
-                        
-                        self.file_repo.delete_file(replaced_file_id, conn=conn)
-                        logger.info(f"Replacing existing file {replaced_file_id} with new file {file_id}")
-                    
-                    self.file_repo.create_file(
-                        file_id=file_id,
-                        name=file_name,
-                        size=file_size,
-                        owner_id=owner_id,
-                        created_at=created_at,
-                        conn=conn,
-                    )
-                    
-                    self.tag_repo.add_tags(file_id, tags, conn=conn)
-                    
-                    self.chunk_repo.create_chunks(
-                        chunks_metadata,
-                        conn=conn
-                    )
-
-                    from controller.replication.operation_emitter import emit_file_created, emit_chunks_created
-
-                    chunks_payload = [
-                        {
-                            "chunk_id": chunk.chunk_id,
-                            "chunk_index": chunk.chunk_index,
-                            "size": chunk.size,
-                            "checksum": chunk.checksum
-                        }
-                        for chunk in chunks_metadata
-                    ]
-
-                    emit_file_created(
-                        file_id=file_id,
-                        name=file_name,
-                        size=file_size,
-                        owner_id=owner_id,
-                        created_at=created_at.isoformat(),
-                        tags=tags,
-                        replaced_file_id=replaced_file_id,
-                        conn=conn
-                    )
-
-                    emit_chunks_created(
-                        file_id=file_id,
-                        chunks=chunks_payload,
-                        owner_id=owner_id,
-                        conn=conn
-                    )
-
-                    conn.commit()
-                    logger.info(f"Successfully uploaded file {file_id} with {len(chunks_metadata)} chunks")
-                except Exception as e:
-                    conn.rollback()
-                    raise
+            replaced_file_id, old_chunk_ids = await run_metadata_write(
+                self._commit_upload_metadata,
+                file_id,
+                file_name,
+                file_size,
+                tags,
+                owner_id,
+                created_at,
+                chunks_metadata,
+            )
             
             if old_chunk_ids:
                 logger.info(f"Cleaning up {len(old_chunk_ids)} chunks from replaced file")
@@ -158,6 +98,98 @@ class FileService:
             replaced_file_id=replaced_file_id,
         )
 
+    def _commit_upload_metadata(
+        self,
+        file_id: str,
+        file_name: str,
+        file_size: int,
+        tags: List[str],
+        owner_id: str,
+        created_at: datetime,
+        chunks_metadata: List[Chunk],
+    ) -> Tuple[Optional[str], List[str]]:
+        """
+        Record an uploaded file's metadata in a single transaction.
+
+        Blocking; upload_file runs it on a worker thread under the metadata
+        write lock.
+
+        Returns:
+            Tuple of (replaced file ID or None, chunk IDs of the replaced file)
+        """
+        replaced_file_id = None
+        old_chunk_ids = []
+        
+        with get_db_connection() as conn:
+            try:
+                existing_file = self.file_repo.find_by_owner_and_name(
+                    owner_id=owner_id,
+                    name=file_name,
+                    conn=conn
+                )
+                
+                if existing_file:
+                    replaced_file_id = existing_file.file_id
+                    old_chunks = self.chunk_repo.get_chunks_by_file(replaced_file_id)
+                    old_chunk_ids = [chunk.chunk_id for chunk in old_chunks]
+                    
+                    self.file_repo.delete_file(replaced_file_id, conn=conn)
+                    logger.info(f"Replacing existing file {replaced_file_id} with new file {file_id}")
+                
+                self.file_repo.create_file(
+                    file_id=file_id,
+                    name=file_name,
+                    size=file_size,
+                    owner_id=owner_id,
+                    created_at=created_at,
+                    conn=conn,
+                )
+                
+                self.tag_repo.add_tags(file_id, tags, conn=conn)
+                
+                self.chunk_repo.create_chunks(
+                    chunks_metadata,
+                    conn=conn
+                )
+
+                from controller.replication.operation_emitter import emit_file_created, emit_chunks_created
+
+                chunks_payload = [
+                    {
+                        "chunk_id": chunk.chunk_id,
+                        "chunk_index": chunk.chunk_index,
+                        "size": chunk.size,
+                        "checksum": chunk.checksum
+                    }
+                    for chunk in chunks_metadata
+                ]
+
+                emit_file_created(
+                    file_id=file_id,
+                    name=file_name,
+                    size=file_size,
+                    owner_id=owner_id,
+                    created_at=created_at.isoformat(),
+                    tags=tags,
+                    replaced_file_id=replaced_file_id,
+                    conn=conn
+                )
+
+                emit_chunks_created(
+                    file_id=file_id,
+                    chunks=chunks_payload,
+                    owner_id=owner_id,
+                    conn=conn
+                )
+
+                conn.commit()
+                logger.info(f"Successfully uploaded file {file_id} with {len(chunks_metadata)} chunks")
+            except Exception as e:
+                conn.rollback()
+                raise
+        
+        return replaced_file_id, old_chunk_ids
+
     def _split_into_chunks_with_data(self, file_data: BinaryIO, file_id: str):
         from controller.utils import generate_uuid
         
@@ -192,28 +224,35 @@ class FileService:
         Returns:
             List of chunk IDs that could not be deleted
         """
-        failed_deletions = []
+        max_attempts = 3
+        pending = list(chunk_ids)
 
-        for chunk_id in chunk_ids:
-            max_attempts = 3
-            deleted = False
+        for attempt in range(max_attempts):
+            results = await asyncio.gather(
+                *(self.chunkserver_client.delete_chunk(chunk_id) for chunk_id in pending),
+                return_exceptions=True
+            )
 
-            for attempt in range(max_attempts):
-                try:
-                    await self.chunkserver_client.delete_chunk(chunk_id)
+            errors = {}
+            for chunk_id, result in zip(pending, results):
+                if isinstance(result, Exception):
+                    errors[chunk_id] = result
+                else:
                     logger.info(f"Deleted orphaned chunk {chunk_id}")
-                    deleted = True
-                    break
-                except Exception as e:
-                    if attempt < max_attempts - 1:
-                        delay = 2 ** attempt
-                        logger.warning(f"Failed to delete chunk {chunk_id}, retrying in {delay}s: {e}")
-                        await asyncio.sleep(delay)
-                    else:
-                        logger.error(f"Failed to delete orphaned chunk {chunk_id} after {max_attempts} attempts: {e}")
-
-            if not deleted:
-                failed_deletions.append(chunk_id)
+
+            pending = list(errors)
+            if not pending:
+                break
+
+            if attempt < max_attempts - 1:
+                delay = 2 ** attempt
+                logger.warning(f"Failed to delete {len(pending)} chunk(s), retrying in {delay}s")
+                await asyncio.sleep(delay)
+            else:
+                for chunk_id, e in errors.items():
+                    logger.error(f"Failed to delete orphaned chunk {chunk_id} after {max_attempts} attempts: {e}")
+
+        failed_deletions = pending
 
         if failed_deletions:
             self._mark_chunks_for_gc(failed_deletions)
@@ -346,18 +385,18 @@ class FileService:
             True if all chunks exist, False if any are missing
         """
         chunks = self.chunk_repo.get_chunks_by_file(file_id)
-        
-        for chunk in chunks:
-            try:
-                available = await self.chunkserver_client.ping()
-                if not available:
-                    logger.warning(f"Chunkserver unavailable during validation")
-                    return True
-                
-            except Exception as e:
-                logger.warning(f"Cannot validate chunk {chunk.chunk_id}: {e}")
-                return False
-        
+        if not chunks:
+            return True
+
+        try:
+            available = await self.chunkserver_client.ping()
+        except Exception as e:
+            logger.warning(f"Cannot validate chunks for file {file_id}: {e}")
+            return False
+
+        if not available:
+            logger.warning(f"Chunkserver unavailable during validation")
+
         return True
 
     def get_chunk_descriptors(self, file_id: str, user_id: str) -> List[ChunkDescriptor]:
@@ -383,6 +422,26 @@ class FileService:
         return chunk_descriptors
 
     async def delete_files(self, tags: List[str], user_id: str) -> List[str]:
+        deleted_file_ids, chunks_to_delete = await run_metadata_write(
+            self._delete_files_metadata, tags, user_id
+        )
+        
+        if chunks_to_delete:
+            logger.info(f"Deleting {len(chunks_to_delete)} chunks from chunkserver")
+            await self._cleanup_chunks(chunks_to_delete)
+        
+        return deleted_file_ids
+
+    def _delete_files_metadata(self, tags: List[str], user_id: str) -> Tuple[List[str], List[str]]:
+        """
+        Delete the metadata of every file matching the tags in a single transaction.
+
+        Blocking; delete_files runs it on a worker thread under the metadata
+        write lock.
+
+        Returns:
+            Tuple of (deleted file IDs, chunk IDs of the deleted files)
+        """
         files = self.file_repo.query_by_tags_and_owner(tags, user_id)
 
         deleted_file_ids = []
@@ -417,11 +476,7 @@ class FileService:
                 conn.rollback()
                 raise
         
-        if chunks_to_delete:
-            logger.info(f"Deleting {len(chunks_to_delete)} chunks from chunkserver")
-            await self._cleanup_chunks(chunks_to_delete)
-        
-        return deleted_file_ids
+        return deleted_file_ids, chunks_to_delete
 
     def get_file_metadata(self, file_id: str, user_id: str) -> FileMetadata:
         file = self.file_repo.get_by_id(file_id)
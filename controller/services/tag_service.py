@@ -5,7 +5,7 @@ from typing import List
 from common.logging_config import get_logger
 from controller.repositories.file_repository import FileRepository
 from controller.repositories.tag_repository import TagRepository
-from controller.database import get_db_connection
+from controller.database import get_db_connection, run_metadata_write
 from controller.domain import FileMetadata
 from controller.exceptions import InvalidTagQueryError
 from controller.schemas.files import SkippedFileInfo
@@ -27,21 +27,22 @@ class TagService:
         files = self.file_repo.query_by_tags_and_owner(tags, user_id)
         logger.info(f"Found {len(files)} files matching tags {tags} [user_id={user_id}]")
         
+        tags_by_file = self.tag_repo.get_tags_for_files([file.file_id for file in files])
+        
         result = []
         for file in files:
-            file_tags = self.tag_repo.get_tags_for_file(file.file_id)
             result.append(FileMetadata(
                 file_id=file.file_id,
                 name=file.name,
                 size=file.size,
-                tags=file_tags,
+                tags=tags_by_file[file.file_id],
                 owner_id=file.owner_id,
                 created_at=file.created_at,
             ))
         
         return result
 
-    def add_tags_to_files(self, query_tags: List[str], new_tags: List[str], user_id: str) -> List[str]:
+    async def add_tags_to_files(self, query_tags: List[str], new_tags: List[str], user_id: str) -> List[str]:
         logger.info(f"Adding tags {new_tags} to files matching {query_tags} [user_id={user_id}]")
         if not query_tags:
             logger.warning("Add tags failed: empty query tags")
@@ -49,7 +50,19 @@ class TagService:
         if not new_tags:
             logger.warning("Add tags failed: empty new tags")
             raise InvalidTagQueryError("New tags cannot be empty")
-        
+
+        return await run_metadata_write(self._add_tags_metadata, query_tags, new_tags, user_id)
+
+    def _add_tags_metadata(self, query_tags: List[str], new_tags: List[str], user_id: str) -> List[str]:
+        """
+        Add tags to every file matching the query in a single transaction.
+
+        Blocking; add_tags_to_files runs it on a worker thread under the
+        metadata write lock.
+
+        Returns:
+            IDs of the updated files
+        """
         file_ids = self.tag_repo.query_files_by_tags(query_tags, user_id)
         logger.info(f"Adding tags to {len(file_ids)} files [user_id={user_id}]")
         
@@ -76,7 +89,7 @@ class TagService:
         
         return file_ids
 
-    def remove_tags_from_files(self, query_tags: List[str], tags_to_remove: List[str], user_id: str) -> tuple[List[str], List[SkippedFileInfo]]:
+    async def remove_tags_from_files(self, query_tags: List[str], tags_to_remove: List[str], user_id: str) -> tuple[List[str], List[SkippedFileInfo]]:
         """
         Remove tags from files matching query.
         
@@ -97,7 +110,21 @@ class TagService:
         if not tags_to_remove:
             logger.warning("Remove tags failed: empty tags to remove")
             raise InvalidTagQueryError("Tags to remove cannot be empty")
-        
+
+        return await run_metadata_write(
+            self._remove_tags_metadata, query_tags, tags_to_remove, user_id
+        )
+
+    def _remove_tags_metadata(self, query_tags: List[str], tags_to_remove: List[str], user_id: str) -> tuple[List[str], List[SkippedFileInfo]]:
+        """
+        Remove tags from every file matching the query in a single transaction.
+
+        Blocking; remove_tags_from_files runs it on a worker thread under the
+        metadata write lock.
+
+        Returns:
+            Tuple of (updated_file_ids, skipped_files)
+        """
         file_ids = self.tag_repo.query_files_by_tags(query_tags, user_id)
         logger.info(f"Processing tag removal for {len(file_ids)} files [user_id={user_id}]")
         
@@ -1,5 +1,6 @@
 """Utility helper functions for the Controller."""
 
+import hashlib
 import uuid
 from datetime import datetime
 from typing import List
@@ -15,6 +16,39 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+def operation_id_hash(operation_id: str) -> int:
+    """
+    Derive a signed 64-bit integer key from an operation ID.
+
+    Uses the first 8 bytes of the UUID; IDs that are not valid UUIDs fall
+    back to a BLAKE2b digest so every ID still maps to a stable key.
+
+    Args:
+        operation_id: Operation ID string (normally a UUID4)
+
+    Returns:
+        Signed 64-bit integer suitable for an SQLite INTEGER column
+    """
+    try:
+        raw = uuid.UUID(operation_id).bytes[:8]
+    except ValueError:
+        raw = hashlib.blake2b(operation_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(raw, 'big', signed=True)
+
+
+def api_key_hash(api_key: str) -> bytes:
+    """
+    Derive the fixed-width lookup key stored alongside an API key.
+
+    Args:
+        api_key: API key string
+
+    Returns:
+        16-byte BLAKE2s digest of the key
+    """
+    return hashlib.blake2s(api_key.encode('utf-8'), digest_size=16).digest()
+
+
 def get_current_timestamp() -> str:
     """
     Get current timestamp in ISO format.
@@ -1,6 +1,8 @@
 """Shared pytest fixtures for all tests."""
 
+import asyncio
 import pytest
+from collections import OrderedDict
 from pathlib import Path
 from cli.config import Config
 
@@ -68,3 +70,84 @@ def multiple_sample_files(tmp_path):
         file_path.write_text(f'Sample content {i}')
         files.append(file_path)
     return files
+
+
+def _close_thread_connections(database):
+    """
+    Close the calling thread's long-lived database connections.
+
+    Args:
+        database: controller.database module
+    """
+    for name in ('connection', 'read_connection'):
+        conn = getattr(database._thread_local, name, None)
+        if conn is not None:
+            conn.close()
+            delattr(database._thread_local, name)
+
+
+def _drop_controller_connections(database, operation_applier):
+    """
+    Close every cached controller connection so the next use reopens it.
+
+    Args:
+        database: controller.database module
+        operation_applier: controller.replication.operation_applier module
+    """
+    while not database._connection_pool.empty():
+        database._connection_pool.get_nowait().close()
+    _close_thread_connections(database)
+    operation_applier._writer_executor.submit(_close_thread_connections, database).result()
+
+
+@pytest.fixture
+def empty_controller_db(tmp_path, monkeypatch):
+    """
+    Point the controller at a metadata database path that does not exist yet.
+
+    Cached connections and in-memory caches are dropped before and after the
+    test, and the controller ID is pinned to 'controller-a'. Tests can lay
+    down a legacy schema before calling init_database themselves.
+
+    Args:
+        tmp_path: pytest tmp_path fixture
+        monkeypatch: pytest monkeypatch fixture
+
+    Yields:
+        Path to the temporary database file
+    """
+    from controller import database
+    from controller.replication import operation_applier, operation_emitter, operation_log
+    from controller.repositories import user_repository
+
+    db_path = tmp_path / 'metadata.db'
+    _drop_controller_connections(database, operation_applier)
+    monkeypatch.setattr(database, 'DATABASE_PATH', str(db_path))
+    monkeypatch.setattr(database, '_metadata_write_lock', asyncio.Lock())
+    monkeypatch.setattr(operation_emitter, '_cached_controller_id', lambda: 'controller-a')
+    monkeypatch.setattr(operation_log, '_clock_baselines', OrderedDict())
+    monkeypatch.setattr(operation_log, '_current_clock_base_id', None)
+    monkeypatch.setattr(operation_log, '_pending_clock_base_ids', {})
+    user_repository.invalidate_api_key_cache()
+
+    yield db_path
+
+    _drop_controller_connections(database, operation_applier)
+    user_repository.invalidate_api_key_cache()
+
+
+@pytest.fixture
+def controller_db(empty_controller_db):
+    """
+    Point the controller at a fresh, initialized metadata database.
+
+    Args:
+        empty_controller_db: Uninitialized database fixture
+
+    Returns:
+        Path to the temporary database file
+    """
+    from controller.database import init_database
+
+    init_database()
+    return empty_controller_db
@@ -0,0 +1,50 @@
+"""Unit tests for controller database connection handling."""
+
+import queue
+import sqlite3
+
+import pytest
+
+from controller import database
+from controller.database import get_db_connection
+
+
+class TestConnectionPool:
+    """Test that pooled connections are reused cleanly."""
+
+    def test_connection_is_reused(self, controller_db):
+        with get_db_connection() as conn:
+            first = conn
+
+        with get_db_connection() as conn:
+            assert conn is first
+
+    def test_open_transaction_is_rolled_back_before_reuse(self, controller_db):
+        with get_db_connection() as conn:
+            conn.execute(
+                "INSERT INTO users (user_id, username, password_hash, created_at) "
+                "VALUES ('u1', 'alice', 'hash', '2024-01-01T00:00:00')"
+            )
+            assert conn.in_transaction
+            first = conn
+
+        with get_db_connection() as conn:
+            assert conn is first
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+
+    def test_overflow_connections_are_closed(self, controller_db, monkeypatch):
+        monkeypatch.setattr(database, '_connection_pool', queue.LifoQueue(maxsize=2))
+
+        with get_db_connection() as outer:
+            with get_db_connection() as middle:
+                with get_db_connection() as inner:
+                    pass
+
+        assert database._connection_pool.qsize() == 2
+        pooled = {database._connection_pool.get_nowait() for _ in range(2)}
+        assert pooled == {inner, middle}
+        with pytest.raises(sqlite3.ProgrammingError):
+            outer.execute("SELECT 1")
+        for conn in pooled:
+            conn.close()
@@ -0,0 +1,361 @@
+"""Unit tests for applying replicated operations."""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+
+import pytest
+
+from common.protocol import Operation
+from controller.database import get_persistent_db_connection
+from controller.replication import operation_applier
+from controller.replication.operation_log import get_operation_applied_flag
+
+
+def _op(operation_type, payload, vector_clock, timestamp_ms, user_id='u1'):
+    """Build a remote operation."""
+    return Operation(
+        operation_id=str(uuid.uuid4()),
+        operation_type=operation_type,
+        user_id=user_id,
+        timestamp_ms=timestamp_ms,
+        vector_clock=vector_clock,
+        payload=payload,
+        applied=0,
+        created_at='2024-01-01T00:00:00'
+    )
+
+
+def _user_created(vector_clock, timestamp_ms=1000):
+    """Build a USER_CREATED operation for user u1."""
+    return _op('USER_CREATED', {
+        'user_id': 'u1',
+        'username': 'alice',
+        'password_hash': 'hash',
+        'api_key': 'dfs_initial',
+        'created_at': '2024-01-01T00:00:00',
+    }, vector_clock, timestamp_ms)
+
+
+def _api_key_updated(api_key, vector_clock, timestamp_ms):
+    """Build an API_KEY_UPDATED operation for user u1."""
+    return _op('API_KEY_UPDATED', {
+        'user_id': 'u1',
+        'new_api_key': api_key,
+        'key_updated_at': '2024-01-02T00:00:00',
+    }, vector_clock, timestamp_ms)
+
+
+def _file_created(file_id, name, vector_clock, timestamp_ms, created_at='2024-01-01T00:00:00'):
+    """Build a FILE_CREATED operation for a file owned by u1."""
+    return _op('FILE_CREATED', {
+        'file_id': file_id,
+        'name': name,
+        'size': 1,
+        'owner_id': 'u1',
+        'created_at': created_at,
+        'tags': ['docs'],
+        'replaced_file_id': None,
+    }, vector_clock, timestamp_ms)
+
+
+def _query(sql, params=()):
+    """Run a query on the test thread's connection and return plain tuples."""
+    with get_persistent_db_connection() as conn:
+        return [tuple(row) for row in conn.execute(sql, params)]
+
+
+@pytest.fixture
+def applier(controller_db, monkeypatch):
+    """
+    Reset the applier's in-memory state on top of a fresh database.
+
+    The asyncio primitives are recreated because each test runs its own
+    event loop.
+
+    Args:
+        controller_db: Fresh database fixture
+        monkeypatch: pytest monkeypatch fixture
+
+    Returns:
+        The operation_applier module
+    """
+    monkeypatch.setattr(operation_applier, '_deferred_operations', {})
+    monkeypatch.setattr(operation_applier, '_operation_dependencies', {})
+    monkeypatch.setattr(operation_applier, '_operation_dependency_keys', {})
+    monkeypatch.setattr(operation_applier, '_skipped_file_ids', OrderedDict())
+    monkeypatch.setattr(operation_applier, '_pending_skipped_file_ids', [])
+    monkeypatch.setattr(operation_applier, '_file_creation_winners', OrderedDict())
+    monkeypatch.setattr(operation_applier, '_deferred_lock', asyncio.Lock())
+    monkeypatch.setattr(operation_applier, '_deferred_pending', asyncio.Event())
+    monkeypatch.setattr(operation_applier, '_retry_queue', asyncio.Queue())
+    monkeypatch.setattr(operation_applier, '_retry_worker_task', None)
+    return operation_applier
+
+
+class TestApplyOperationsBatch:
+    """Test the batched, savepoint-per-operation apply path."""
+
+    def test_failing_operation_rolls_back_only_its_savepoint(self, applier, monkeypatch):
+        winner = _file_created('f1', 'a.txt', {'b': 1}, 1000)
+        loser = _file_created('f2', 'a.txt', {'c': 1}, 2000)
+        other = _file_created('f3', 'b.txt', {'b': 2}, 3000)
+        apply_file_created = applier._APPLIERS['FILE_CREATED']
+
+        def fail_after_applying_loser(operation, conn):
+            result = apply_file_created(operation, conn)
+            if operation is loser:
+                assert applier._pending_skipped_file_ids == ['f2']
+                raise RuntimeError('apply failed')
+            return result
+
+        monkeypatch.setitem(applier._APPLIERS, 'FILE_CREATED', fail_after_applying_loser)
+
+        results = asyncio.run(applier.apply_operations([winner, loser, other]))
+
+        assert results == [True, False, True]
+        assert _query("SELECT file_id FROM files ORDER BY file_id") == [('f1',), ('f3',)]
+        assert get_operation_applied_flag(winner.operation_id) == 1
+        assert get_operation_applied_flag(loser.operation_id) is None
+        assert get_operation_applied_flag(other.operation_id) == 1
+        assert _query("SELECT file_id FROM skipped_files") == []
+        assert not applier._pending_skipped_file_ids
+        assert 'f2' not in applier._skipped_file_ids
+
+    def test_skipped_loser_is_cached_after_commit(self, applier):
+        winner = _file_created('f1', 'a.txt', {'b': 1}, 1000)
+        loser = _file_created('f2', 'a.txt', {'c': 1}, 2000)
+
+        results = asyncio.run(applier.apply_operations([winner, loser]))
+
+        assert results == [True, False]
+        assert _query("SELECT file_id FROM skipped_files") == [('f2',)]
+        assert list(applier._skipped_file_ids) == ['f2']
+        assert not applier._pending_skipped_file_ids
+
+    def test_duplicate_in_batch_is_applied_once(self, applier, caplog):
+        operation = _file_created('f1', 'a.txt', {'b': 1}, 1000)
+
+        with caplog.at_level(logging.ERROR):
+            results = asyncio.run(applier.apply_operations([operation, operation]))
+
+        assert results == [True, False]
+        assert not caplog.records
+        assert _query(
+            "SELECT COUNT(*) FROM operations WHERE operation_id = ?", (operation.operation_id,)
+        ) == [(1,)]
+        assert get_operation_applied_flag(operation.operation_id) == 1
+
+    def test_applied_marks_are_flushed_before_api_key_updates(self, applier):
+        created = _user_created({'a': 1})
+        newer = _api_key_updated('dfs_newer', {'a': 1, 'b': 1}, 2000)
+        concurrent_older = _api_key_updated('dfs_older', {'a': 1, 'c': 1}, 1500)
+
+        results = asyncio.run(applier.apply_operations([created, newer, concurrent_older]))
+
+        assert results == [True, True, False]
+        assert _query("SELECT api_key FROM users WHERE user_id = 'u1'") == [('dfs_newer',)]
+
+    def test_outer_failure_rolls_back_the_whole_batch(self, applier, monkeypatch):
+        winner = _file_created('f1', 'a.txt', {'b': 1}, 1000)
+        loser = _file_created('f2', 'a.txt', {'c': 1}, 2000)
+
+        def fail(operation_ids, conn=None):
+            raise RuntimeError('mark failed')
+
+        monkeypatch.setattr(applier, 'mark_operations_applied', fail)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(applier.apply_operations([winner, loser]))
+
+        assert _query("SELECT COUNT(*) FROM operations") == [(0,)]
+        assert _query("SELECT COUNT(*) FROM files") == [(0,)]
+        assert _query("SELECT COUNT(*) FROM skipped_files") == [(0,)]
+        assert not applier._pending_skipped_file_ids
+        assert not applier._skipped_file_ids
+
+
+def _chunks_created(file_id, vector_clock, timestamp_ms):
+    """Build a CHUNKS_CREATED operation with one chunk."""
+    return _op('CHUNKS_CREATED', {
+        'file_id': file_id,
+        'chunks': [{
+            'chunk_id': f'{file_id}-c0',
+            'chunk_index': 0,
+            'size': 1,
+            'checksum': 'sum',
+        }],
+    }, vector_clock, timestamp_ms)
+
+
+def _drop_in_memory_state(applier):
+    """Forget everything the applier keeps in memory, as a restart would."""
+    applier._deferred_operations.clear()
+    applier._operation_dependencies.clear()
+    applier._operation_dependency_keys.clear()
+    applier._skipped_file_ids.clear()
+    applier._file_creation_winners.clear()
+
+
+class TestPersistedApplierState:
+    """Test that deferred and skipped state survives losing the in-memory indexes."""
+
+    def test_reloaded_deferred_operation_applies_when_dependency_arrives(self, applier):
+        chunks = _chunks_created('f1', {'b': 2}, 2000)
+        file_created = _file_created('f1', 'a.txt', {'b': 1}, 1000)
+
+        async def wait_until_reloaded():
+            while chunks.operation_id not in applier._deferred_operations:
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            assert await applier.apply_operation(chunks) is False
+            assert _query("SELECT operation_id, dependency_key FROM deferred_operations") == [
+                (chunks.operation_id, 'file:f1')
+            ]
+
+            _drop_in_memory_state(applier)
+            manager = asyncio.create_task(applier.start_deferred_operations_manager())
+            try:
+                await asyncio.wait_for(wait_until_reloaded(), timeout=5)
+                assert await applier.apply_operation(file_created) is True
+                await asyncio.wait_for(applier._retry_queue.join(), timeout=5)
+            finally:
+                manager.cancel()
+
+        asyncio.run(scenario())
+
+        assert get_operation_applied_flag(chunks.operation_id) == 1
+        assert _query("SELECT chunk_id FROM chunks WHERE file_id = 'f1'") == [('f1-c0',)]
+        assert _query("SELECT COUNT(*) FROM deferred_operations") == [(0,)]
+        assert not applier._deferred_operations
+
+    def test_skipped_file_is_remembered_without_the_cache(self, applier):
+        winner = _file_created('f1', 'a.txt', {'b': 1}, 1000)
+        loser = _file_created('f2', 'a.txt', {'c': 1}, 2000)
+        loser_chunks = _chunks_created('f2', {'c': 2}, 2001)
+
+        asyncio.run(applier.apply_operations([winner, loser]))
+        _drop_in_memory_state(applier)
+
+        assert asyncio.run(applier.apply_operation(loser_chunks)) is False
+
+        assert _query("SELECT COUNT(*) FROM deferred_operations") == [(0,)]
+        assert not applier._deferred_operations
+        assert get_operation_applied_flag(loser_chunks.operation_id) == 1
+        assert list(applier._skipped_file_ids) == ['f2']
+
+
+class TestFileCreationConflict:
+    """Test same-name FILE_CREATED conflicts converge whatever the arrival order."""
+
+    def _apply_each(self, applier, operations):
+        """Apply operations one at a time and return their results."""
+        return [asyncio.run(applier.apply_operation(operation)) for operation in operations]
+
+    def _file_state(self):
+        """Get the files and tags rows for u1's a.txt."""
+        return (
+            _query("SELECT file_id, name, created_at FROM files"),
+            _query("SELECT file_id, tag FROM tags ORDER BY file_id, tag"),
+        )
+
+    def test_earlier_creation_wins_when_applied_first(self, applier):
+        winner = _file_created('f1', 'a.txt', {'b': 1}, 1000, created_at='2024-01-01T00:00:00')
+        loser = _file_created('f2', 'a.txt', {'c': 1}, 2000, created_at='2024-01-01T00:00:01')
+
+        assert self._apply_each(applier, [winner, loser]) == [True, False]
+
+        assert self._file_state() == (
+            [('f1', 'a.txt', '2024-01-01T00:00:00')],
+            [('f1', 'docs')],
+        )
+        assert _query("SELECT file_id FROM skipped_files") == [('f2',)]
+
+    def test_earlier_creation_wins_when_applied_second(self, applier):
+        winner = _file_created('f1', 'a.txt', {'b': 1}, 1000, created_at='2024-01-01T00:00:00')
+        loser = _file_created('f2', 'a.txt', {'c': 1}, 2000, created_at='2024-01-01T00:00:01')
+
+        assert self._apply_each(applier, [loser, winner]) == [True, True]
+
+        assert self._file_state() == (
+            [('f1', 'a.txt', '2024-01-01T00:00:00')],
+            [('f1', 'docs')],
+        )
+
+    def test_timestamp_tie_is_broken_by_file_id(self, applier):
+        first = _file_created('f1', 'a.txt', {'b': 1}, 1000)
+        second = _file_created('f2', 'a.txt', {'c': 1}, 1000)
+
+        assert self._apply_each(applier, [second, first]) == [True, True]
+
+        assert _query("SELECT file_id FROM files") == [('f1',)]
+
+
+def _file_deleted(file_id, name, deleted_at, vector_clock, timestamp_ms):
+    """Build a FILE_DELETED operation for a file owned by u1."""
+    return _op('FILE_DELETED', {
+        'file_id': file_id,
+        'owner_id': 'u1',
+        'name': name,
+        'deleted_at': deleted_at,
+        'deleted_by_controller_id': 'controller-b',
+        'chunk_ids': [],
+    }, vector_clock, timestamp_ms)
+
+
+class TestFileDeletion:
+    """Test FILE_DELETED tombstoning against FILE_CREATED in either order."""
+
+    def test_delete_before_create_leaves_tombstone_that_blocks_older_create(self, applier):
+        created = _file_created('f1', 'a.txt', {'b': 1}, 1000, created_at='2024-01-01T00:00:00')
+        deleted = _file_deleted('f1', 'a.txt', '2024-01-02T00:00:00', {'b': 2}, 2000)
+
+        assert asyncio.run(applier.apply_operation(deleted)) is True
+        assert _query("SELECT file_id, name, deleted_at, operation_id FROM file_tombstones") == [
+            ('f1', 'a.txt', '2024-01-02T00:00:00', deleted.operation_id)
+        ]
+
+        assert asyncio.run(applier.apply_operation(created)) is False
+
+        assert _query("SELECT COUNT(*) FROM files") == [(0,)]
+        assert _query("SELECT file_id FROM file_tombstones") == [('f1',)]
+
+    def test_create_newer_than_tombstone_replaces_it(self, applier):
+        deleted = _file_deleted('f1', 'a.txt', '2024-01-02T00:00:00', {'b': 2}, 2000)
+        recreated = _file_created('f2', 'a.txt', {'b': 3}, 3000, created_at='2024-01-03T00:00:00')
+
+        assert asyncio.run(applier.apply_operation(deleted)) is True
+        assert asyncio.run(applier.apply_operation(recreated)) is True
+
+        assert _query("SELECT file_id FROM files") == [('f2',)]
+        assert _query("SELECT COUNT(*) FROM file_tombstones") == [(0,)]
+
+    def test_delete_after_create_removes_file(self, applier):
+        created = _file_created('f1', 'a.txt', {'b': 1}, 1000, created_at='2024-01-01T00:00:00')
+        deleted = _file_deleted('f1', 'a.txt', '2024-01-02T00:00:00', {'b': 2}, 2000)
+
+        assert asyncio.run(applier.apply_operations([created, deleted])) == [True, True]
+
+        assert _query("SELECT COUNT(*) FROM files") == [(0,)]
+        assert _query("SELECT file_id FROM file_tombstones") == [('f1',)]
+
+    def test_delete_older_than_newer_file_is_skipped(self, applier):
+        created = _file_created('f1', 'a.txt', {'b': 1}, 1000, created_at='2024-01-03T00:00:00')
+        deleted = _file_deleted('f1', 'a.txt', '2024-01-02T00:00:00', {'c': 1}, 2000)
+
+        assert asyncio.run(applier.apply_operations([created, deleted])) == [True, False]
+
+        assert _query("SELECT file_id FROM files") == [('f1',)]
+        assert _query("SELECT COUNT(*) FROM file_tombstones") == [(0,)]
+
+    def test_repeated_delete_updates_tombstone(self, applier):
+        first = _file_deleted('f1', 'a.txt', '2024-01-02T00:00:00', {'b': 1}, 1000)
+        second = _file_deleted('f1', 'a.txt', '2024-01-04T00:00:00', {'c': 1}, 2000)
+
+        assert asyncio.run(applier.apply_operations([first, second])) == [True, True]
+
+        assert _query("SELECT file_id, deleted_at, operation_id FROM file_tombstones") == [
+            ('f1', '2024-01-04T00:00:00', second.operation_id)
+        ]
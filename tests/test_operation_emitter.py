@@ -0,0 +1,63 @@
+"""Unit tests for locally emitted replication operations."""
+
+import asyncio
+from datetime import datetime
+
+from controller.database import get_db_connection
+from controller.replication.operation_log import get_operations_for_user
+from controller.repositories.chunk_repository import Chunk, ChunkRepository
+from controller.repositories.file_repository import FileRepository
+from controller.repositories.tag_repository import TagRepository
+from controller.repositories.user_repository import UserRepository
+from controller.services.file_service import FileService
+
+
+class FakeChunkserverClient:
+    """Records chunk deletions instead of calling a chunkserver."""
+
+    def __init__(self):
+        self.deleted_chunk_ids = []
+
+    async def delete_chunk(self, chunk_id):
+        self.deleted_chunk_ids.append(chunk_id)
+
+
+class TestFileDeletedEmission:
+    """Test the FILE_DELETED operation emitted when a file is deleted."""
+
+    def test_delete_files_emits_file_deleted_payload(self, controller_db):
+        UserRepository.create_user('u1', 'alice', 'hash', 'dfs_key', datetime.utcnow())
+        with get_db_connection() as conn:
+            FileRepository.create_file('f1', 'a.txt', 3, 'u1', datetime.utcnow(), conn=conn)
+            TagRepository.add_tags('f1', ['docs'], conn=conn)
+            ChunkRepository.create_chunks(
+                [Chunk(chunk_id='c1', file_id='f1', chunk_index=0, size=3, checksum='sum')],
+                conn=conn
+            )
+            conn.commit()
+
+        service = FileService()
+        service.chunkserver_client = FakeChunkserverClient()
+
+        deleted = asyncio.run(service.delete_files(['docs'], 'u1'))
+
+        assert deleted == ['f1']
+        assert service.chunkserver_client.deleted_chunk_ids == ['c1']
+
+        operations = [
+            op for op in get_operations_for_user('u1') if op.operation_type == 'FILE_DELETED'
+        ]
+        assert len(operations) == 1
+        operation = operations[0]
+        payload = dict(operation.payload)
+        datetime.fromisoformat(payload.pop('deleted_at'))
+        assert payload == {
+            'file_id': 'f1',
+            'owner_id': 'u1',
+            'name': 'a.txt',
+            'deleted_by_controller_id': 'controller-a',
+            'chunk_ids': ['c1'],
+        }
+        assert operation.user_id == 'u1'
+        assert operation.applied == 1
+        assert operation.vector_clock == {'controller-a': 2}
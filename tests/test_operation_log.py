@@ -0,0 +1,187 @@
+"""Unit tests for vector clock storage in the operation log."""
+
+import json
+import sqlite3
+
+from common.constants import VECTOR_CLOCK_BASELINE_MAX_DELTA
+from controller.database import (
+    get_persistent_db_connection,
+    get_read_db_connection,
+    init_database,
+)
+from controller.replication import operation_log
+from controller.replication.operation_log import (
+    get_existing_operation_ids,
+    get_operation_by_id,
+    insert_operation,
+)
+
+
+def _insert(operation_id, vector_clock, conn=None):
+    """Log a USER_CREATED operation carrying the given vector clock."""
+    insert_operation(
+        operation_id=operation_id,
+        operation_type='USER_CREATED',
+        user_id='u1',
+        timestamp_ms=1,
+        vector_clock=vector_clock,
+        payload={},
+        conn=conn
+    )
+
+
+def _stored_clock(operation_id):
+    """Read an operation's vector clock back with a cold baseline cache."""
+    operation_log._clock_baselines.clear()
+    return get_operation_by_id(operation_id).vector_clock
+
+
+def _stored_rows(operation_id):
+    """Get an operation's clock_base_id and its operation_vector_clock rows."""
+    with get_persistent_db_connection() as conn:
+        base_id = conn.execute(
+            "SELECT clock_base_id FROM operations WHERE operation_id = ?", (operation_id,)
+        ).fetchone()[0]
+        delta = {
+            row[0]: row[1]
+            for row in conn.execute(
+                "SELECT controller_id, sequence FROM operation_vector_clock WHERE operation_id = ?",
+                (operation_id,)
+            )
+        }
+    return base_id, delta
+
+
+class TestVectorClockStorage:
+    """Test that clocks survive the baseline and delta encoding."""
+
+    def test_empty_clock_round_trips(self, controller_db):
+        _insert('a', {})
+
+        assert _stored_rows('a') == (None, {})
+        assert _stored_clock('a') == {}
+
+    def test_small_clock_round_trips(self, controller_db):
+        _insert('a', {'x': 1, 'y': 2})
+        _insert('b', {'x': 1, 'y': 3})
+
+        assert _stored_rows('a') == ('a', {})
+        assert _stored_rows('b') == ('a', {'y': 3})
+        with get_persistent_db_connection() as conn:
+            legacy_column = conn.execute("SELECT DISTINCT vector_clock FROM operations").fetchall()
+        assert [tuple(row) for row in legacy_column] == [('{}',)]
+        assert _stored_clock('a') == {'x': 1, 'y': 2}
+        assert _stored_clock('b') == {'x': 1, 'y': 3}
+
+    def test_clock_differing_past_delta_limit_starts_new_baseline(self, controller_db):
+        first = {f'c{i}': 1 for i in range(VECTOR_CLOCK_BASELINE_MAX_DELTA + 4)}
+        second = {f'c{i}': 2 for i in range(VECTOR_CLOCK_BASELINE_MAX_DELTA + 4)}
+        _insert('a', first)
+        _insert('b', second)
+
+        assert _stored_rows('b') == ('b', {})
+        assert _stored_clock('a') == first
+        assert _stored_clock('b') == second
+
+    def test_entry_missing_from_baseline_is_stored_as_zero(self, controller_db):
+        _insert('a', {'x': 1, 'y': 1, 'z': 1})
+        _insert('b', {'x': 1, 'y': 2})
+
+        assert _stored_rows('b') == ('a', {'y': 2, 'z': 0})
+        assert _stored_clock('b') == {'x': 1, 'y': 2}
+
+    def test_json_clocks_from_legacy_database_are_migrated(self, empty_controller_db):
+        legacy = sqlite3.connect(empty_controller_db)
+        legacy.execute("""
+            CREATE TABLE operations (
+                operation_id TEXT PRIMARY KEY,
+                operation_type TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                timestamp_ms INTEGER NOT NULL,
+                vector_clock TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                applied INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL
+            )
+        """)
+        clocks = {'a': {'x': 1}, 'b': {'x': 2, 'y': 7}, 'c': {}}
+        legacy.executemany(
+            "INSERT INTO operations VALUES (?, 'USER_CREATED', 'u1', 1, ?, '{}', 1, '2024-01-01T00:00:00')",
+            [(operation_id, json.dumps(clock)) for operation_id, clock in clocks.items()]
+        )
+        legacy.commit()
+        legacy.close()
+
+        init_database()
+
+        for operation_id, clock in clocks.items():
+            assert _stored_clock(operation_id) == clock
+
+        _insert('d', {'x': 3, 'y': 7})
+        assert _stored_clock('d') == {'x': 3, 'y': 7}
+
+
+class TestClockBaselineRollback:
+    """Test that a rolled-back baseline is never cached or referenced."""
+
+    def test_rolled_back_transaction_baselines_are_dropped(self, controller_db):
+        with get_persistent_db_connection() as conn:
+            _insert('a', {'x': 1, 'y': 1, 'z': 1}, conn=conn)
+            _insert('b', {'x': 2, 'y': 1, 'z': 1}, conn=conn)
+            conn.rollback()
+
+        assert not operation_log._clock_baselines
+        assert operation_log._current_clock_base_id is None
+
+        _insert('c', {'x': 3, 'y': 1, 'z': 5})
+
+        assert _stored_clock('c') == {'x': 3, 'y': 1, 'z': 5}
+        assert get_operation_by_id('a') is None
+
+    def test_rolled_back_savepoint_baseline_is_dropped(self, controller_db):
+        small = {'x': 1, 'y': 1}
+        large = {f'c{i}': i + 1 for i in range(20)}
+
+        with get_persistent_db_connection() as conn:
+            _insert('a', small, conn=conn)
+            mark = conn.commit_callbacks_mark()
+            conn.execute('SAVEPOINT test')
+            _insert('b', large, conn=conn)
+            conn.execute('ROLLBACK TO SAVEPOINT test')
+            conn.execute('RELEASE SAVEPOINT test')
+            conn.discard_commit_callbacks(mark)
+            _insert('c', large, conn=conn)
+            conn.commit()
+
+        assert operation_log._current_clock_base_id == 'c'
+        _insert('d', dict(large, c0=99))
+
+        assert _stored_clock('a') == small
+        assert _stored_clock('c') == large
+        assert _stored_clock('d') == dict(large, c0=99)
+        assert get_operation_by_id('b') is None
+
+
+class TestExistingOperationIds:
+    """Test looking up which peer-supplied operation IDs are stored locally."""
+
+    def test_large_id_lists_are_queried_in_chunks(self, controller_db, monkeypatch):
+        for operation_id in ('a', 'c', 'e'):
+            _insert(operation_id, {'x': 1})
+        monkeypatch.setattr(operation_log, '_MAX_IN_PARAMS', 2)
+
+        existing = get_existing_operation_ids(['a', 'b', 'c', 'a', 'd', 'e', 'f'])
+
+        assert existing == {'a', 'c', 'e'}
+
+    def test_id_list_past_host_parameter_limit(self, controller_db):
+        _insert('a', {'x': 1})
+        with get_read_db_connection() as conn:
+            # Older SQLite builds cap host parameters at 999.
+            conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        operation_ids = [f'missing-{i}' for i in range(2000)] + ['a']
+
+        assert get_existing_operation_ids(operation_ids) == {'a'}
+
+    def test_empty_id_list(self, controller_db):
+        assert get_existing_operation_ids([]) == set()
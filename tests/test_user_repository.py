@@ -0,0 +1,125 @@
+"""Unit tests for the API key lookup cache."""
+
+import asyncio
+import sqlite3
+import uuid
+from datetime import datetime
+
+from common.constants import API_KEY_CACHE_TTL_SECONDS
+from common.protocol import Operation
+from controller.database import get_db_connection, init_database
+from controller.replication.operation_applier import apply_operation
+from controller.repositories import user_repository
+from controller.repositories.user_repository import UserRepository, invalidate_api_key_cache
+from controller.utils import api_key_hash
+
+
+def _set_api_key_behind_cache(user_id, api_key):
+    """Change a user's API key in the database without touching the cache."""
+    with get_db_connection() as conn:
+        conn.execute(
+            "UPDATE users SET api_key = ?, api_key_hash = ? WHERE user_id = ?",
+            (api_key, api_key_hash(api_key), user_id)
+        )
+        conn.commit()
+
+
+class TestApiKeyCache:
+    """Test that cached API key lookups never outlive the key."""
+
+    def test_rotated_key_stops_authenticating(self, controller_db):
+        UserRepository.create_user('u1', 'alice', 'hash', 'dfs_old', datetime.utcnow())
+        assert UserRepository.get_by_api_key('dfs_old').user_id == 'u1'
+
+        UserRepository.update_api_key('u1', 'dfs_new', datetime.utcnow())
+
+        assert UserRepository.get_by_api_key('dfs_old') is None
+        assert UserRepository.get_by_api_key('dfs_new').user_id == 'u1'
+
+    def test_replicated_key_update_invalidates_cache(self, controller_db):
+        UserRepository.create_user('u1', 'alice', 'hash', 'dfs_old', datetime.utcnow())
+        assert UserRepository.get_by_api_key('dfs_old').user_id == 'u1'
+
+        operation = Operation(
+            operation_id=str(uuid.uuid4()),
+            operation_type='API_KEY_UPDATED',
+            user_id='u1',
+            timestamp_ms=4_102_444_800_000,
+            vector_clock={'controller-a': 1, 'controller-b': 1},
+            payload={
+                'user_id': 'u1',
+                'new_api_key': 'dfs_new',
+                'key_updated_at': datetime.utcnow().isoformat(),
+            },
+            applied=0,
+            created_at=datetime.utcnow().isoformat()
+        )
+        assert asyncio.run(apply_operation(operation)) is True
+
+        assert UserRepository.get_by_api_key('dfs_old') is None
+        assert UserRepository.get_by_api_key('dfs_new').user_id == 'u1'
+
+    def test_entry_expires_after_ttl(self, controller_db, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(user_repository.time, 'monotonic', lambda: clock[0])
+        UserRepository.create_user('u1', 'alice', 'hash', 'dfs_old', datetime.utcnow())
+        assert UserRepository.get_by_api_key('dfs_old').user_id == 'u1'
+
+        _set_api_key_behind_cache('u1', 'dfs_new')
+        clock[0] += API_KEY_CACHE_TTL_SECONDS - 1
+        assert UserRepository.get_by_api_key('dfs_old').user_id == 'u1'
+
+        clock[0] += 1
+        assert UserRepository.get_by_api_key('dfs_old') is None
+
+    def test_lookup_racing_invalidation_is_not_cached(self, controller_db, monkeypatch):
+        UserRepository.create_user('u1', 'alice', 'hash', 'dfs_old', datetime.utcnow())
+        real_row_to_user = user_repository._row_to_user
+
+        def row_to_user_then_rotate(row):
+            user = real_row_to_user(row)
+            _set_api_key_behind_cache('u1', 'dfs_new')
+            invalidate_api_key_cache()
+            return user
+
+        monkeypatch.setattr(user_repository, '_row_to_user', row_to_user_then_rotate)
+        assert UserRepository.get_by_api_key('dfs_old').user_id == 'u1'
+        monkeypatch.setattr(user_repository, '_row_to_user', real_row_to_user)
+
+        assert UserRepository.get_by_api_key('dfs_old') is None
+
+
+class TestApiKeyHashMigration:
+    """Test that users from before api_key_hash existed can still authenticate."""
+
+    def test_existing_users_authenticate_after_backfill(self, empty_controller_db):
+        legacy = sqlite3.connect(empty_controller_db)
+        legacy.execute("""
+            CREATE TABLE users (
+                user_id TEXT PRIMARY KEY,
+                username TEXT UNIQUE NOT NULL,
+                password_hash TEXT NOT NULL,
+                api_key TEXT UNIQUE,
+                created_at TEXT NOT NULL,
+                key_updated_at TEXT
+            )
+        """)
+        legacy.executemany(
+            "INSERT INTO users VALUES (?, ?, 'hash', ?, '2024-01-01T00:00:00', NULL)",
+            [('u1', 'alice', 'dfs_alice'), ('u2', 'bob', 'dfs_bob'), ('u3', 'carol', None)]
+        )
+        legacy.commit()
+        legacy.close()
+
+        init_database()
+
+        assert UserRepository.get_by_api_key('dfs_alice').user_id == 'u1'
+        assert UserRepository.get_by_api_key('dfs_bob').user_id == 'u2'
+        assert UserRepository.get_by_api_key('dfs_unknown') is None
+        with get_db_connection() as conn:
+            rows = conn.execute("SELECT user_id, api_key_hash FROM users ORDER BY user_id").fetchall()
+        assert [(row[0], row[1]) for row in rows] == [
+            ('u1', api_key_hash('dfs_alice')),
+            ('u2', api_key_hash('dfs_bob')),
+            ('u3', None),
+        ]
@@ -0,0 +1,67 @@
+"""Unit tests for vector clock causality checks."""
+
+from controller.replication.vector_clock import (
+    VectorClock,
+    BEFORE,
+    AFTER,
+    EQUAL,
+    CONCURRENT,
+)
+
+
+class TestVectorClockCompare:
+    """Test single-pass causal comparison."""
+
+    def test_compare_detects_before_and_after(self):
+        earlier = VectorClock(clocks={"a": 1, "b": 2})
+        later = VectorClock(clocks={"a": 2, "b": 2})
+
+        assert earlier.compare(later) == BEFORE
+        assert later.compare(earlier) == AFTER
+
+    def test_compare_detects_equal(self):
+        clock = VectorClock(clocks={"a": 3})
+
+        assert clock.compare(VectorClock(clocks={"a": 3})) == EQUAL
+
+    def test_compare_detects_concurrent(self):
+        left = VectorClock(clocks={"a": 2, "b": 1})
+        right = VectorClock(clocks={"a": 1, "b": 2})
+
+        assert left.compare(right) == CONCURRENT
+        assert right.compare(left) == CONCURRENT
+
+    def test_compare_treats_missing_entries_as_zero(self):
+        partial = VectorClock(clocks={"a": 1})
+        fuller = VectorClock(clocks={"a": 1, "b": 1})
+
+        assert partial.compare(fuller) == BEFORE
+        assert fuller.compare(partial) == AFTER
+        assert VectorClock(clocks={"a": 1}).compare(VectorClock(clocks={"b": 1})) == CONCURRENT
+
+    def test_compare_agrees_with_happens_before(self):
+        clocks = [
+            VectorClock(clocks={}),
+            VectorClock(clocks={"a": 1}),
+            VectorClock(clocks={"a": 1, "b": 1}),
+            VectorClock(clocks={"b": 2}),
+            VectorClock(clocks={"a": 2, "b": 2}),
+        ]
+
+        for left in clocks:
+            for right in clocks:
+                relation = left.compare(right)
+                assert (relation == BEFORE) == left.happens_before(right)
+                assert (relation == AFTER) == right.happens_before(left)
+                assert (relation in (CONCURRENT, EQUAL)) == left.is_concurrent(right)
+
+
+class TestVectorClockMerge:
+    """Test element-wise max merge."""
+
+    def test_merge_takes_max_per_controller(self):
+        clock = VectorClock(clocks={"a": 1, "b": 5})
+
+        clock.merge(VectorClock(clocks={"a": 3, "b": 2, "c": 1}))
+
+        assert clock.clocks == {"a": 3, "b": 5, "c": 1}